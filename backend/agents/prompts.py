@@ -15,6 +15,7 @@ PIPELINE_AGENT_SYSTEM_PROMPT = """You are a helpful assistant for wet lab scient
 9. **Validate inputs**: Check that all required files exist and parameters are valid
 10. **Submit runs**: Send validated runs to the compute cluster (requires approval)
 11. **Trace lineage**: Use ancestor/descendant tools to map sample provenance
+12. **Analyze runs**: Summarize per-process task runtimes, CPU and memory usage from a run's trace
 
 ## Workflow
 
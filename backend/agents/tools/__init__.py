@@ -15,6 +15,7 @@ from .ngs_discovery import (
     search_ngs_runs,
 )
 from .pipeline_tools import get_pipeline_schema, list_pipelines
+from .run_analysis import compare_pipeline_versions, get_run_bottlenecks, get_run_task_summary
 from .schema_tools import (
     execute_warehouse_query,
     get_dropdown_values,
@@ -45,6 +46,9 @@ def get_agent_tools() -> list[BaseTool]:
         cancel_run,
         delete_file,
         clear_samplesheet,
+        get_run_task_summary,
+        get_run_bottlenecks,
+        compare_pipeline_versions,
         get_entities,
         get_entity_relationships,
         trace_sample_lineage,
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from typing import Any
+
+from langchain_core.tools import tool
+
+from backend.agents.tools.base import format_table, get_tool_context, tool_error_handler
+from backend.agents.tools.submission import _close_session, _get_run_store
+from backend.config import settings
+from backend.services.logs import LogService
+from backend.services.runs import run_settled
+from backend.services.task_metrics import TaskMetricsService
+
+_GIB = 1024**3
+
+
+def _round(value: float | None, digits: int = 1) -> float | None:
+    return round(value, digits) if value is not None else None
+
+
+async def _load_run(run_id: str, runtime: Any | None):
+    run_store, session = await _get_run_store(runtime)
+    try:
+        run = await run_store.get_run(run_id)
+    finally:
+        await _close_session(session)
+    if not run:
+        raise ValueError("Run not found.")
+    context = get_tool_context(runtime)
+    if context.user_email and run.user_email != context.user_email:
+        raise ValueError("Access denied.")
+    if context.storage is None:
+        raise ValueError("Storage is unavailable.")
+    return run, LogService.create(context.storage, settings)
+
+
+@tool
+@tool_error_handler
+async def get_run_task_summary(run_id: str, runtime: Any | None = None) -> str:
+    """Summarize a pipeline run's tasks per process from its Nextflow trace.
+
+    Reports task, failure and retry counts, p50/p95 duration, CPU-hours and the
+    tightest memory headroom (peak RSS versus requested memory) for each process.
+    """
+    if not run_id:
+        return "Error: run_id is required."
+
+    run, service = await _load_run(run_id, runtime)
+    summary = await service.get_task_summary(run_id, final=run_settled(run))
+    if not summary.processes:
+        return f"No task trace is available yet for run {run_id}."
+
+    rows = [
+        {
+            "process": item.process,
+            "tasks": item.tasks,
+            "failed": item.failed,
+            "retries": item.retries,
+            "p50_min": _round(item.duration_p50_s / 60 if item.duration_p50_s else None),
+            "p95_min": _round(item.duration_p95_s / 60 if item.duration_p95_s else None),
+            "cpu_hours": _round(item.cpu_hours),
+            "peak_rss_gib": _round(
+                item.peak_rss_max_bytes / _GIB if item.peak_rss_max_bytes else None
+            ),
+            "mem_headroom_pct": _round(item.memory_headroom_percent),
+        }
+        for item in summary.processes
+    ]
+    return (
+        f"Run {run_id} ({run.status.value}): {summary.total_tasks} tasks "
+        f"across {len(rows)} processes\n\n{format_table(rows)}"
+    )
+
+
+@tool
+@tool_error_handler
+async def get_run_bottlenecks(run_id: str, runtime: Any | None = None) -> str:
+    """Find what dominates a pipeline run's wall-clock time.
+
+    Reports the estimated critical path, each process's share of it, task
+    concurrency, and the processes whose tasks wait longest in the Batch queue.
+    """
+    if not run_id:
+        return "Error: run_id is required."
+
+    run, service = await _load_run(run_id, runtime)
+    timeline = await service.get_task_timeline(run_id, final=run_settled(run))
+    if not timeline.critical_path:
+        return f"No task timing is available yet for run {run_id}."
+
+    shares = [
+        {
+            "process": item.process,
+            "hours": _round(item.seconds / 3600, 2),
+            "share_pct": _round(item.share * 100 if item.share is not None else None),
+        }
+        for item in timeline.critical_path_by_process
+    ]
+    queue = [
+        {
+            "process": item.process,
+            "tasks": item.tasks,
+            "queue_p50_min": _round(item.queue_wait_p50_s / 60),
+            "queue_p95_min": _round(item.queue_wait_p95_s / 60),
+        }
+        for item in timeline.queue_bottlenecks
+    ]
+    wall_hours = (timeline.wall_clock_s or 0) / 3600
+    path_hours = (timeline.critical_path_s or 0) / 3600
+    mean = timeline.mean_concurrency
+    lines = [
+        f"Run {run_id} ({run.status.value}): wall clock {wall_hours:.2f} h, "
+        f"critical path {path_hours:.2f} h over {len(timeline.critical_path)} tasks",
+        f"Concurrency: peak {timeline.peak_concurrency}, "
+        f"mean {f'{mean:.1f}' if mean is not None else 'n/a'}",
+        "",
+        "Critical path by process:",
+        format_table(shares),
+        "",
+        "Longest Batch queue waits:",
+        format_table(queue),
+    ]
+    return "\n".join(lines)
+
+
+@tool
+@tool_error_handler
+async def compare_pipeline_versions(
+    pipeline: str,
+    process: str | None = None,
+    versions: list[str] | None = None,
+    runtime: Any | None = None,
+) -> str:
+    """Compare per-process task runtime and memory across pipeline versions.
+
+    Uses task metrics from finished runs and flags statistically significant
+    slowdowns or memory increases between consecutive versions.
+    """
+    if not pipeline:
+        return "Error: pipeline is required."
+
+    run_store, session = await _get_run_store(runtime)
+    try:
+        comparison = await TaskMetricsService.create(run_store.session).compare_versions(
+            pipeline, process=process, versions=versions
+        )
+    finally:
+        await _close_session(session)
+    if not comparison.stats:
+        return f"No task metrics recorded yet for {pipeline}."
+
+    stats = [
+        {
+            "process": item.process,
+            "version": item.pipeline_version,
+            "tasks": item.tasks,
+            "runs": item.runs,
+            "p50_min": _round(item.realtime_p50_s / 60 if item.realtime_p50_s else None),
+            "p95_min": _round(item.realtime_p95_s / 60 if item.realtime_p95_s else None),
+            "rss_p95_gib": _round(
+                item.peak_rss_p95_bytes / _GIB if item.peak_rss_p95_bytes else None
+            ),
+        }
+        for item in comparison.stats
+    ]
+    regressions = [
+        {
+            "process": item.process,
+            "metric": item.metric,
+            "from": item.baseline_version,
+            "to": item.pipeline_version,
+            "change_pct": _round(item.change_percent),
+            "p_value": f"{item.p_value:.2g}",
+        }
+        for item in comparison.regressions
+    ]
+    lines = [
+        f"{pipeline} versions: {', '.join(comparison.versions)}",
+        "",
+        format_table(stats),
+        "",
+        "Regressions:" if regressions else "No significant regressions detected.",
+    ]
+    if regressions:
+        lines.append(format_table(regressions))
+    return "\n".join(lines)
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends
 from backend.dependencies import get_current_user_context
 from .benchling import router as benchling_router
 from .chat_rest import router as chat_rest_router
+from .health import metrics_router
 from .logs import router as logs_router
 from .pipelines import router as pipelines_router
 from .runs import router as runs_router
@@ -16,3 +17,4 @@ api_router.include_router(pipelines_router)
 api_router.include_router(benchling_router)
 api_router.include_router(logs_router)
 api_router.include_router(chat_rest_router)
+api_router.include_router(metrics_router)
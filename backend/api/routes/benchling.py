@@ -85,14 +85,11 @@ async def get_run_samples(
     return {"run_name": name, "samples": rows}
 
 
-@router.get("/benchling/metadata")
-async def get_benchling_metadata(
-    benchling: BenchlingService = Depends(get_benchling_service),
-) -> dict[str, Any]:
-    now = datetime.now(timezone.utc)
-    if _METADATA_CACHE["expires_at"] > now:
-        return _METADATA_CACHE["data"]
+_METADATA_TTL = timedelta(minutes=5)
 
+
+async def refresh_benchling_metadata(benchling: BenchlingService) -> dict[str, Any]:
+    """Reload the filter metadata into the cache; run ahead of expiry by the scheduler."""
     sql_instruments = """
         SELECT DISTINCT instrument FROM ngs_run$raw
         WHERE archived$ = FALSE
@@ -108,12 +105,9 @@ async def get_benchling_metadata(
         WHERE archived$ = FALSE AND project IS NOT NULL
         ORDER BY project
     """
-    try:
-        instruments = await benchling.query(sql_instruments, return_format="dict")
-        reagents = await benchling.query(sql_reagent, return_format="dict")
-        projects = await benchling.query(sql_projects, return_format="dict")
-    except Exception as exc:
-        raise BenchlingError("Benchling query failed", detail=str(exc)) from exc
+    instruments = await benchling.query(sql_instruments, return_format="dict")
+    reagents = await benchling.query(sql_reagent, return_format="dict")
+    projects = await benchling.query(sql_projects, return_format="dict")
 
     data = {
         "instruments": [row["instrument"] for row in instruments if row.get("instrument")],
@@ -123,10 +117,22 @@ async def get_benchling_metadata(
         "projects": [row["project"] for row in projects if row.get("project")],
     }
     _METADATA_CACHE["data"] = data
-    _METADATA_CACHE["expires_at"] = now + timedelta(minutes=5)
+    _METADATA_CACHE["expires_at"] = datetime.now(timezone.utc) + _METADATA_TTL
     return data
 
 
+@router.get("/benchling/metadata")
+async def get_benchling_metadata(
+    benchling: BenchlingService = Depends(get_benchling_service),
+) -> dict[str, Any]:
+    if _METADATA_CACHE["expires_at"] > datetime.now(timezone.utc):
+        return _METADATA_CACHE["data"]
+    try:
+        return await refresh_benchling_metadata(benchling)
+    except Exception as exc:
+        raise BenchlingError("Benchling query failed", detail=str(exc)) from exc
+
+
 @router.get("/benchling/entities/{entity_id}")
 async def get_entity(
     entity_id: str,
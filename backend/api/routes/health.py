@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from google.cloud import batch_v1
 
@@ -11,17 +11,30 @@ from ... import __version__
 from ...dependencies import (
     get_benchling_service,
     get_breakers,
+    get_current_user_context,
     get_database_service,
     get_gemini_service,
+    get_run_status_listener,
+    get_scheduler,
     get_storage_service,
+    get_stream_broker,
+    get_weblog_aggregator,
 )
 from ...services.benchling import BenchlingService
 from ...services.database import DatabaseService
 from ...services.gemini import DisabledGeminiService, GeminiService
+from ...services.logs import trace_cache_stats
+from ...services.run_notifications import RunStatusListener
+from ...services.scheduler import Scheduler
 from ...services.storage import StorageService
+from ...services.streams import StreamBroker
+from ...services.weblog import WeblogAggregator
+from ...utils.auth import UserContext
 from ...utils.circuit_breaker import Breakers, breaker_state, is_breaker_open
 
 router = APIRouter(tags=["health"])
+# Service internals; mounted on the authenticated api_router and limited to admins.
+metrics_router = APIRouter(tags=["health"])
 
 
 async def check_batch_access() -> bool:
@@ -45,6 +58,27 @@ async def health_check() -> dict[str, Any]:
     }
 
 
+@metrics_router.get("/metrics")
+async def service_metrics(
+    user: UserContext = Depends(get_current_user_context),
+    database: DatabaseService = Depends(get_database_service),
+    broker: StreamBroker = Depends(get_stream_broker),
+    listener: RunStatusListener | None = Depends(get_run_status_listener),
+    scheduler: Scheduler = Depends(get_scheduler),
+    weblog: WeblogAggregator = Depends(get_weblog_aggregator),
+) -> dict[str, Any]:
+    if not user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    return {
+        "database_pool": database.pool_stats(),
+        "streams": broker.stats(),
+        "run_status_listener": listener is not None and listener.active,
+        "trace_cache": trace_cache_stats(),
+        "scheduler": scheduler.stats(),
+        "weblog": weblog.stats(),
+    }
+
+
 @router.get("/ready")
 async def readiness_check(
     benchling: BenchlingService = Depends(get_benchling_service),
@@ -4,15 +4,23 @@ import json
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import settings
-from backend.dependencies import get_current_user_context, get_db_session, get_storage_service
-from backend.models.schemas.logs import LogEntry, TaskInfo, TaskLogs
+from backend.dependencies import (
+    get_current_user_context,
+    get_database_service,
+    get_db_session,
+    get_storage_service,
+    get_stream_broker,
+)
+from backend.models.schemas.logs import LogEntry, TaskInfo, TaskLogs, TaskSummary, TaskTimeline
+from backend.services.database import DatabaseService
 from backend.services.logs import LogService
-from backend.services.runs import RunStoreService
+from backend.services.runs import RunStoreService, run_settled
 from backend.services.storage import StorageService
+from backend.services.streams import StreamBroker
 from backend.utils.auth import UserContext
 from backend.utils.errors import NotFoundError
 
@@ -52,11 +60,13 @@ async def stream_workflow_log(
     run_id: str,
     request: Request,
     user: UserContext = Depends(get_current_user_context),
-    session: AsyncSession = Depends(get_db_session),
+    database: DatabaseService = Depends(get_database_service),
     storage: StorageService = Depends(get_storage_service),
+    broker: StreamBroker = Depends(get_stream_broker),
 ) -> StreamingResponse:
-    runs = RunStoreService.create(session, settings)
-    run = await runs.get_run(run_id)
+    # Authorize with a short-lived session so the stream does not hold a pooled connection.
+    async with database.session_factory() as session:
+        run = await RunStoreService.create(session, settings).get_run(run_id)
     if not run:
         raise NotFoundError("Run not found", detail=f"No run exists with ID {run_id}")
     _ensure_owner_or_admin(run.user_email, user)
@@ -64,11 +74,17 @@ async def stream_workflow_log(
     service = LogService.create(storage, settings)
 
     async def event_generator():
-        async for entry in service.stream_workflow_log(run_id):
-            if await request.is_disconnected():
-                break
-            payload = entry.model_dump()
-            yield _sse_event("log", payload)
+        # Viewers of the same run share one poller; late joiners get its recent lines.
+        entries = broker.subscribe(
+            ("workflow-log", run_id), lambda: service.stream_workflow_log(run_id)
+        )
+        try:
+            async for entry in entries:
+                if await request.is_disconnected():
+                    break
+                yield _sse_event("log", entry.model_dump(mode="json"))
+        finally:
+            await entries.aclose()
         yield _sse_event("done", {"status": "complete"})
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
@@ -88,13 +104,48 @@ async def list_tasks(
     _ensure_owner_or_admin(run.user_email, user)
 
     service = LogService.create(storage, settings)
-    return await service.list_tasks(run_id)
+    return await service.list_tasks(run_id, final=run_settled(run))
+
+
+@router.get("/runs/{run_id}/tasks/summary", response_model=TaskSummary)
+async def get_task_summary(
+    run_id: str,
+    user: UserContext = Depends(get_current_user_context),
+    session: AsyncSession = Depends(get_db_session),
+    storage: StorageService = Depends(get_storage_service),
+) -> TaskSummary:
+    runs = RunStoreService.create(session, settings)
+    run = await runs.get_run(run_id)
+    if not run:
+        raise NotFoundError("Run not found", detail=f"No run exists with ID {run_id}")
+    _ensure_owner_or_admin(run.user_email, user)
+
+    service = LogService.create(storage, settings)
+    return await service.get_task_summary(run_id, final=run_settled(run))
+
+
+@router.get("/runs/{run_id}/tasks/timeline", response_model=TaskTimeline)
+async def get_task_timeline(
+    run_id: str,
+    user: UserContext = Depends(get_current_user_context),
+    session: AsyncSession = Depends(get_db_session),
+    storage: StorageService = Depends(get_storage_service),
+) -> TaskTimeline:
+    runs = RunStoreService.create(session, settings)
+    run = await runs.get_run(run_id)
+    if not run:
+        raise NotFoundError("Run not found", detail=f"No run exists with ID {run_id}")
+    _ensure_owner_or_admin(run.user_email, user)
+
+    service = LogService.create(storage, settings)
+    return await service.get_task_timeline(run_id, final=run_settled(run))
 
 
 @router.get("/runs/{run_id}/tasks/{task_id}/logs", response_model=TaskLogs)
 async def get_task_logs(
     run_id: str,
     task_id: str,
+    tail: int | None = Query(default=None, ge=1, le=100_000),
     user: UserContext = Depends(get_current_user_context),
     session: AsyncSession = Depends(get_db_session),
     storage: StorageService = Depends(get_storage_service),
@@ -106,27 +157,26 @@ async def get_task_logs(
     _ensure_owner_or_admin(run.user_email, user)
 
     service = LogService.create(storage, settings)
-    return await service.get_task_logs(run_id, task_id)
+    return await service.get_task_logs(run_id, task_id, tail=tail)
 
 
 @router.get("/runs/{run_id}/logs/download")
 async def download_logs(
     run_id: str,
     user: UserContext = Depends(get_current_user_context),
-    session: AsyncSession = Depends(get_db_session),
+    database: DatabaseService = Depends(get_database_service),
     storage: StorageService = Depends(get_storage_service),
-) -> Response:
-    runs = RunStoreService.create(session, settings)
-    run = await runs.get_run(run_id)
+) -> StreamingResponse:
+    # The zip can stream for minutes; authorize with a session closed before it starts.
+    async with database.session_factory() as session:
+        run = await RunStoreService.create(session, settings).get_run(run_id)
     if not run:
         raise NotFoundError("Run not found", detail=f"No run exists with ID {run_id}")
     _ensure_owner_or_admin(run.user_email, user)
 
     service = LogService.create(storage, settings)
-    archive = await service.create_log_archive(run_id)
     filename = f"{run_id}-logs.zip"
-    headers = {
-        "Content-Disposition": f"attachment; filename=\"{filename}\"",
-        "Content-Type": "application/zip",
-    }
-    return Response(content=archive, media_type="application/zip", headers=headers)
+    headers = {"Content-Disposition": f"attachment; filename=\"{filename}\""}
+    return StreamingResponse(
+        service.stream_log_archive(run_id), media_type="application/zip", headers=headers
+    )
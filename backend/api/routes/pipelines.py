@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.dependencies import get_db_session
 from backend.models.schemas.pipelines import PipelineListResponse, PipelineSchema
+from backend.models.schemas.task_metrics import TaskMetricsComparison
 from backend.services.pipelines import PipelineRegistry
+from backend.services.task_metrics import TaskMetricsService
 
 router = APIRouter(tags=["pipelines"])
 
@@ -14,6 +18,25 @@ async def list_pipelines() -> PipelineListResponse:
     return PipelineListResponse(pipelines=registry.list_pipelines())
 
 
+@router.get("/pipelines/task-metrics", response_model=TaskMetricsComparison)
+async def compare_task_metrics(
+    pipeline: str,
+    process: str | None = None,
+    versions: list[str] | None = Query(default=None),
+    min_sample_count: int | None = Query(default=None, ge=0),
+    max_sample_count: int | None = Query(default=None, ge=0),
+    session: AsyncSession = Depends(get_db_session),
+) -> TaskMetricsComparison:
+    service = TaskMetricsService.create(session)
+    return await service.compare_versions(
+        pipeline,
+        process=process,
+        versions=versions,
+        min_sample_count=min_sample_count,
+        max_sample_count=max_sample_count,
+    )
+
+
 @router.get("/pipelines/{name}", response_model=PipelineSchema)
 async def get_pipeline(name: str) -> PipelineSchema:
     registry = PipelineRegistry.create()
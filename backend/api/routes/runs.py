@@ -5,15 +5,23 @@ import csv
 import io
 import json
 import logging
-from datetime import datetime, timezone
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncIterator, Literal
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import settings
-from backend.dependencies import get_current_user_context, get_db_session, get_storage_service
+from backend.dependencies import (
+    get_current_user_context,
+    get_database_service,
+    get_db_session,
+    get_run_status_listener,
+    get_storage_service,
+    get_stream_broker,
+)
 from backend.models.schemas.runs import (
     RunCreateRequest,
     RunListResponse,
@@ -23,22 +31,47 @@ from backend.models.schemas.runs import (
 )
 from backend.services.pipelines import PipelineRegistry
 from backend.services.batch import BatchService
-from backend.services.runs import RunStoreService
-from backend.services.storage import StorageService
+from backend.services.database import DatabaseService
+from backend.services.run_events import (
+    RUN_EVENTS_PAGE_SIZE,
+    RunEvent,
+    RunEventService,
+    poll_run_changes,
+    poll_run_events,
+)
+from backend.services.run_notifications import RunStatusListener
+from backend.services.runs import (
+    TERMINAL_STATUSES,
+    RunStoreService,
+    run_settled,
+)
+from backend.services.storage import DEFAULT_LIST_PAGE_SIZE, StorageService
+from backend.services.streams import StreamBroker, Subscription
 from backend.utils.auth import UserContext
 from backend.utils.errors import NotFoundError, ValidationError
 
 router = APIRouter(tags=["runs"])
 
-_TERMINAL_STATUSES = {RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.CANCELLED}
 logger = logging.getLogger(__name__)
 
+_EVENT_STREAM_TIMEOUT_SECONDS = 600
+
 
 def _ensure_owner_or_admin(run: RunResponse, user: UserContext) -> None:
     if run.user_email != user.email and not user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
 
 
+def _parse_fields(fields: str | None) -> list[str] | None:
+    names = [name.strip() for name in (fields or "").split(",") if name.strip()]
+    return names or None
+
+
+def _projected_response(model: RunResponse | RunListResponse) -> JSONResponse:
+    # Projected runs only mark their selected fields as set; skip response_model validation.
+    return JSONResponse(model.model_dump(mode="json", exclude_unset=True))
+
+
 def _count_samples(samplesheet_csv: str) -> int:
     reader = csv.reader(io.StringIO(samplesheet_csv))
     rows = [row for row in reader if any(cell.strip() for cell in row)]
@@ -47,35 +80,75 @@ def _count_samples(samplesheet_csv: str) -> int:
     return max(len(rows) - 1, 0)
 
 
-def _sse_event(event: str, data: dict[str, Any]) -> bytes:
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+def _sse_event(event: str, data: dict[str, Any], event_id: str | None = None) -> bytes:
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
 
 
-def _status_timestamp(run: RunResponse) -> datetime:
-    if run.status == RunStatus.SUBMITTED and run.submitted_at:
-        return run.submitted_at
-    if run.status == RunStatus.RUNNING and run.started_at:
-        return run.started_at
-    if run.status == RunStatus.COMPLETED and run.completed_at:
-        return run.completed_at
-    if run.status == RunStatus.FAILED and run.failed_at:
-        return run.failed_at
-    if run.status == RunStatus.CANCELLED and run.cancelled_at:
-        return run.cancelled_at
-    return run.updated_at
+def _event_payload(event: RunEvent) -> dict[str, Any]:
+    return {
+        "run_id": event.run_id,
+        "status": event.status.value if event.status else None,
+        "timestamp": event.timestamp.isoformat(),
+        "progress": event.progress,
+        "tasks": event.tasks,
+        "first_failure": event.first_failure,
+    }
 
 
-def _progress_from_metrics(metrics: dict[str, Any] | None) -> float | None:
-    if not metrics:
+def _last_event_id(value: str | None) -> int | None:
+    if not value:
         return None
-    raw = metrics.get("progress")
-    if isinstance(raw, (int, float)):
-        return float(raw)
-    completed = metrics.get("tasks_completed")
-    total = metrics.get("tasks_total")
-    if isinstance(completed, (int, float)) and isinstance(total, (int, float)) and total:
-        return float(completed) / float(total)
-    return None
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise ValidationError("Invalid Last-Event-ID", detail=value) from exc
+
+
+async def _replay_then_follow(
+    database: DatabaseService,
+    live: Subscription,
+    last_event_id: int | None,
+    *,
+    run_id: str | None = None,
+    user_email: str | None = None,
+) -> AsyncIterator[RunEvent]:
+    # The live subscription is registered before the replay query, so events committed
+    # in between arrive on it; anything the client or the replay already covered is skipped.
+    replayed: set[int] = set()
+    after = last_event_id
+    while after is not None:
+        async with database.session_factory() as session:
+            missed = await RunEventService.create(session).list_events(
+                after=after, run_id=run_id, user_email=user_email
+            )
+        for event in missed:
+            replayed.add(event.seq)
+            after = event.seq
+            yield event
+        if len(missed) < RUN_EVENTS_PAGE_SIZE:
+            break
+    async for event in live:
+        if event.seq is not None and (
+            event.seq in replayed or (last_event_id is not None and event.seq <= last_event_id)
+        ):
+            continue
+        yield event
+
+
+def _subscribe_run_changes(
+    broker: StreamBroker, database: DatabaseService, listener: RunStatusListener | None
+) -> Subscription:
+    # One shared poller over run_events feeds every event stream in this process; per-run
+    # streams filter it rather than tailing run_events themselves.
+    return broker.subscribe(
+        ("run-events",),
+        lambda: poll_run_changes(
+            database,
+            listener=listener,
+            fallback_interval=float(settings.get("run_events_fallback_poll_seconds", 30)),
+        ),
+    )
 
 
 def _cancel_batch_job(batch_job_name: str | None) -> None:
@@ -96,34 +169,90 @@ async def list_runs(
     pipeline: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=25, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    total: Literal["exact", "estimated", "none"] = Query(default="exact"),
+    fields: str | None = Query(default=None, description="Comma-separated run fields"),
     include_all: bool = Query(default=False, alias="all"),
     user: UserContext = Depends(get_current_user_context),
     session: AsyncSession = Depends(get_db_session),
-) -> RunListResponse:
+) -> RunListResponse | JSONResponse:
     if include_all and not user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
     service = RunStoreService.create(session, settings)
     user_filter = None if include_all and user.is_admin else user.email
-    return await service.list_runs(
-        user_email=user_filter,
-        status=status,
-        pipeline=pipeline,
-        page=page,
-        page_size=page_size,
-    )
+    projection = _parse_fields(fields)
+    try:
+        runs = await service.list_runs(
+            user_email=user_filter,
+            status=status,
+            pipeline=pipeline,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            total=total,
+            fields=projection,
+        )
+    except ValueError as exc:
+        raise ValidationError("Invalid run list request", detail=str(exc)) from exc
+    return _projected_response(runs) if projection else runs
+
+
+@router.get("/runs/events")
+async def stream_all_run_events(
+    request: Request,
+    status_filter: list[RunStatus] | None = Query(default=None, alias="status"),
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+    user: UserContext = Depends(get_current_user_context),
+    database: DatabaseService = Depends(get_database_service),
+    broker: StreamBroker = Depends(get_stream_broker),
+    listener: RunStatusListener | None = Depends(get_run_status_listener),
+) -> StreamingResponse:
+    resume_from = _last_event_id(last_event_id)
+    owner = None if user.is_admin else user.email
+    statuses = set(status_filter or ())
+
+    async def event_generator():
+        live = _subscribe_run_changes(broker, database, listener)
+        events = _replay_then_follow(database, live, resume_from, user_email=owner)
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    break
+                if owner is not None and event.user_email != owner:
+                    continue
+                if statuses and event.status not in statuses:
+                    continue
+                yield _sse_event(event.event, _event_payload(event), str(event.seq))
+        finally:
+            await events.aclose()
+            await live.aclose()
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 
 @router.get("/runs/{run_id}", response_model=RunResponse)
 async def get_run(
     run_id: str,
+    fields: str | None = Query(default=None, description="Comma-separated run fields"),
     user: UserContext = Depends(get_current_user_context),
     session: AsyncSession = Depends(get_db_session),
-) -> RunResponse:
+) -> RunResponse | JSONResponse:
     service = RunStoreService.create(session, settings)
-    run = await service.get_run(run_id)
+    projection = _parse_fields(fields)
+    try:
+        # user_email is always loaded for the ownership check.
+        run = await service.get_run(
+            run_id, fields=[*projection, "user_email"] if projection else None
+        )
+    except ValueError as exc:
+        raise ValidationError("Invalid run fields", detail=str(exc)) from exc
     if not run:
         raise NotFoundError("Run not found", detail=f"No run exists with ID {run_id}")
     _ensure_owner_or_admin(run, user)
+    if projection:
+        if "user_email" not in projection:
+            run.model_fields_set.discard("user_email")
+        return _projected_response(run)
     return run
 
 
@@ -178,7 +307,7 @@ async def cancel_run(
         raise NotFoundError("Run not found", detail=f"No run exists with ID {run_id}")
     _ensure_owner_or_admin(run, user)
 
-    if run.status in _TERMINAL_STATUSES:
+    if run.status in TERMINAL_STATUSES:
         raise ValidationError("Run is already in terminal state", detail=run.status.value)
 
     _cancel_batch_job(run.batch_job_name)
@@ -225,6 +354,9 @@ async def recover_run(
 @router.get("/runs/{run_id}/files")
 async def list_run_files(
     run_id: str,
+    path: str = Query(default=""),
+    page_size: int = Query(default=DEFAULT_LIST_PAGE_SIZE, ge=1, le=1000),
+    page_token: str | None = Query(default=None),
     storage: StorageService = Depends(get_storage_service),
     user: UserContext = Depends(get_current_user_context),
     session: AsyncSession = Depends(get_db_session),
@@ -235,73 +367,116 @@ async def list_run_files(
         raise NotFoundError("Run not found", detail=f"No run exists with ID {run_id}")
     _ensure_owner_or_admin(run, user)
 
-    grouped = storage.get_run_files(run_id)
-    for entries in grouped.values():
-        for entry in entries:
-            gcs_uri = str(entry.get("gcs_uri"))
-            entry["download_url"] = storage.generate_signed_url(gcs_uri)
-            updated = entry.get("updated")
-            if isinstance(updated, datetime):
-                entry["updated_at"] = updated.isoformat()
-            elif updated is not None:
-                entry["updated_at"] = updated
-    return grouped
+    manifest = None
+    if run_settled(run):
+        try:
+            # Written by the settled-run sweep; until then the listing comes from GCS.
+            manifest = await asyncio.to_thread(storage.get_run_manifest, run_id, build=False)
+        except Exception as exc:
+            logger.warning("Failed to load results manifest for %s: %s", run_id, exc)
+
+    try:
+        listing = await asyncio.to_thread(
+            storage.get_run_files,
+            run_id,
+            path,
+            page_size=page_size,
+            page_token=page_token,
+            manifest=manifest,
+        )
+    except ValueError as exc:
+        raise ValidationError("Invalid file path", detail=str(exc)) from exc
+    for entry in listing["files"]:
+        # Signing is deferred to the download endpoint; listings only carry its path.
+        entry["download_url"] = (
+            f"/api/runs/{run_id}/files/download?path={quote(str(entry['name']), safe='/')}"
+        )
+        updated = entry.get("updated")
+        if isinstance(updated, datetime):
+            entry["updated_at"] = updated.isoformat()
+        elif updated is not None:
+            entry["updated_at"] = updated
+    return listing
+
+
+@router.get("/runs/{run_id}/files/download")
+async def download_run_file(
+    run_id: str,
+    path: str = Query(..., min_length=1),
+    storage: StorageService = Depends(get_storage_service),
+    user: UserContext = Depends(get_current_user_context),
+    session: AsyncSession = Depends(get_db_session),
+) -> RedirectResponse:
+    service = RunStoreService.create(session, settings)
+    run = await service.get_run(run_id)
+    if not run:
+        raise NotFoundError("Run not found", detail=f"No run exists with ID {run_id}")
+    _ensure_owner_or_admin(run, user)
+
+    try:
+        gcs_uri = storage.run_file_uri(run_id, path)
+    except ValueError as exc:
+        raise ValidationError("Invalid file path", detail=str(exc)) from exc
+    signed_url = await asyncio.to_thread(storage.get_signed_url, gcs_uri)
+    return RedirectResponse(signed_url, status_code=status.HTTP_302_FOUND)
 
 
 @router.get("/runs/{run_id}/events")
 async def stream_run_events(
     run_id: str,
     request: Request,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
     user: UserContext = Depends(get_current_user_context),
-    session: AsyncSession = Depends(get_db_session),
+    database: DatabaseService = Depends(get_database_service),
+    broker: StreamBroker = Depends(get_stream_broker),
+    listener: RunStatusListener | None = Depends(get_run_status_listener),
 ) -> StreamingResponse:
-    service = RunStoreService.create(session, settings)
-    run = await service.get_run(run_id)
+    resume_from = _last_event_id(last_event_id)
+    # Streams outlive the request, so authorize with a session that is closed before
+    # streaming starts; the shared poller opens its own short sessions.
+    async with database.session_factory() as session:
+        run = await RunStoreService.create(session, settings).get_run(run_id)
     if not run:
         raise NotFoundError("Run not found", detail=f"No run exists with ID {run_id}")
     _ensure_owner_or_admin(run, user)
 
     async def event_generator():
-        last_status = run.status
-        start = datetime.now(timezone.utc)
-        yield _sse_event(
-            "status",
-            {
-                "status": last_status.value,
-                "timestamp": _status_timestamp(run).isoformat(),
-                "progress": _progress_from_metrics(run.metrics),
-            },
+        live = broker.subscribe(
+            ("run-events", run_id),
+            lambda: poll_run_events(
+                database, run_id, _subscribe_run_changes(broker, database, listener)
+            ),
         )
-        while True:
-            if await request.is_disconnected():
-                break
-            current = await service.get_run(run_id)
-            if not current:
-                yield _sse_event("done", {"status": "not_found"})
-                break
-            if current.status != last_status:
-                last_status = current.status
-                yield _sse_event(
-                    "status",
-                    {
-                        "status": last_status.value,
-                        "timestamp": _status_timestamp(current).isoformat(),
-                        "progress": _progress_from_metrics(current.metrics),
-                    },
-                )
-                if last_status in _TERMINAL_STATUSES:
+        events = _replay_then_follow(database, live, resume_from, run_id=run_id)
+        deadline = asyncio.get_running_loop().time() + _EVENT_STREAM_TIMEOUT_SECONDS
+        try:
+            while not await request.is_disconnected():
+                remaining = deadline - asyncio.get_running_loop().time()
+                try:
+                    event = await asyncio.wait_for(anext(events), max(remaining, 0))
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    yield _sse_event("done", {"status": "timeout"})
+                    break
+                if event.event == "done":
                     yield _sse_event(
                         "done",
                         {
-                            "status": last_status.value,
-                            "timestamp": _status_timestamp(current).isoformat(),
+                            "status": event.status.value if event.status else "not_found",
+                            "timestamp": event.timestamp.isoformat(),
                         },
                     )
                     break
-            elapsed = (datetime.now(timezone.utc) - start).total_seconds()
-            if elapsed > 600:
-                yield _sse_event("done", {"status": "timeout"})
-                break
-            await asyncio.sleep(2)
+                yield _sse_event(event.event, _event_payload(event), str(event.seq))
+                if event.status in TERMINAL_STATUSES:
+                    yield _sse_event(
+                        "done",
+                        {"status": event.status.value, "timestamp": event.timestamp.isoformat()},
+                    )
+                    break
+        finally:
+            await events.aclose()
+            await live.aclose()
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
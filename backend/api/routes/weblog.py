@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+
+from backend.config import settings
+from backend.dependencies import get_weblog_aggregator
+from backend.services.weblog import WeblogAggregator
+from backend.utils.auth import verify_weblog_token
+from backend.utils.errors import ValidationError
+
+# Called by Nextflow (-with-weblog) from the orchestrator, not by users, so it is not
+# behind the user-authenticated api_router; the per-run token in the URL is the auth.
+router = APIRouter(tags=["weblog"])
+
+MAX_WEBLOG_BATCH = 1000
+
+
+@router.post("/runs/{run_id}/weblog", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_weblog(
+    run_id: str,
+    payload: dict[str, Any] | list[dict[str, Any]] = Body(...),
+    token: str = Query(default=""),
+    aggregator: WeblogAggregator = Depends(get_weblog_aggregator),
+) -> dict[str, int]:
+    secret = settings.get("weblog_secret")
+    if not secret or not verify_weblog_token(str(secret), run_id, token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    # Nextflow posts one event per request; relays may batch several into a list.
+    events = payload if isinstance(payload, list) else [payload]
+    if len(events) > MAX_WEBLOG_BATCH:
+        raise ValidationError("Too many weblog events", detail=f"Limit is {MAX_WEBLOG_BATCH}")
+    return {"accepted": aggregator.ingest(run_id, events)}
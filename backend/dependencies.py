@@ -7,7 +7,11 @@ from .context import AppContext
 from .services.benchling import BenchlingService
 from .services.database import DatabaseService
 from .services.gemini import DisabledGeminiService, GeminiService
+from .services.run_notifications import RunStatusListener
+from .services.scheduler import Scheduler
 from .services.storage import StorageService
+from .services.streams import StreamBroker
+from .services.weblog import WeblogAggregator
 from .utils.circuit_breaker import Breakers
 from .utils.auth import UserContext, get_current_user
 
@@ -36,6 +40,22 @@ def get_storage_service(request: Request) -> StorageService:
     return request.app.state.storage_service
 
 
+def get_run_status_listener(request: Request) -> RunStatusListener | None:
+    return request.app.state.run_status_listener
+
+
+def get_stream_broker(request: Request) -> StreamBroker:
+    return request.app.state.stream_broker
+
+
+def get_scheduler(request: Request) -> Scheduler:
+    return request.app.state.scheduler
+
+
+def get_weblog_aggregator(request: Request) -> WeblogAggregator:
+    return request.app.state.weblog_aggregator
+
+
 def get_gemini_service(request: Request) -> GeminiService | DisabledGeminiService:
     return request.app.state.gemini_service
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 import logging
 import os
+from datetime import timedelta
 from pathlib import Path
 from typing import AsyncIterator
 
@@ -17,14 +18,26 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from .agents.checkpointer import cleanup_old_threads
 from .api.routes import api_router
+from .api.routes.benchling import refresh_benchling_metadata
 from .api.routes.chat import router as chat_router
 from .api.routes.health import router as health_router
+from .api.routes.weblog import router as weblog_router
 from .config import settings
+from .services.batch import BatchService
 from .services.benchling import BenchlingService
 from .services.database import DatabaseService
 from .services.gemini import DisabledGeminiService, GeminiService
+from .services.logs import prune_trace_cache
+from .services.run_events import prune_run_events
+from .services.run_notifications import RunStatusListener
+from .services.runs import RunStoreService
+from .services.scheduler import Scheduler
 from .services.storage import StorageService
+from .services.streams import StreamBroker
+from .services.task_metrics import ingest_task_metrics
+from .services.weblog import WeblogAggregator
 from .utils.circuit_breaker import create_breakers
 from .utils.errors import register_exception_handlers
 
@@ -44,6 +57,57 @@ def _mount_static_assets(app: FastAPI, dist_dir: Path) -> None:
         app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
 
 
+def _schedule_background_jobs(scheduler: Scheduler, app: FastAPI) -> None:
+    database = app.state.database_service
+
+    async def reconcile_runs() -> None:
+        batch = BatchService.create(settings)
+        async for session in database.get_session():
+            await RunStoreService.create(session, settings).reconcile_stale_runs(batch=batch)
+
+    async def cleanup_threads() -> None:
+        await cleanup_old_threads(database, int(settings.get("thread_max_age_days", 30)))
+
+    async def prune_events() -> None:
+        retention = float(settings.get("run_event_metrics_retention_seconds", 3600))
+        await prune_run_events(database, timedelta(seconds=retention))
+
+    # (name, interval setting, default seconds, job, leader only); an interval of 0 disables.
+    jobs = [
+        ("reconcile_stale_runs", "reconcile_interval_seconds", 300, reconcile_runs, True),
+        ("cleanup_old_threads", "thread_cleanup_interval_seconds", 86400, cleanup_threads, True),
+        ("prune_run_events", "run_event_prune_seconds", 3600, prune_events, True),
+        (
+            "ingest_task_metrics",
+            "task_metrics_interval_seconds",
+            300,
+            lambda: ingest_task_metrics(database, app.state.storage_service, settings),
+            True,
+        ),
+        # Caches are per process, so every replica refreshes its own.
+        (
+            "refresh_benchling_metadata",
+            "benchling_metadata_refresh_seconds",
+            240,
+            lambda: refresh_benchling_metadata(app.state.benchling_service),
+            False,
+        ),
+        ("prune_trace_cache", "trace_cache_prune_seconds", 60, prune_trace_cache, False),
+        # Weblog counters are held by whichever replica received the events.
+        (
+            "flush_weblog_metrics",
+            "weblog_flush_seconds",
+            5,
+            lambda: app.state.weblog_aggregator.flush(database, settings),
+            False,
+        ),
+    ]
+    for name, setting, default, func, leader_only in jobs:
+        interval = float(settings.get(setting, default))
+        if interval > 0:
+            scheduler.register(name, func, interval=interval, leader_only=leader_only)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("Starting Arc Reactor services")
@@ -58,15 +122,36 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         raise
     app.state.database_service = DatabaseService.create(settings)
     app.state.storage_service = StorageService.create(settings)
+    app.state.run_status_listener = RunStatusListener.create(app.state.database_service)
+    if app.state.run_status_listener is not None:
+        app.state.run_status_listener.start()
+    app.state.stream_broker = StreamBroker(
+        history=int(settings.get("stream_history_size", 500))
+    )
+    app.state.weblog_aggregator = WeblogAggregator()
     try:
         app.state.gemini_service = GeminiService.create(settings, breakers)
     except Exception as exc:
         logger.warning("Gemini service failed to initialize: %s", exc)
         app.state.gemini_service = DisabledGeminiService(error=exc)
 
+    app.state.scheduler = Scheduler(
+        app.state.database_service,
+        shutdown_timeout=float(settings.get("scheduler_shutdown_timeout_seconds", 30)),
+    )
+    if settings.get("scheduler_enabled", True):
+        _schedule_background_jobs(app.state.scheduler, app)
+        app.state.scheduler.start()
+
     yield
 
     logger.info("Shutting down Arc Reactor services")
+    await app.state.scheduler.close()
+    # Counters received since the last scheduled flush would otherwise be lost.
+    await app.state.weblog_aggregator.flush(app.state.database_service, settings)
+    await app.state.stream_broker.close()
+    if app.state.run_status_listener is not None:
+        await app.state.run_status_listener.close()
     app.state.benchling_service.close()
     # BenchlingService.close_all_engines()
     await app.state.database_service.close()
@@ -91,6 +176,7 @@ def create_app() -> FastAPI:
 
     app.include_router(health_router)
     app.include_router(api_router, prefix="/api")
+    app.include_router(weblog_router, prefix="/api")
     app.include_router(chat_router)
 
     dist_dir = Path(settings.get("frontend_out_dir", "frontend/out")).resolve()
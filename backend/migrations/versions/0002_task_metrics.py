@@ -0,0 +1,84 @@
+"""task_metrics
+
+Revision ID: 0002_task_metrics
+Revises: 0001_initial_schema
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002_task_metrics"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_metrics",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("run_id", sa.String(length=50), nullable=False),
+        sa.Column("pipeline", sa.String(length=100), nullable=False),
+        sa.Column("pipeline_version", sa.String(length=20), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("process", sa.Text(), nullable=False),
+        sa.Column("task_hash", sa.String(length=20), nullable=True),
+        sa.Column("name", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("attempt", sa.Integer(), nullable=True),
+        sa.Column("duration_s", sa.Float(), nullable=True),
+        sa.Column("realtime_s", sa.Float(), nullable=True),
+        sa.Column("queue_wait_s", sa.Float(), nullable=True),
+        sa.Column("cpus", sa.Integer(), nullable=True),
+        sa.Column("cpu_percent", sa.Float(), nullable=True),
+        sa.Column("memory_bytes", sa.Float(), nullable=True),
+        sa.Column("peak_rss_bytes", sa.Float(), nullable=True),
+        sa.Column("read_bytes", sa.Float(), nullable=True),
+        sa.Column("write_bytes", sa.Float(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_task_metrics_run_id", "task_metrics", ["run_id"], unique=False)
+    op.create_index(
+        "idx_task_metrics_pipeline_process",
+        "task_metrics",
+        ["pipeline", "process", "pipeline_version"],
+        unique=False,
+    )
+    op.add_column(
+        "runs",
+        sa.Column("task_metrics_ingested_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "runs",
+        sa.Column(
+            "task_metrics_attempts", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.create_index(
+        "idx_runs_task_metrics_pending",
+        "runs",
+        ["updated_at"],
+        unique=False,
+        postgresql_where=sa.text("task_metrics_ingested_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_runs_task_metrics_pending", table_name="runs")
+    op.drop_column("runs", "task_metrics_attempts")
+    op.drop_column("runs", "task_metrics_ingested_at")
+    op.drop_index("idx_task_metrics_pipeline_process", table_name="task_metrics")
+    op.drop_index("idx_task_metrics_run_id", table_name="task_metrics")
+    op.drop_table("task_metrics")
@@ -0,0 +1,52 @@
+"""run_events
+
+Revision ID: 0004_run_events
+Revises: 0002_task_metrics
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_run_events"
+down_revision = "0002_task_metrics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_events",
+        sa.Column("seq", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("run_id", sa.String(length=50), nullable=False),
+        sa.Column("type", sa.String(length=20), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column(
+            "ts",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("seq"),
+    )
+    op.create_index("idx_run_events_run_id_seq", "run_events", ["run_id", "seq"], unique=False)
+    # Seed each existing run with its current status so streams have a starting point.
+    op.execute(
+        """
+        INSERT INTO run_events (run_id, type, payload, ts)
+        SELECT run_id, 'status', jsonb_build_object('status', status, 'progress', NULL), updated_at
+        FROM runs
+        ORDER BY updated_at, run_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_run_events_run_id_seq", table_name="run_events")
+    op.drop_table("run_events")
@@ -0,0 +1,59 @@
+"""run status transition trigger
+
+Revision ID: 0005_run_status_transitions
+Revises: 0004_run_events
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_run_status_transitions"
+down_revision = "0004_run_events"
+branch_labels = None
+depends_on = None
+
+# Snapshot of backend.services.runs._STATUS_TRANSITIONS; terminal statuses have no exits.
+_TRANSITIONS = {
+    "pending": ("submitted", "cancelled", "failed"),
+    "submitted": ("running", "cancelled", "failed"),
+    "running": ("completed", "failed", "cancelled"),
+}
+
+
+def upgrade() -> None:
+    allowed = " OR ".join(
+        f"(OLD.status = '{current}' AND NEW.status IN ({', '.join(repr(t) for t in targets)}))"
+        for current, targets in _TRANSITIONS.items()
+    )
+    op.execute(
+        f"""
+        CREATE FUNCTION enforce_run_status_transition() RETURNS trigger AS $$
+        BEGIN
+            IF NOT ({allowed}) THEN
+                RAISE EXCEPTION 'Invalid run status transition: % -> %', OLD.status, NEW.status
+                    USING ERRCODE = 'check_violation';
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER runs_status_transition
+        BEFORE UPDATE OF status ON runs
+        FOR EACH ROW
+        WHEN (OLD.status IS DISTINCT FROM NEW.status)
+        EXECUTE FUNCTION enforce_run_status_transition()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS runs_status_transition ON runs")
+    op.execute("DROP FUNCTION IF EXISTS enforce_run_status_transition()")
@@ -1,6 +1,8 @@
 from .checkpoints import Checkpoint
 from .database import Base
+from .run_events import RunEventEntry
 from .runs import Run
+from .task_metrics import TaskMetric
 from .users import User
 
-__all__ = ["Base", "Checkpoint", "Run", "User"]
+__all__ = ["Base", "Checkpoint", "Run", "RunEventEntry", "TaskMetric", "User"]
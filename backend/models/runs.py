@@ -61,6 +61,10 @@ class Run(Base):
     metrics: Mapped[dict[str, Any] | None] = mapped_column(
         JSONB().with_variant(JSON, "sqlite")
     )
+    task_metrics_ingested_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    task_metrics_attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
 
     __table_args__ = (
         Index(
@@ -70,4 +74,11 @@ class Run(Base):
         ),
         Index("idx_runs_status_created_at", "status", text("created_at DESC")),
         Index("idx_runs_created_at", text("created_at DESC")),
+        # Runs still waiting for task metrics ingestion, scanned on every scheduler tick.
+        Index(
+            "idx_runs_task_metrics_pending",
+            "updated_at",
+            postgresql_where=text("task_metrics_ingested_at IS NULL"),
+            sqlite_where=text("task_metrics_ingested_at IS NULL"),
+        ),
     )
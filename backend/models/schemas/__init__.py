@@ -1,11 +1,14 @@
-from .logs import LogEntry, TaskInfo, TaskLogs
+from .logs import LogEntry, TaskInfo, TaskLogs, TaskSummary, TaskTimeline
 from .pipelines import PipelineListResponse, PipelineParam, PipelineSchema, SamplesheetColumn
 from .runs import RunCreateRequest, RunListResponse, RunRecoverRequest, RunResponse, RunStatus
+from .task_metrics import MetricRegression, ProcessVersionStats, TaskMetricsComparison
 
 __all__ = [
     "LogEntry",
     "TaskInfo",
     "TaskLogs",
+    "TaskSummary",
+    "TaskTimeline",
     "PipelineListResponse",
     "PipelineParam",
     "PipelineSchema",
@@ -15,4 +18,7 @@ __all__ = [
     "RunRecoverRequest",
     "RunResponse",
     "RunStatus",
+    "MetricRegression",
+    "ProcessVersionStats",
+    "TaskMetricsComparison",
 ]
@@ -33,3 +33,68 @@ class TaskLogs(BaseModel):
     task_id: str
     stdout: str
     stderr: str
+    truncated: bool = False
+
+
+class ProcessSummary(BaseModel):
+    process: str
+    tasks: int
+    succeeded: int
+    failed: int
+    retries: int
+    duration_p50_s: float | None = None
+    duration_p95_s: float | None = None
+    realtime_total_s: float | None = None
+    cpu_hours: float | None = None
+    peak_rss_max_bytes: float | None = None
+    memory_requested_bytes: float | None = None
+    memory_headroom_percent: float | None = None
+    read_bytes: float | None = None
+    write_bytes: float | None = None
+
+
+class TaskSummary(BaseModel):
+    run_id: str
+    total_tasks: int
+    processes: list[ProcessSummary]
+
+
+class CriticalPathTask(BaseModel):
+    name: str
+    process: str
+    submit: datetime
+    start: datetime
+    complete: datetime
+    queue_wait_s: float
+    run_s: float
+
+
+class ProcessShare(BaseModel):
+    process: str
+    seconds: float
+    share: float | None = None
+
+
+class ConcurrencyPoint(BaseModel):
+    time: datetime
+    running: int
+
+
+class QueueBottleneck(BaseModel):
+    process: str
+    tasks: int
+    queue_wait_p50_s: float
+    queue_wait_p95_s: float
+    queue_wait_total_s: float
+
+
+class TaskTimeline(BaseModel):
+    run_id: str
+    wall_clock_s: float | None = None
+    critical_path_s: float | None = None
+    critical_path: list[CriticalPathTask]
+    critical_path_by_process: list[ProcessShare]
+    peak_concurrency: int
+    mean_concurrency: float | None = None
+    concurrency: list[ConcurrencyPoint]
+    queue_bottlenecks: list[QueueBottleneck]
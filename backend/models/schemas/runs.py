@@ -56,9 +56,12 @@ class RunResponse(BaseModel):
 
 class RunListResponse(BaseModel):
     runs: list[RunResponse]
-    total: int
+    # None when the caller asked for no total; approximate when total_estimated is set.
+    total: int | None
     page: int
     page_size: int
+    total_estimated: bool = False
+    next_cursor: str | None = None
 
 
 class RunRecoverRequest(BaseModel):
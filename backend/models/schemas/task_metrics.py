@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class ProcessVersionStats(BaseModel):
+    process: str
+    pipeline_version: str
+    tasks: int
+    runs: int
+    sample_count_min: int
+    sample_count_max: int
+    realtime_p50_s: float | None = None
+    realtime_p95_s: float | None = None
+    peak_rss_p50_bytes: float | None = None
+    peak_rss_p95_bytes: float | None = None
+
+
+class MetricRegression(BaseModel):
+    process: str
+    metric: str
+    baseline_version: str
+    pipeline_version: str
+    baseline_median: float
+    median: float
+    change_percent: float
+    p_value: float
+
+
+class TaskMetricsComparison(BaseModel):
+    pipeline: str
+    versions: list[str]
+    stats: list[ProcessVersionStats]
+    regressions: list[MetricRegression]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Index, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .database import Base
+
+
+class TaskMetric(Base):
+    __tablename__ = "task_metrics"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    pipeline: Mapped[str] = mapped_column(String(100), nullable=False)
+    pipeline_version: Mapped[str] = mapped_column(String(20), nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    process: Mapped[str] = mapped_column(Text, nullable=False)
+    task_hash: Mapped[str | None] = mapped_column(String(20))
+    name: Mapped[str | None] = mapped_column(Text)
+    status: Mapped[str | None] = mapped_column(String(20))
+    attempt: Mapped[int | None] = mapped_column(Integer)
+
+    duration_s: Mapped[float | None] = mapped_column(Float)
+    realtime_s: Mapped[float | None] = mapped_column(Float)
+    queue_wait_s: Mapped[float | None] = mapped_column(Float)
+    cpus: Mapped[int | None] = mapped_column(Integer)
+    cpu_percent: Mapped[float | None] = mapped_column(Float)
+    memory_bytes: Mapped[float | None] = mapped_column(Float)
+    peak_rss_bytes: Mapped[float | None] = mapped_column(Float)
+    read_bytes: Mapped[float | None] = mapped_column(Float)
+    write_bytes: Mapped[float | None] = mapped_column(Float)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+
+    __table_args__ = (
+        Index("idx_task_metrics_run_id", "run_id"),
+        Index("idx_task_metrics_pipeline_process", "pipeline", "process", "pipeline_version"),
+    )
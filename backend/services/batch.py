@@ -5,9 +5,11 @@ import os
 import re
 import time
 from dataclasses import dataclass
-from typing import Any, Callable
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
 
 from backend.models.schemas.runs import RunStatus
+from backend.utils.auth import weblog_token
 from backend.utils.errors import BatchError
 
 try:  # optional dependency
@@ -22,6 +24,8 @@ logger = logging.getLogger(__name__)
 
 _LABEL_ALLOWED_RE = re.compile(r"[^a-z0-9_-]")
 
+APP_LABEL = "arc-reactor"
+
 
 @dataclass
 class BatchQuotaExceededError(BatchError):
@@ -47,6 +51,7 @@ _STATE_TO_RUN_STATUS: dict[str, RunStatus] = {
     "CANCELLED": RunStatus.CANCELLED,
     "DELETION_IN_PROGRESS": RunStatus.CANCELLED,
 }
+TERMINAL_JOB_STATES = ("SUCCEEDED", "FAILED", "CANCELLED", "DELETION_IN_PROGRESS")
 
 
 def _build_batch_database_url(settings: object) -> str:
@@ -77,6 +82,15 @@ def _sanitize_label_value(value: str, *, max_length: int = 63) -> str:
     return normalized[:max_length]
 
 
+def job_region(job_name: str) -> str | None:
+    """Region of a ``projects/*/locations/{region}/jobs/*`` job name."""
+    parts = job_name.split("/")
+    try:
+        return parts[parts.index("locations") + 1]
+    except (ValueError, IndexError):
+        return None
+
+
 def _is_instance(exc: Exception, candidate: Any) -> bool:
     if candidate is None:
         return False
@@ -94,6 +108,8 @@ class BatchService:
     orchestrator_image: str
     service_account: str | None
     database_url: str
+    weblog_base_url: str | None = None
+    weblog_secret: str | None = None
 
     @classmethod
     def create(cls, settings: object) -> "BatchService":
@@ -126,8 +142,16 @@ class BatchService:
             orchestrator_image=orchestrator_image,
             service_account=service_account,
             database_url=database_url,
+            weblog_base_url=getattr(settings, "weblog_base_url", None) or None,
+            weblog_secret=getattr(settings, "weblog_secret", None),
         )
 
+    def _weblog_url(self, run_id: str) -> str | None:
+        if not self.weblog_base_url or not self.weblog_secret:
+            return None
+        token = weblog_token(self.weblog_secret, run_id)
+        return f"{self.weblog_base_url.rstrip('/')}/api/runs/{run_id}/weblog?token={token}"
+
     def _parent(self) -> str:
         return f"projects/{self.project}/locations/{self.region}"
 
@@ -136,7 +160,7 @@ class BatchService:
         # only [a-z0-9_-]; we sanitize inputs so labels remain queryable in Cloud Logging.
         labels = {
             "run-id": _sanitize_label_value(run_id),
-            "app": "arc-reactor",
+            "app": APP_LABEL,
             "pipeline": _sanitize_label_value(pipeline),
         }
         if user_email:
@@ -208,6 +232,9 @@ class BatchService:
             "DATABASE_URL": self.database_url,
             "IS_RECOVERY": "true" if is_recovery else "false",
         }
+        weblog_url = self._weblog_url(run_id)
+        if weblog_url:
+            env["WEBLOG_URL"] = weblog_url
 
         runnable = batch_v1.Runnable(
             container=batch_v1.Runnable.Container(
@@ -266,7 +293,45 @@ class BatchService:
             if _is_instance(exc, getattr(gcp_exceptions, "NotFound", None)):
                 raise BatchJobNotFoundError("Batch job not found", detail=str(exc))
             raise BatchError("Failed to fetch Batch job status", detail=str(exc))
+        return self._job_status(job)
+
+    def list_jobs(
+        self,
+        *,
+        region: str | None = None,
+        states: Iterable[str] | None = None,
+        created_after: datetime | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        """Statuses of this app's jobs in ``region``, keyed by job name.
+
+        Jobs are selected by the ``app`` label, and optionally by state and creation time,
+        server-side, so one paged call replaces a ``get_job_status`` per run. Blocking;
+        call it from a worker thread in async code.
+        """
+        if batch_v1 is None:
+            raise BatchError("GCP Batch client unavailable")
+
+        parent = f"projects/{self.project}/locations/{region or self.region}"
+        clauses = [f'labels.app="{APP_LABEL}"']
+        if states:
+            clauses.append(f"status.state:({' OR '.join(states)})")
+        if created_after is not None:
+            if created_after.tzinfo is None:
+                created_after = created_after.replace(tzinfo=timezone.utc)
+            timestamp = created_after.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            clauses.append(f'create_time>="{timestamp}"')
+        try:
+            request = batch_v1.ListJobsRequest(
+                parent=parent, filter=" AND ".join(clauses), page_size=500
+            )
+            return {
+                job.name: self._job_status(job) for job in self.client.list_jobs(request=request)
+            }
+        except Exception as exc:
+            raise BatchError("Failed to list Batch jobs", detail=str(exc))
 
+    @staticmethod
+    def _job_status(job: Any) -> dict[str, Any]:
         state = getattr(getattr(job.status, "state", None), "name", None)
         events = []
         for event in getattr(job.status, "status_events", []) or []:
@@ -59,6 +59,15 @@ class DatabaseService:
         except Exception:
             return False
 
+    def pool_stats(self) -> dict[str, int]:
+        # QueuePool exposes occupancy counters; NullPool/StaticPool (sqlite) do not.
+        stats: dict[str, int] = {}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            counter = getattr(self.engine.pool, name, None)
+            if callable(counter):
+                stats[name] = int(counter())
+        return stats
+
     async def get_session(self) -> AsyncIterator[AsyncSession]:
         async with self.session_factory() as session:
             yield session
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+try:  # optional dependency, installed alongside google-cloud-storage
+    import google_crc32c
+except Exception:  # pragma: no cover - handled at runtime
+    google_crc32c = None  # type: ignore
+
+_METADATA_DIR = ".metadata"
+
+
+def _crc32c(data: bytes) -> str | None:
+    if google_crc32c is None:
+        return None
+    return base64.b64encode(google_crc32c.value(data).to_bytes(4, "big")).decode("ascii")
+
+
+class LocalBlob:
+    """Filesystem object mirroring the subset of ``google.cloud.storage.Blob`` we use."""
+
+    def __init__(self, bucket: "LocalBucket", name: str) -> None:
+        self.bucket = bucket
+        self.name = name
+        self.metadata: dict[str, str] | None = None
+        self.content_type: str | None = None
+        self.size: int | None = None
+        self.updated: datetime | None = None
+        self.generation: int | None = None
+        self.crc32c: str | None = None
+
+    @property
+    def _data_path(self) -> Path:
+        return self.bucket.root / self.name
+
+    @property
+    def _sidecar_path(self) -> Path:
+        return self.bucket.metadata_root / f"{self.name}.json"
+
+    def exists(self) -> bool:
+        return self._data_path.is_file()
+
+    def reload(self) -> None:
+        stat = self._data_path.stat()
+        sidecar: dict[str, Any] = {}
+        if self._sidecar_path.is_file():
+            sidecar = json.loads(self._sidecar_path.read_text())
+        self.size = stat.st_size
+        self.updated = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        self.generation = sidecar.get("generation") or stat.st_mtime_ns
+        self.crc32c = sidecar.get("crc32c")
+        self.content_type = sidecar.get("content_type")
+        self.metadata = sidecar.get("metadata")
+
+    def upload_from_string(self, data: str | bytes, content_type: str = "text/plain") -> None:
+        payload = data.encode("utf-8") if isinstance(data, str) else data
+        self._write(payload, content_type)
+
+    def download_as_bytes(self, start: int | None = None, end: int | None = None) -> bytes:
+        if not self.exists():
+            raise FileNotFoundError(f"gs://{self.bucket.name}/{self.name}")
+        with self._data_path.open("rb") as handle:
+            offset = start or 0
+            handle.seek(offset)
+            if end is None:
+                return handle.read()
+            return handle.read(max(end - offset + 1, 0))
+
+    def delete(self) -> None:
+        if not self.exists():
+            raise FileNotFoundError(f"gs://{self.bucket.name}/{self.name}")
+        self._data_path.unlink()
+        self._sidecar_path.unlink(missing_ok=True)
+        self.bucket._prune_empty_dirs(self._data_path.parent)
+
+    def rewrite(self, source: "LocalBlob", token: str | None = None) -> tuple[None, int, int]:
+        if not source.exists():
+            raise FileNotFoundError(f"gs://{source.bucket.name}/{source.name}")
+        source.reload()
+        self._data_path.parent.mkdir(parents=True, exist_ok=True)
+        handle, tmp_name = tempfile.mkstemp(dir=self._data_path.parent, prefix=".upload-")
+        os.close(handle)
+        shutil.copyfile(source._data_path, tmp_name)
+        os.replace(tmp_name, self._data_path)
+        self._write_sidecar(source.crc32c, source.content_type)
+        return None, self.size or 0, self.size or 0
+
+    def generate_signed_url(
+        self,
+        *,
+        expiration: datetime | timedelta,
+        version: str = "v4",
+        method: str = "GET",
+    ) -> str:
+        if isinstance(expiration, timedelta):
+            expiration = datetime.now(timezone.utc) + expiration
+        return f"{self._data_path.resolve().as_uri()}?expires={int(expiration.timestamp())}"
+
+    def _write(self, payload: bytes, content_type: str | None) -> None:
+        self._data_path.parent.mkdir(parents=True, exist_ok=True)
+        handle, tmp_name = tempfile.mkstemp(dir=self._data_path.parent, prefix=".upload-")
+        with os.fdopen(handle, "wb") as tmp:
+            tmp.write(payload)
+        os.replace(tmp_name, self._data_path)
+        self._write_sidecar(_crc32c(payload), content_type)
+
+    def _write_sidecar(self, crc32c: str | None, content_type: str | None) -> None:
+        self._sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+        sidecar = {
+            "generation": time.time_ns(),
+            "crc32c": crc32c,
+            "content_type": content_type,
+            "metadata": self.metadata,
+        }
+        self._sidecar_path.write_text(json.dumps(sidecar))
+        self.reload()
+
+
+class LocalBucket:
+    def __init__(self, client: "LocalStorageClient", name: str) -> None:
+        self.client = client
+        self.name = name
+        self.root = client.root / name
+        self.metadata_root = client.root / _METADATA_DIR / name
+
+    def exists(self) -> bool:
+        return self.root.is_dir()
+
+    def blob(self, blob_name: str) -> LocalBlob:
+        return LocalBlob(self, blob_name)
+
+    def get_blob(self, blob_name: str) -> LocalBlob | None:
+        blob = LocalBlob(self, blob_name)
+        if not blob.exists():
+            return None
+        blob.reload()
+        return blob
+
+    def _prune_empty_dirs(self, directory: Path) -> None:
+        while directory != self.root and directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+            directory = directory.parent
+
+    def _iter_names(self, prefix: str, delimiter: str | None) -> Iterator[tuple[str, bool]]:
+        # Yields (name, is_prefix) in lexicographic order, like a GCS object listing.
+        base, _, _partial = prefix.rpartition("/")
+        start = self.root / base if base else self.root
+        if not start.is_dir():
+            return
+        if delimiter == "/":
+            for entry in sorted(os.scandir(start), key=lambda item: item.name):
+                if entry.name.startswith(".upload-"):
+                    continue
+                name = f"{base}/{entry.name}" if base else entry.name
+                if entry.is_dir():
+                    name = f"{name}/"
+                if name.startswith(prefix):
+                    yield name, entry.is_dir()
+            return
+
+        names: list[str] = []
+        for directory, dirnames, filenames in os.walk(start):
+            dirnames[:] = [item for item in dirnames if not item.startswith(".")]
+            rel_dir = Path(directory).relative_to(self.root).as_posix()
+            for filename in filenames:
+                if filename.startswith(".upload-"):
+                    continue
+                name = filename if rel_dir == "." else f"{rel_dir}/{filename}"
+                if name.startswith(prefix):
+                    names.append(name)
+        seen: set[str] = set()
+        for name in sorted(names):
+            rest = name[len(prefix) :]
+            if delimiter and delimiter in rest:
+                collapsed = prefix + rest.split(delimiter, 1)[0] + delimiter
+                if collapsed not in seen:
+                    seen.add(collapsed)
+                    yield collapsed, True
+                continue
+            yield name, False
+
+
+class LocalPage(list):
+    def __init__(self, blobs: list[LocalBlob], prefixes: tuple[str, ...]) -> None:
+        super().__init__(blobs)
+        self.prefixes = prefixes
+
+
+class LocalBlobIterator:
+    def __init__(
+        self,
+        bucket: LocalBucket,
+        entries: list[tuple[str, bool]],
+        page_size: int | None,
+    ) -> None:
+        self._bucket = bucket
+        self._entries = entries
+        self._page_size = page_size or len(entries) or 1
+        self.prefixes: set[str] = set()
+        self.next_page_token: str | None = None
+
+    @property
+    def pages(self) -> Iterator[LocalPage]:
+        for start in range(0, max(len(self._entries), 1), self._page_size):
+            chunk = self._entries[start : start + self._page_size]
+            blobs = []
+            prefixes = []
+            for name, is_prefix in chunk:
+                if is_prefix:
+                    prefixes.append(name)
+                else:
+                    blob = self._bucket.get_blob(name)
+                    if blob is not None:
+                        blobs.append(blob)
+            more = start + self._page_size < len(self._entries)
+            self.next_page_token = chunk[-1][0] if more and chunk else None
+            self.prefixes.update(prefixes)
+            yield LocalPage(blobs, tuple(prefixes))
+
+    def __iter__(self) -> Iterator[LocalBlob]:
+        for page in self.pages:
+            yield from page
+
+
+class LocalStorageClient:
+    """Maps ``gs://bucket/key`` onto ``<root>/bucket/key`` for offline development and tests.
+
+    Object generation, CRC32C, content type and custom metadata are kept in JSON
+    sidecars under ``<root>/.metadata`` so the data tree mirrors the bucket layout.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def bucket(self, bucket_name: str) -> LocalBucket:
+        return LocalBucket(self, bucket_name)
+
+    def create_bucket(self, bucket_name: str) -> LocalBucket:
+        bucket = self.bucket(bucket_name)
+        bucket.root.mkdir(parents=True, exist_ok=True)
+        return bucket
+
+    def list_blobs(
+        self,
+        bucket_or_name: str | LocalBucket,
+        prefix: str | None = None,
+        delimiter: str | None = None,
+        max_results: int | None = None,
+        page_size: int | None = None,
+        page_token: str | None = None,
+    ) -> LocalBlobIterator:
+        bucket = (
+            bucket_or_name
+            if isinstance(bucket_or_name, LocalBucket)
+            else self.bucket(bucket_or_name)
+        )
+        entries = [
+            entry
+            for entry in bucket._iter_names(prefix or "", delimiter)
+            if page_token is None or entry[0] > page_token
+        ]
+        if max_results is not None:
+            entries = entries[:max_results]
+        return LocalBlobIterator(bucket, entries, page_size)
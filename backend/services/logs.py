@@ -5,24 +5,237 @@ import csv
 import io
 import logging
 import re
-import tempfile
 import zipfile
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any, AsyncIterator
 
-from backend.models.schemas.logs import LogEntry, TaskInfo, TaskLogs
+import pandas as pd
+
+from backend.models.schemas.logs import (
+    LogEntry,
+    ProcessSummary,
+    TaskInfo,
+    TaskLogs,
+    TaskSummary,
+    TaskTimeline,
+)
 from backend.services.storage import StorageService
+from backend.services.trace_analytics import process_rollups, timeline_analysis, trace_frame
 from backend.utils.errors import BatchError
 
 logger = logging.getLogger(__name__)
 
-_TRACE_CACHE: dict[str, dict[str, Any]] = {}
-_TRACE_TTL = timedelta(minutes=5)
+_TRACE_TTL = timedelta(seconds=30)
+_TRACE_CACHE_SIZE = 256
+
+_ARCHIVE_FILES = ("nextflow.log", "trace.txt", "timeline.html", "report.html")
+_ARCHIVE_CHUNK_SIZE = 1024 * 1024
+_ARCHIVE_QUEUE_DEPTH = 4
+
+_LOGGING_CLIENTS: dict[str | None, Any] = {}
+_TASK_STREAMS = ("stdout", "stderr")
+_TASK_LOG_PAGE_SIZE = 500
+_TASK_LOG_MAX_BYTES = 1024 * 1024
 
 _TIMESTAMP_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?)(Z)?")
 
 
+class _ArchiveBuffer:
+    # Write-only sink for ZipFile; without tell/seek zipfile streams members with data
+    # descriptors, and the bytes written so far are drained after each chunk.
+    def __init__(self) -> None:
+        self._data = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._data += data
+        return len(data)
+
+    def flush(self) -> None:
+        return None
+
+    def drain(self) -> bytes:
+        data = bytes(self._data)
+        self._data.clear()
+        return data
+
+
+# TaskInfo field -> trace column aliases, in order of preference.
+_TRACE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "task_id": ("task_id", "id", "hash"),
+    "name": ("name", "tag"),
+    "process": ("process",),
+    "status": ("status",),
+    "exit_code": ("exit", "exit_code"),
+    "duration": ("duration",),
+    "cpu_percent": ("cpu", "cpu%", "%cpu"),
+    "memory_peak": ("memory", "memory%", "mem"),
+    "start_time": ("start", "start_time"),
+    "end_time": ("complete", "end", "end_time"),
+    "work_dir": ("workdir", "work_dir"),
+    "key": ("hash", "task_id", "id"),
+}
+
+
+@dataclass
+class _TraceState:
+    """Incremental parse state for one append-only ``trace.txt``."""
+
+    offset: int = 0
+    header: list[str] | None = None
+    columns: dict[str, list[int]] = field(default_factory=dict)
+    remainder: bytes = b""
+    rows: dict[str, list[str]] = field(default_factory=dict)
+    tasks: dict[str, TaskInfo] = field(default_factory=dict)
+
+    def feed(self, data: bytes) -> None:
+        self.offset += len(data)
+        data = self.remainder + data
+        end = data.rfind(b"\n") + 1
+        self.remainder = data[end:]
+        if not end:
+            return
+        text = data[:end].decode("utf-8", errors="replace")
+        for row in csv.reader(io.StringIO(text), delimiter="\t"):
+            if not row:
+                continue
+            if self.header is None:
+                self._set_header(row)
+                continue
+            key = self._value(row, "key") or f"#{len(self.rows)}"
+            self.rows[key] = row
+            self.tasks[key] = self._task(row)
+
+    def _set_header(self, header: list[str]) -> None:
+        self.header = header
+        positions = {name: index for index, name in enumerate(header)}
+        self.columns = {
+            field_name: [positions[alias] for alias in aliases if alias in positions]
+            for field_name, aliases in _TRACE_COLUMNS.items()
+        }
+
+    def _value(self, row: list[str], field_name: str) -> str | None:
+        for index in self.columns[field_name]:
+            if index < len(row) and row[index] != "":
+                return row[index]
+        return None
+
+    def _task(self, row: list[str]) -> TaskInfo:
+        task_id = self._value(row, "task_id")
+        return TaskInfo(
+            task_id=task_id or "",
+            name=self._value(row, "name") or "",
+            process=self._value(row, "process") or "",
+            status=self._value(row, "status") or "",
+            exit_code=_to_int(self._value(row, "exit_code")),
+            duration=self._value(row, "duration"),
+            cpu_percent=self._value(row, "cpu_percent"),
+            memory_peak=self._value(row, "memory_peak"),
+            start_time=self._value(row, "start_time"),
+            end_time=self._value(row, "end_time"),
+            work_dir=self._value(row, "work_dir"),
+            has_logs=bool(task_id),
+        )
+
+
+@dataclass
+class _TraceEntry:
+    tasks: list[TaskInfo]
+    generation: Any
+    # None marks a settled run whose trace will not change again.
+    expires_at: datetime | None
+    state: _TraceState
+    # Snapshot of ``state`` for this generation. The state keeps being fed on the event
+    # loop for later entries while frame() runs in a worker thread.
+    header: list[str] = field(default_factory=list)
+    rows: list[list[str]] = field(default_factory=list)
+    # Derived views (DataFrame, rollups) for this generation of the trace.
+    analytics: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def snapshot(
+        cls, tasks: list[TaskInfo], generation: Any, expires_at: datetime | None, state: _TraceState
+    ) -> "_TraceEntry":
+        return cls(
+            tasks,
+            generation,
+            expires_at,
+            state,
+            header=list(state.header or []),
+            rows=list(state.rows.values()),
+        )
+
+    def frame(self) -> pd.DataFrame:
+        if "frame" not in self.analytics:
+            self.analytics["frame"] = trace_frame(self.header, self.rows)
+        frame: pd.DataFrame = self.analytics["frame"]
+        return frame
+
+
+class TraceCache:
+    """LRU cache of parsed trace files, revalidated by object generation."""
+
+    def __init__(self, max_entries: int = _TRACE_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _TraceEntry] = OrderedDict()
+        self.hits = 0
+        self.revalidations = 0
+        self.appends = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, run_id: str) -> _TraceEntry | None:
+        entry = self._entries.get(run_id)
+        if entry is not None:
+            self._entries.move_to_end(run_id)
+        return entry
+
+    def put(self, run_id: str, entry: _TraceEntry) -> None:
+        self._entries[run_id] = entry
+        self._entries.move_to_end(run_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def prune(self, now: datetime) -> int:
+        """Drop expired entries so they don't hold memory until LRU eviction."""
+        expired = [
+            run_id
+            for run_id, entry in self._entries.items()
+            if entry.expires_at is not None and entry.expires_at <= now
+        ]
+        for run_id in expired:
+            del self._entries[run_id]
+        return len(expired)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.revalidations = self.appends = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "appends": self.appends,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_TRACE_CACHE = TraceCache()
+
+
+def trace_cache_stats() -> dict[str, int]:
+    return _TRACE_CACHE.stats()
+
+
+async def prune_trace_cache() -> int:
+    return _TRACE_CACHE.prune(datetime.now(timezone.utc))
+
+
 @dataclass
 class LogService:
     storage: StorageService
@@ -59,7 +272,7 @@ class LogService:
     ) -> list[LogEntry]:
         path = self._log_path(run_id, "nextflow.log")
         try:
-            content = self.storage.get_file_content(path, text=True)
+            content = await asyncio.to_thread(self.storage.get_file_content, path, text=True)
         except Exception:
             return []
 
@@ -75,65 +288,139 @@ class LogService:
         *,
         poll_interval: float = 2.0,
     ) -> AsyncIterator[LogEntry]:
+        # The orchestrator appends to nextflow.log while the run is live, so only the
+        # bytes past the last offset are fetched on each poll.
         path = self._log_path(run_id, "nextflow.log")
         offset = 0
+        pending = b""
         while True:
             try:
-                content = self.storage.get_file_content(path, text=True)
+                metadata = await asyncio.to_thread(self.storage.get_file_metadata, path)
             except Exception:
-                await asyncio.sleep(poll_interval)
-                continue
-            if offset >= len(content):
-                await asyncio.sleep(poll_interval)
-                continue
-            chunk = content[offset:]
-            offset = len(content)
-            for line in chunk.splitlines():
-                yield self._parse_line(line, "nextflow")
+                metadata = None
+            size = int(metadata.get("size") or 0) if metadata else 0
+            if size < offset:
+                offset = 0
+                pending = b""
+            if size > offset:
+                try:
+                    chunk = await asyncio.to_thread(
+                        self.storage.download_range, path, offset, size - 1
+                    )
+                except Exception:
+                    await asyncio.sleep(poll_interval)
+                    continue
+                offset += len(chunk)
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    yield self._parse_line(line.decode("utf-8", errors="replace"), "nextflow")
             await asyncio.sleep(poll_interval)
 
-    async def list_tasks(self, run_id: str) -> list[TaskInfo]:
+    async def list_tasks(
+        self, run_id: str, *, final: bool = False, strict: bool = False
+    ) -> list[TaskInfo]:
+        """Return the run's parsed trace.
+
+        ``final`` marks a settled terminal run; its trace is cached without expiry.
+        Storage errors read as an empty trace unless ``strict``, which re-raises them.
+        """
         now = datetime.now(timezone.utc)
+        expires_at = None if final else now + _TRACE_TTL
         cached = _TRACE_CACHE.get(run_id)
-        if cached and cached["expires_at"] > now:
-            return cached["data"]
+        if cached and (cached.expires_at is None or cached.expires_at > now):
+            _TRACE_CACHE.hits += 1
+            return cached.tasks
 
         path = self._log_path(run_id, "trace.txt")
         try:
-            content = self.storage.get_file_content(path, text=True)
+            metadata = await asyncio.to_thread(self.storage.get_file_metadata, path)
         except Exception:
+            if strict:
+                raise
+            metadata = None
+        if metadata is None:
             return []
+        generation = metadata.get("generation")
+        if cached and generation is not None and cached.generation == generation:
+            _TRACE_CACHE.revalidations += 1
+            cached.expires_at = expires_at
+            return cached.tasks
 
-        reader = csv.DictReader(io.StringIO(content), delimiter="\t")
-        tasks: list[TaskInfo] = []
-        for row in reader:
-            if not row:
-                continue
-            tasks.append(
-                TaskInfo(
-                    task_id=_get_value(row, ["task_id", "id", "hash"]) or "",
-                    name=_get_value(row, ["name", "tag"]) or "",
-                    process=_get_value(row, ["process"]) or "",
-                    status=_get_value(row, ["status"]) or "",
-                    exit_code=_to_int(_get_value(row, ["exit", "exit_code"])),
-                    duration=_get_value(row, ["duration"]),
-                    cpu_percent=_get_value(row, ["cpu", "cpu%", "%cpu"]),
-                    memory_peak=_get_value(row, ["memory", "memory%", "mem"]),
-                    start_time=_get_value(row, ["start", "start_time"]),
-                    end_time=_get_value(row, ["complete", "end", "end_time"]),
-                    work_dir=_get_value(row, ["workdir", "work_dir"]),
-                    has_logs=bool(_get_value(row, ["task_id", "id", "hash"])),
-                )
-            )
+        # Nextflow only appends to the trace, so a cached parse resumes from its offset.
+        size = metadata.get("size") or 0
+        state = cached.state if cached else None
+        if state is None or size < state.offset:
+            _TRACE_CACHE.misses += 1
+            state = _TraceState()
+        else:
+            _TRACE_CACHE.appends += 1
+        if size > state.offset:
+            start = state.offset
+            try:
+                data = await asyncio.to_thread(self.storage.download_range, path, start, size - 1)
+            except Exception:
+                if strict:
+                    raise
+                return cached.tasks if cached else []
+            # A concurrent call may have fed this state while the range downloaded.
+            if state.offset == start:
+                state.feed(data)
 
-        _TRACE_CACHE[run_id] = {"data": tasks, "expires_at": now + _TRACE_TTL}
+        tasks = list(state.tasks.values())
+        _TRACE_CACHE.put(run_id, _TraceEntry.snapshot(tasks, generation, expires_at, state))
         return tasks
 
-    async def get_task_logs(self, run_id: str, task_id: str) -> TaskLogs:
+    async def get_trace_frame(
+        self, run_id: str, *, final: bool = False, strict: bool = False
+    ) -> pd.DataFrame | None:
+        """Typed per-task DataFrame for the run's trace, or None if there is none yet."""
+        await self.list_tasks(run_id, final=final, strict=strict)
+        entry = _TRACE_CACHE.get(run_id)
+        if entry is None or not entry.header:
+            return None
+        return await asyncio.to_thread(entry.frame)
+
+    async def get_task_summary(self, run_id: str, *, final: bool = False) -> TaskSummary:
+        tasks = await self.list_tasks(run_id, final=final)
+        entry = _TRACE_CACHE.get(run_id)
+        if not tasks or entry is None:
+            return TaskSummary(run_id=run_id, total_tasks=0, processes=[])
+        if "rollups" not in entry.analytics:
+            entry.analytics["rollups"] = await asyncio.to_thread(
+                lambda: process_rollups(entry.frame())
+            )
+        return TaskSummary(
+            run_id=run_id,
+            total_tasks=len(tasks),
+            processes=[ProcessSummary(**rollup) for rollup in entry.analytics["rollups"]],
+        )
+
+    async def get_task_timeline(self, run_id: str, *, final: bool = False) -> TaskTimeline:
+        await self.list_tasks(run_id, final=final)
+        entry = _TRACE_CACHE.get(run_id)
+        if entry is None:
+            analysis = timeline_analysis(trace_frame([], []))
+        else:
+            if "timeline" not in entry.analytics:
+                entry.analytics["timeline"] = await asyncio.to_thread(
+                    lambda: timeline_analysis(entry.frame())
+                )
+            analysis = entry.analytics["timeline"]
+        return TaskTimeline(run_id=run_id, **analysis)
+
+    async def get_task_logs(
+        self,
+        run_id: str,
+        task_id: str,
+        *,
+        tail: int | None = None,
+        max_bytes: int = _TASK_LOG_MAX_BYTES,
+    ) -> TaskLogs:
         client = self._logging_client()
-        stdout = self._query_logs(client, run_id, task_id, "stdout")
-        stderr = self._query_logs(client, run_id, task_id, "stderr")
-        return TaskLogs(task_id=task_id, stdout=stdout, stderr=stderr)
+        return await asyncio.to_thread(
+            self._tail_task_logs, client, run_id, task_id, tail, max_bytes
+        )
 
     async def stream_task_logs(
         self,
@@ -142,78 +429,168 @@ class LogService:
         *,
         poll_interval: float = 2.0,
     ) -> AsyncIterator[LogEntry]:
-        last_stdout = ""
-        last_stderr = ""
+        # Each poll asks only for entries at or after the last one seen, for both streams
+        # at once; entries sharing that timestamp are skipped by insertId.
+        client = self._logging_client()
+        cursor: tuple[datetime, str] | None = None
         while True:
-            logs = await self.get_task_logs(run_id, task_id)
-            if logs.stdout and logs.stdout != last_stdout:
-                delta = logs.stdout[len(last_stdout) :]
-                last_stdout = logs.stdout
-                for line in delta.splitlines():
-                    yield LogEntry(
-                        timestamp=datetime.now(timezone.utc),
-                        source="task",
-                        message=line,
-                        task_name=task_id,
-                        stream="stdout",
-                    )
-            if logs.stderr and logs.stderr != last_stderr:
-                delta = logs.stderr[len(last_stderr) :]
-                last_stderr = logs.stderr
-                for line in delta.splitlines():
-                    yield LogEntry(
-                        timestamp=datetime.now(timezone.utc),
-                        source="task",
-                        message=line,
-                        task_name=task_id,
-                        stream="stderr",
-                    )
+            entries = await asyncio.to_thread(
+                self._list_task_entries, client, run_id, task_id, cursor
+            )
+            for entry in entries:
+                yield LogEntry(
+                    timestamp=entry.timestamp or datetime.now(timezone.utc),
+                    source="task",
+                    message=str(entry.payload),
+                    task_name=task_id,
+                    stream=(entry.labels or {}).get("stream"),
+                )
+            if entries:
+                cursor = (entries[-1].timestamp, entries[-1].insert_id or "")
             await asyncio.sleep(poll_interval)
 
-    async def create_log_archive(self, run_id: str) -> bytes:
-        filenames = ["nextflow.log", "trace.txt", "timeline.html", "report.html"]
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=True) as tmp:
-            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
-                for filename in filenames:
-                    path = self._log_path(run_id, filename)
-                    try:
-                        content = self.storage.get_file_content(path, text=False)
-                    except Exception:
+    async def stream_log_archive(self, run_id: str) -> AsyncIterator[bytes]:
+        # All artifacts are fetched concurrently in bounded chunks while the zip is
+        # written member by member, so memory stays flat regardless of log size.
+        queues: dict[str, asyncio.Queue[int | bytes | None]] = {
+            filename: asyncio.Queue(maxsize=_ARCHIVE_QUEUE_DEPTH) for filename in _ARCHIVE_FILES
+        }
+        producers = [
+            asyncio.create_task(self._fetch_archive_member(self._log_path(run_id, name), queue))
+            for name, queue in queues.items()
+        ]
+        buffer = _ArchiveBuffer()
+        try:
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+                for filename, queue in queues.items():
+                    size = await queue.get()
+                    if size is None:
                         continue
-                    zf.writestr(filename, content)
-            tmp.seek(0)
-            return tmp.read()
+                    info = zipfile.ZipInfo(
+                        filename, date_time=datetime.now(timezone.utc).timetuple()[:6]
+                    )
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    info.file_size = int(size)
+                    with zf.open(info, "w") as member:
+                        while (chunk := await queue.get()) is not None:
+                            await asyncio.to_thread(member.write, chunk)
+                            data = buffer.drain()
+                            if data:
+                                yield data
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+        finally:
+            for producer in producers:
+                producer.cancel()
+
+    async def _fetch_archive_member(
+        self, path: str, queue: asyncio.Queue[int | bytes | None]
+    ) -> None:
+        try:
+            metadata = await asyncio.to_thread(self.storage.get_file_metadata, path)
+        except Exception:
+            metadata = None
+        if not metadata:
+            await queue.put(None)
+            return
+
+        size = int(metadata.get("size") or 0)
+        await queue.put(size)
+        offset = 0
+        try:
+            while offset < size:
+                end = min(offset + _ARCHIVE_CHUNK_SIZE, size) - 1
+                chunk = await asyncio.to_thread(self.storage.download_range, path, offset, end)
+                if not chunk:
+                    break
+                await queue.put(chunk)
+                offset += len(chunk)
+        except Exception as exc:
+            logger.warning("Log archive member %s truncated at %s bytes: %s", path, offset, exc)
+        await queue.put(None)
 
     def _logging_client(self):
+        client = _LOGGING_CLIENTS.get(self.project_id)
+        if client is not None:
+            return client
         try:
             from google.cloud import logging_v2
 
-            return logging_v2.Client(project=self.project_id)
+            client = logging_v2.Client(project=self.project_id)
         except Exception as exc:
             raise BatchError("Cloud Logging client unavailable", detail=str(exc)) from exc
+        _LOGGING_CLIENTS[self.project_id] = client
+        return client
 
-    def _query_logs(self, client, run_id: str, task_id: str, stream: str) -> str:
-        filter_ = (
+    def _task_filter(self, run_id: str, task_id: str) -> str:
+        streams = " OR ".join(f'"{stream}"' for stream in _TASK_STREAMS)
+        return (
             f'labels.run_id="{run_id}" AND '
             f'labels.task_name="{task_id}" AND '
-            f'labels.stream="{stream}"'
+            f"labels.stream=({streams})"
         )
+
+    def _list_task_entries(
+        self,
+        client,
+        run_id: str,
+        task_id: str,
+        cursor: tuple[datetime, str] | None = None,
+    ) -> list[Any]:
+        filter_ = self._task_filter(run_id, task_id)
+        if cursor is not None:
+            filter_ += f' AND timestamp>="{cursor[0].isoformat()}"'
         try:
-            entries = client.list_entries(order_by="timestamp desc", filter_=filter_)
-            messages: list[str] = []
-            for entry in entries:
-                payload = entry.payload
-                messages.append(str(payload))
-            return "\n".join(reversed(messages))
+            entries = client.list_entries(order_by="timestamp asc", filter_=filter_)
+            return [
+                entry
+                for entry in entries
+                if cursor is None or (entry.timestamp, entry.insert_id or "") > cursor
+            ]
         except Exception as exc:
             raise BatchError("Cloud Logging query failed", detail=str(exc)) from exc
 
-
-def _get_value(row: dict[str, str], keys: list[str]) -> str | None:
-    for key in keys:
-        if key in row and row[key] not in (None, ""):
-            return row[key]
-    return None
+    def _tail_task_logs(
+        self,
+        client,
+        run_id: str,
+        task_id: str,
+        tail: int | None,
+        max_bytes: int,
+    ) -> TaskLogs:
+        # Newest first so paging stops as soon as the tail or byte budget is filled;
+        # only the kept entries are reversed back into chronological order.
+        lines: dict[str, list[str]] = {stream: [] for stream in _TASK_STREAMS}
+        kept = 0
+        size = 0
+        truncated = False
+        try:
+            entries = client.list_entries(
+                order_by="timestamp desc",
+                filter_=self._task_filter(run_id, task_id),
+                page_size=_TASK_LOG_PAGE_SIZE,
+            )
+            for entry in entries:
+                if (tail is not None and kept >= tail) or size >= max_bytes:
+                    truncated = True
+                    break
+                message = str(entry.payload)
+                stream = (entry.labels or {}).get("stream", "stdout")
+                lines.setdefault(stream, []).append(message)
+                kept += 1
+                size += len(message.encode("utf-8")) + 1
+        except Exception as exc:
+            raise BatchError("Cloud Logging query failed", detail=str(exc)) from exc
+        return TaskLogs(
+            task_id=task_id,
+            stdout="\n".join(reversed(lines["stdout"])),
+            stderr="\n".join(reversed(lines["stderr"])),
+            truncated=truncated,
+        )
 
 
 def _to_int(value: str | None) -> int | None:
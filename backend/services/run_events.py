@@ -1,92 +1,248 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Sequence
 
+from sqlalchemy import delete, exists, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from backend.models.run_events import RunEventEntry
+from backend.models.runs import Run
 from backend.models.schemas.runs import RunStatus
-from backend.services.runs import RunStoreService
+from backend.services.database import DatabaseService
+from backend.services.run_notifications import ALL_RUNS, RunStatusListener
+from backend.services.runs import TERMINAL_STATUSES
+from backend.services.streams import Subscription
+
+RUN_EVENTS_PAGE_SIZE = 500
+# How long a skipped seq is re-checked: it may belong to a transaction still committing.
+_GAP_RECHECK_SECONDS = 10.0
+_MAX_TRACKED_GAPS = 1000
+
+
+def _watch(listener: RunStatusListener | None, run_id: str):
+    return listener.watch(run_id) if listener else nullcontext(asyncio.Event())
+
+
+async def _wait_for_change(
+    changed: asyncio.Event,
+    listener: RunStatusListener | None,
+    poll_interval: float,
+    fallback_interval: float,
+) -> None:
+    # Notifications make polling a slow safety net; without them, poll at the fast rate.
+    interval = fallback_interval if listener and listener.active else poll_interval
+    try:
+        await asyncio.wait_for(changed.wait(), interval)
+    except asyncio.TimeoutError:
+        pass
+    changed.clear()
 
 
 @dataclass
 class RunEvent:
     event: str
-    status: RunStatus
+    status: RunStatus | None
     timestamp: datetime
     progress: float | None = None
+    seq: int | None = None
+    run_id: str | None = None
+    user_email: str | None = None
+    tasks: dict[str, int] | None = None
+    first_failure: dict[str, Any] | None = None
 
 
 @dataclass
 class RunEventService:
     session: AsyncSession
-    settings: object
 
-    @staticmethod
-    def _status_timestamp(run) -> datetime:
-        if run.status == RunStatus.SUBMITTED and run.submitted_at:
-            return run.submitted_at
-        if run.status == RunStatus.RUNNING and run.started_at:
-            return run.started_at
-        if run.status == RunStatus.COMPLETED and run.completed_at:
-            return run.completed_at
-        if run.status == RunStatus.FAILED and run.failed_at:
-            return run.failed_at
-        if run.status == RunStatus.CANCELLED and run.cancelled_at:
-            return run.cancelled_at
-        return run.updated_at or datetime.now(timezone.utc)
+    @classmethod
+    def create(cls, session: AsyncSession) -> "RunEventService":
+        return cls(session=session)
 
     @staticmethod
-    def _progress_from_metrics(metrics: dict[str, object] | None) -> float | None:
-        if not metrics:
-            return None
-        raw_progress = metrics.get("progress")
-        if isinstance(raw_progress, (int, float)):
-            return float(raw_progress)
-        completed = metrics.get("tasks_completed")
-        total = metrics.get("tasks_total")
-        if isinstance(completed, (int, float)) and isinstance(total, (int, float)) and total:
-            return float(completed) / float(total)
-        return None
-
-    async def stream_run_events(
+    def _to_event(entry: RunEventEntry, user_email: str) -> RunEvent:
+        return RunEvent(
+            event=entry.type,
+            status=RunStatus(entry.payload["status"]),
+            timestamp=entry.ts,
+            progress=entry.payload.get("progress"),
+            seq=entry.seq,
+            run_id=entry.run_id,
+            user_email=user_email,
+            tasks=entry.payload.get("tasks"),
+            first_failure=entry.payload.get("first_failure"),
+        )
+
+    async def list_events(
         self,
-        run_id: str,
         *,
-        poll_interval: float = 2.0,
-    ) -> AsyncIterator[RunEvent]:
-        service = RunStoreService.create(self.session, settings=self.settings)
-        run = await service.get_run(run_id)
-        if not run:
-            return
-        last_status = run.status
-        yield RunEvent(
-            event="status",
-            status=last_status,
-            timestamp=self._status_timestamp(run),
-            progress=self._progress_from_metrics(run.metrics),
+        after: int | None = None,
+        run_id: str | None = None,
+        user_email: str | None = None,
+        include: Sequence[int] = (),
+        limit: int = RUN_EVENTS_PAGE_SIZE,
+    ) -> list[RunEvent]:
+        """Events with ``seq > after`` (plus any ``include`` seqs) in seq order."""
+        query = select(RunEventEntry, Run.user_email).join(Run, Run.run_id == RunEventEntry.run_id)
+        if after is not None:
+            newer = RunEventEntry.seq > after
+            query = query.where(or_(newer, RunEventEntry.seq.in_(include)) if include else newer)
+        if run_id:
+            query = query.where(RunEventEntry.run_id == run_id)
+        if user_email:
+            query = query.where(Run.user_email == user_email)
+        query = query.order_by(RunEventEntry.seq).limit(limit)
+        result = await self.session.execute(query)
+        return [self._to_event(entry, email) for entry, email in result.all()]
+
+    async def latest_event(self, run_id: str | None = None) -> RunEvent | None:
+        query = select(RunEventEntry, Run.user_email).join(Run, Run.run_id == RunEventEntry.run_id)
+        if run_id:
+            query = query.where(RunEventEntry.run_id == run_id)
+        row = (
+            await self.session.execute(query.order_by(RunEventEntry.seq.desc()).limit(1))
+        ).first()
+        return self._to_event(*row) if row else None
+
+    async def prune_superseded_metrics(self, older_than: datetime) -> int:
+        """Delete ``metrics`` events before ``older_than`` that a later one replaces.
+
+        Metrics payloads are cumulative, so only each run's latest is needed for replay;
+        status events are kept.
+        """
+        newer = aliased(RunEventEntry)
+        result = await self.session.execute(
+            delete(RunEventEntry)
+            .where(
+                RunEventEntry.type == "metrics",
+                RunEventEntry.ts < older_than,
+                exists().where(
+                    newer.run_id == RunEventEntry.run_id,
+                    newer.type == "metrics",
+                    newer.seq > RunEventEntry.seq,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount or 0
+
+
+async def prune_run_events(database: DatabaseService, max_age: timedelta) -> int:
+    pruned = 0
+    async for session in database.get_session():
+        pruned = await RunEventService.create(session).prune_superseded_metrics(
+            datetime.now(timezone.utc) - max_age
         )
+    return pruned
+
+
+class _EventTail:
+    """Follows run_events past a seq cursor.
+
+    Sequence values are assigned before commit, so a lower seq can become visible after a
+    higher one. The tail re-checks skipped seqs for a few seconds so those late commits
+    are still delivered, possibly out of order. It follows every run: seqs are global,
+    so for a single run most skipped seqs belong to other runs and would never fill.
+    """
+
+    def __init__(self, cursor: int) -> None:
+        self.cursor = cursor
+        self.gaps: dict[int, float] = {}
+
+    async def read(self, database: DatabaseService) -> list[RunEvent]:
+        events: list[RunEvent] = []
+        async for session in database.get_session():
+            events = await RunEventService.create(session).list_events(
+                after=self.cursor, include=tuple(self.gaps)
+            )
+        now = time.monotonic()
+        for event in events:
+            self.gaps.pop(event.seq, None)
+            if event.seq <= self.cursor:
+                continue
+            # Late commits were in flight just before ``event``, so keep the highest gaps.
+            for missing in range(self.cursor + 1, event.seq)[-_MAX_TRACKED_GAPS:]:
+                self.gaps[missing] = now
+            self.cursor = event.seq
+        self.gaps = {
+            seq: seen for seq, seen in self.gaps.items() if now - seen < _GAP_RECHECK_SECONDS
+        }
+        return events
+
+
+async def poll_run_events(
+    database: DatabaseService,
+    run_id: str,
+    changes: Subscription,
+) -> AsyncIterator[RunEvent]:
+    """The run's latest event, then each new one, until it reaches a terminal status.
+
+    New events are filtered from ``changes``, a subscription to the shared
+    ``poll_run_changes`` feed, which already re-checks late-committing seqs. Subscribe
+    before calling this so nothing committed after the latest event is read is missed.
+    The subscription is closed when this generator finishes.
+    """
+    try:
+        latest = None
+        async for session in database.get_session():
+            latest = await RunEventService.create(session).latest_event(run_id)
+        if latest is None:
+            yield RunEvent(event="done", status=None, timestamp=datetime.now(timezone.utc))
+            return
+        yield latest
+        if _is_terminal(latest):
+            yield _done(latest)
+            return
+        async for event in changes:
+            if event.run_id != run_id:
+                continue
+            # Older seqs were covered by ``latest``, except a terminal status that
+            # committed late; that one still has to end the stream.
+            if event.seq is not None and event.seq <= latest.seq and not _is_terminal(event):
+                continue
+            yield event
+            if _is_terminal(event):
+                yield _done(event)
+                return
+    finally:
+        await changes.aclose()
+
+
+def _is_terminal(event: RunEvent) -> bool:
+    # Any event type counts: a late metrics flush can land after the terminal status.
+    return event.status in TERMINAL_STATUSES
+
+
+def _done(event: RunEvent) -> RunEvent:
+    return RunEvent(
+        event="done", status=event.status, timestamp=event.timestamp, run_id=event.run_id
+    )
+
 
+async def poll_run_changes(
+    database: DatabaseService,
+    *,
+    listener: RunStatusListener | None = None,
+    poll_interval: float = 2.0,
+    fallback_interval: float = 30.0,
+) -> AsyncIterator[RunEvent]:
+    """Every run event appended from now on, for all users."""
+    async with _watch(listener, ALL_RUNS) as changed:
+        latest = None
+        async for session in database.get_session():
+            latest = await RunEventService.create(session).latest_event()
+        tail = _EventTail(latest.seq if latest else 0)
+        events: list[RunEvent] = []
         while True:
-            current = await service.get_run(run_id)
-            if not current:
-                yield RunEvent(
-                    event="done", status=last_status, timestamp=datetime.now(timezone.utc)
-                )
-                break
-            if current.status != last_status:
-                last_status = current.status
-                yield RunEvent(
-                    event="status",
-                    status=last_status,
-                    timestamp=self._status_timestamp(current),
-                    progress=self._progress_from_metrics(current.metrics),
-                )
-                if last_status in {RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.CANCELLED}:
-                    yield RunEvent(
-                        event="done", status=last_status, timestamp=datetime.now(timezone.utc)
-                    )
-                    break
-            await asyncio.sleep(poll_interval)
+            for event in events:
+                yield event
+            if len(events) < RUN_EVENTS_PAGE_SIZE:
+                await _wait_for_change(changed, listener, poll_interval, fallback_interval)
+            events = await tail.read(database)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from backend.services.database import DatabaseService
+from backend.services.runs import RUN_STATUS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+# Watch key woken by a notification for any run.
+ALL_RUNS = "*"
+
+
+class RunStatusListener:
+    """One LISTEN connection that wakes the run event pollers watching a run.
+
+    Pollers register an ``asyncio.Event`` per run with ``watch``; a notification sets
+    the run's events. While the connection is down ``active`` is False and pollers
+    fall back to their fast poll interval. Every watcher is woken on reconnect, since
+    notifications sent while disconnected are lost.
+    """
+
+    def __init__(self, database_url: str, *, reconnect_delay: float = 5.0) -> None:
+        self.database_url = database_url
+        self.reconnect_delay = reconnect_delay
+        self.active = False
+        self._watchers: dict[str, set[asyncio.Event]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    @classmethod
+    def create(cls, database: DatabaseService) -> "RunStatusListener | None":
+        url = database.engine.url
+        if url.get_backend_name() != "postgresql":
+            return None
+        # asyncpg takes a plain libpq-style DSN without the SQLAlchemy driver suffix.
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        return cls(dsn)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self.active = False
+
+    @asynccontextmanager
+    async def watch(self, run_id: str) -> AsyncIterator[asyncio.Event]:
+        event = asyncio.Event()
+        self._watchers.setdefault(run_id, set()).add(event)
+        try:
+            yield event
+        finally:
+            watchers = self._watchers.get(run_id)
+            if watchers is not None:
+                watchers.discard(event)
+                if not watchers:
+                    del self._watchers[run_id]
+
+    def dispatch(self, payload: str) -> None:
+        try:
+            run_id = json.loads(payload)["run_id"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed run status notification: %s", payload)
+            return
+        for key in (run_id, ALL_RUNS):
+            for event in self._watchers.get(key, ()):
+                event.set()
+
+    def _wake_all(self) -> None:
+        for watchers in self._watchers.values():
+            for event in watchers:
+                event.set()
+
+    def _on_notification(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        self.dispatch(payload)
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.database_url)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _conn: lost.set())
+                await connection.add_listener(RUN_STATUS_CHANNEL, self._on_notification)
+                self.active = True
+                self._wake_all()
+                logger.info("Listening for run status notifications")
+                await lost.wait()
+                logger.warning("Run status listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Run status listener unavailable: %s", exc)
+            finally:
+                self.active = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            self._wake_all()
+            await asyncio.sleep(self.reconnect_delay)
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import json
 import logging
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Any
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Sequence
 from uuid import uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select, text, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.models.run_events import RunEventEntry
 from backend.models.runs import Run
 from backend.models.schemas.runs import RunListResponse, RunResponse, RunStatus
-from backend.services.batch import BatchService
+from backend.services.batch import TERMINAL_JOB_STATES, BatchService, job_region
 from backend.services.storage import StorageService
 from backend.utils.errors import BatchError, NotFoundError, ValidationError
 
@@ -36,6 +40,98 @@ _STATUS_TRANSITIONS: dict[RunStatus, set[RunStatus]] = {
 }
 
 
+TOTAL_MODES = ("exact", "estimated", "none")
+
+RUN_FIELDS = tuple(RunResponse.model_fields)
+
+# update_run_status and orchestrator/update_status.py publish {"run_id", "status"} here.
+RUN_STATUS_CHANNEL = "run_status"
+
+TERMINAL_STATUSES = frozenset({RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.CANCELLED})
+
+# The orchestrator uploads final logs after the terminal status hook fires, so objects
+# under a terminal run are only treated as final once this period has passed.
+RUN_SETTLE_PERIOD = timedelta(minutes=10)
+
+
+def encode_run_cursor(timestamp: datetime, run_id: str) -> str:
+    raw = f"{timestamp.isoformat()}|{run_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_run_cursor(token: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode("utf-8")
+        timestamp, run_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), run_id
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid cursor: {token}") from exc
+
+
+def run_progress(metrics: dict[str, Any] | None) -> float | None:
+    if not metrics:
+        return None
+    raw = metrics.get("progress")
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    completed = metrics.get("tasks_completed")
+    total = metrics.get("tasks_total")
+    if isinstance(completed, (int, float)) and isinstance(total, (int, float)) and total:
+        return float(completed) / float(total)
+    return None
+
+
+def allowed_from(status: RunStatus) -> list[str]:
+    """Statuses a run may move to ``status`` from; mirrored by the orchestrator."""
+    return [current.value for current, targets in _STATUS_TRANSITIONS.items() if status in targets]
+
+
+def run_task_counts(metrics: dict[str, Any] | None) -> dict[str, int] | None:
+    """Live task counters written by the Nextflow weblog receiver, if any."""
+    if not metrics or "tasks_total" not in metrics:
+        return None
+    counts = {
+        name: int(metrics.get(f"tasks_{name}") or 0)
+        for name in ("running", "completed", "failed", "total")
+    }
+    # Replicas flush deltas in any order, so the stored count can dip below zero briefly.
+    counts["running"] = max(0, counts["running"])
+    return counts
+
+
+def _event_payload(status: str, metrics: dict[str, Any] | None) -> dict[str, Any]:
+    # orchestrator/update_status.py writes the same keys; absent values are None.
+    return {
+        "status": status,
+        "progress": run_progress(metrics),
+        "tasks": run_task_counts(metrics),
+        "first_failure": (metrics or {}).get("first_failure") or None,
+    }
+
+
+def _driver_statement(query: Any, dialect: Any) -> tuple[str, Any]:
+    """``query`` as driver SQL plus bound parameters, for statements wrapped in raw SQL.
+
+    Values stay bound rather than inlined, so a filter value containing ``:name`` is
+    not mistaken for a placeholder.
+    """
+    compiled = query.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    if compiled.positional:
+        return str(compiled), tuple(compiled.params[name] for name in compiled.positiontup)
+    return str(compiled), compiled.params
+
+
+def status_timestamp(run: RunResponse) -> datetime:
+    field = _STATUS_FIELD_MAP.get(run.status)
+    return (getattr(run, field) if field else None) or run.updated_at
+
+
+def run_settled(run: RunResponse) -> bool:
+    if run.status not in TERMINAL_STATUSES:
+        return False
+    return datetime.now(timezone.utc) - status_timestamp(run) >= RUN_SETTLE_PERIOD
+
+
 @dataclass
 class RunStoreService:
     session: AsyncSession
@@ -120,6 +216,21 @@ class RunStoreService:
             metrics=run.metrics,
         )
 
+    @staticmethod
+    def _projection(fields: Sequence[str]) -> list[str]:
+        unknown = sorted(set(fields) - set(RUN_FIELDS))
+        if unknown:
+            raise ValueError(f"Unknown run fields: {', '.join(unknown)}")
+        return ["run_id", *(name for name in RUN_FIELDS if name in fields and name != "run_id")]
+
+    @staticmethod
+    def _to_partial_response(row: Any, fields: list[str]) -> RunResponse:
+        values = {name: row[name] for name in fields}
+        if "status" in values:
+            values["status"] = RunStatus(values["status"])
+        # Only the selected fields are marked as set, so exclude_unset drops the rest.
+        return RunResponse.model_construct(_fields_set=set(values), **values)
+
     async def create_run(
         self,
         *,
@@ -151,10 +262,18 @@ class RunStoreService:
             is_recovery=False,
         )
         self.session.add(run)
+        self._append_event(run_id, "status", run.status, run.metrics, now)
         await self.session.commit()
         return run_id
 
-    async def get_run(self, run_id: str) -> RunResponse | None:
+    async def get_run(
+        self, run_id: str, *, fields: Sequence[str] | None = None
+    ) -> RunResponse | None:
+        if fields:
+            projection = self._projection(fields)
+            query = select(*(getattr(Run, name) for name in projection)).where(Run.run_id == run_id)
+            row = (await self.session.execute(query)).mappings().first()
+            return self._to_partial_response(row, projection) if row else None
         run = await self.session.get(Run, run_id)
         if not run:
             return None
@@ -168,7 +287,20 @@ class RunStoreService:
         pipeline: str | None = None,
         page: int = 1,
         page_size: int = 25,
+        cursor: str | None = None,
+        total: str = "exact",
+        fields: Sequence[str] | None = None,
     ) -> RunListResponse:
+        """Newest runs first.
+
+        ``cursor`` (a previous ``next_cursor``) seeks past the last row seen on
+        ``(created_at, run_id)`` and takes precedence over ``page``. ``total`` is
+        ``exact``, ``estimated`` (planner statistics on Postgres) or ``none``.
+        ``fields`` limits the selected columns; the runs then only have those set.
+        """
+        if total not in TOTAL_MODES:
+            raise ValueError(f"total must be one of {', '.join(TOTAL_MODES)}")
+        projection = self._projection(fields) if fields else None
         filters = []
         if user_email:
             filters.append(Run.user_email == user_email)
@@ -177,27 +309,113 @@ class RunStoreService:
         if pipeline:
             filters.append(Run.pipeline == pipeline)
 
-        total_query = select(func.count()).select_from(Run)
-        if filters:
-            total_query = total_query.where(*filters)
-        total = (await self.session.execute(total_query)).scalar_one()
-
-        query = select(Run)
+        count: int | None = None
+        estimated = False
+        if total == "estimated":
+            count = await self._estimate_total(filters)
+            estimated = count is not None
+        if total == "exact" or (total == "estimated" and count is None):
+            total_query = select(func.count()).select_from(Run)
+            if filters:
+                total_query = total_query.where(*filters)
+            count = (await self.session.execute(total_query)).scalar_one()
+
+        if projection:
+            columns = {*projection, "created_at"}
+            query = select(*(getattr(Run, name) for name in RUN_FIELDS if name in columns))
+        else:
+            query = select(Run)
         if filters:
             query = query.where(*filters)
-        query = query.order_by(Run.created_at.desc())
-        query = query.offset((page - 1) * page_size).limit(page_size)
+        if cursor:
+            query = query.where(
+                tuple_(Run.created_at, Run.run_id) < tuple_(*decode_run_cursor(cursor))
+            )
+        query = query.order_by(Run.created_at.desc(), Run.run_id.desc()).limit(page_size)
+        if not cursor:
+            query = query.offset((page - 1) * page_size)
 
         result = await self.session.execute(query)
-        runs = [self._to_response(run) for run in result.scalars().all()]
+        if projection:
+            rows = result.mappings().all()
+            runs = [self._to_partial_response(row, projection) for row in rows]
+            last = (rows[-1]["created_at"], rows[-1]["run_id"]) if rows else None
+        else:
+            models = result.scalars().all()
+            runs = [self._to_response(run) for run in models]
+            last = (models[-1].created_at, models[-1].run_id) if models else None
+        next_cursor = encode_run_cursor(*last) if last and len(runs) == page_size else None
 
         return RunListResponse(
             runs=runs,
-            total=total,
+            total=count,
             page=page,
             page_size=page_size,
+            total_estimated=estimated,
+            next_cursor=next_cursor,
         )
 
+    async def _estimate_total(self, filters: list[Any]) -> int | None:
+        """Planner row estimate, or None where statistics are unavailable."""
+        bind = self.session.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+        if not filters:
+            reltuples = (
+                await self.session.execute(
+                    text("SELECT reltuples FROM pg_class WHERE oid = 'runs'::regclass")
+                )
+            ).scalar_one_or_none()
+            # -1 until the table has been vacuumed or analyzed.
+            return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+        sql, params = _driver_statement(select(Run.run_id).where(*filters), bind.dialect)
+        connection = await self.session.connection()
+        plan = (
+            await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        ).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _append_event(
+        self,
+        run_id: str,
+        event_type: str,
+        status: str,
+        metrics: dict[str, Any] | None,
+        ts: datetime,
+    ) -> None:
+        # Written in the same transaction as the run update it describes.
+        self.session.add(
+            RunEventEntry(
+                run_id=run_id, type=event_type, payload=_event_payload(status, metrics), ts=ts
+            )
+        )
+
+    async def _notify_status(self, run_id: str, status: RunStatus) -> None:
+        # NOTIFY is transactional: listeners only hear about the change once it commits.
+        if self.session.get_bind().dialect.name != "postgresql":
+            return
+        await self.session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {
+                "channel": RUN_STATUS_CHANNEL,
+                "payload": json.dumps({"run_id": run_id, "status": status.value}),
+            },
+        )
+
+    async def _compare_and_set(
+        self, run_id: str, allowed_from: list[str], values: dict[str, Any]
+    ) -> Any:
+        statement = (
+            update(Run)
+            .where(Run.run_id == run_id, Run.status.in_(allowed_from))
+            .values(**values)
+            .returning(Run.status, Run.metrics)
+            .execution_options(synchronize_session="fetch")
+        )
+        return (await self.session.execute(statement)).first()
+
     async def update_run_status(
         self,
         *,
@@ -210,67 +428,115 @@ class RunStoreService:
         error_task: str | None = None,
         metrics: dict[str, Any] | None = None,
     ) -> bool:
-        run = await self.session.get(Run, run_id)
-        if not run:
-            return False
+        """Move a run to ``status`` with a conditional UPDATE.
 
+        The UPDATE only matches while the run is in a status allowed to move to
+        ``status``, so concurrent writers can't regress it. Updates that keep the
+        current status (e.g. metrics only) take a second conditional UPDATE.
+        """
         next_status = self._normalize_status(status)
-        current_status = RunStatus(run.status)
-        if next_status != current_status:
-            allowed = _STATUS_TRANSITIONS.get(current_status, set())
-            if next_status not in allowed:
-                logger.warning(
-                    "Invalid run status transition",
-                    extra={
-                        "run_id": run_id,
-                        "current_status": current_status.value,
-                        "next_status": next_status.value,
-                    },
-                )
-                raise ValueError(
-                    f"Invalid status transition: {current_status.value} -> {next_status.value}"
-                )
-            run.status = next_status.value
-            logger.info(
-                "Run status updated",
+        now = timestamp or self._now()
+        values: dict[str, Any] = {"updated_at": now}
+        if next_status in _STATUS_FIELD_MAP:
+            values[_STATUS_FIELD_MAP[next_status]] = now
+        if batch_job_name is not None:
+            values["batch_job_name"] = batch_job_name
+        if exit_code is not None:
+            values["exit_code"] = exit_code
+        if error_message is not None:
+            values["error_message"] = error_message
+        if error_task is not None:
+            values["error_task"] = error_task
+        if metrics is not None:
+            values["metrics"] = metrics
+
+        row = await self._compare_and_set(
+            run_id, allowed_from(next_status), {**values, "status": next_status.value}
+        )
+        event_type = "status"
+        if row is None:
+            row = await self._compare_and_set(run_id, [next_status.value], values)
+            event_type = "metrics" if metrics is not None else None
+        if row is None:
+            current = (
+                await self.session.execute(select(Run.status).where(Run.run_id == run_id))
+            ).scalar_one_or_none()
+            await self.session.rollback()
+            if current is None:
+                return False
+            logger.warning(
+                "Invalid run status transition",
                 extra={
                     "run_id": run_id,
-                    "current_status": current_status.value,
+                    "current_status": current,
                     "next_status": next_status.value,
                 },
             )
+            raise ValueError(f"Invalid status transition: {current} -> {next_status.value}")
+
+        if event_type == "status":
+            logger.info(
+                "Run status updated",
+                extra={"run_id": run_id, "next_status": next_status.value},
+            )
             self._emit_metric(
-                "run_status_transition",
-                1,
-                run_id=run_id,
-                from_status=current_status.value,
-                to_status=next_status.value,
+                "run_status_transition", 1, run_id=run_id, to_status=next_status.value
             )
-
-        now = timestamp or self._now()
-        run.updated_at = now
-
-        if next_status in _STATUS_FIELD_MAP:
-            setattr(run, _STATUS_FIELD_MAP[next_status], now)
-
-        if batch_job_name is not None:
-            run.batch_job_name = batch_job_name
-        if exit_code is not None:
-            run.exit_code = exit_code
+            await self._notify_status(run_id, next_status)
         if error_message is not None:
-            run.error_message = error_message
             logger.error(
                 "Run error recorded",
-                extra={"run_id": run_id, "status": next_status.value, "error_message": error_message},
+                extra={
+                    "run_id": run_id,
+                    "status": next_status.value,
+                    "error_message": error_message,
+                },
             )
-        if error_task is not None:
-            run.error_task = error_task
-        if metrics is not None:
-            run.metrics = metrics
+        if event_type is not None:
+            self._append_event(run_id, event_type, row.status, row.metrics, now)
 
         await self.session.commit()
         return True
 
+    async def update_run_metrics(
+        self,
+        run_id: str,
+        merge: Callable[[dict[str, Any] | None], dict[str, Any]],
+        *,
+        timestamp: datetime | None = None,
+    ) -> bool:
+        """Replace metrics with ``merge(current metrics)`` under a row lock."""
+        row = (
+            await self.session.execute(
+                select(Run.status, Run.metrics).where(Run.run_id == run_id).with_for_update()
+            )
+        ).first()
+        if row is None:
+            await self.session.rollback()
+            return False
+        now = timestamp or self._now()
+        metrics = merge(row.metrics)
+        if metrics == row.metrics:
+            # Nothing to report; skip the event row and notification.
+            await self.session.rollback()
+            return True
+        status = RunStatus(row.status)
+        await self.session.execute(
+            update(Run)
+            .where(Run.run_id == run_id)
+            # A late flush must not restart the settle period of a finished run.
+            .values(
+                metrics=metrics,
+                updated_at=Run.updated_at if status in TERMINAL_STATUSES else now,
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        self._append_event(run_id, "metrics", row.status, metrics, now)
+        # Wakes the run's event streams; the payload only names the run.
+        await self._notify_status(run_id, status)
+        await self.session.commit()
+        return True
+
     async def create_recovery_run(
         self,
         *,
@@ -307,6 +573,7 @@ class RunStoreService:
             reused_work_dir=reused_work_dir or self._work_dir(parent.run_id),
         )
         self.session.add(run)
+        self._append_event(run_id, "status", run.status, run.metrics, now)
         await self.session.commit()
         return run_id
 
@@ -442,34 +709,18 @@ class RunStoreService:
         )
 
         try:
-            samplesheet = storage.get_file_content(
-                f"gs://{storage.bucket_name}/runs/{parent_run_id}/inputs/samplesheet.csv",
-                text=True,
-            )
-            config_content = (
-                override_config
-                if override_config is not None
-                else storage.get_file_content(
-                    f"gs://{storage.bucket_name}/runs/{parent_run_id}/inputs/nextflow.config",
-                    text=True,
-                )
-            )
+            overrides: dict[str, str | bytes] = {}
+            if override_config is not None:
+                overrides["nextflow.config"] = override_config
             if override_params is not None:
-                params_yaml = self._render_params_yaml(override_params)
-            else:
-                params_yaml = storage.get_file_content(
-                    f"gs://{storage.bucket_name}/runs/{parent_run_id}/inputs/params.yaml",
-                    text=True,
-                )
+                overrides["params.yaml"] = self._render_params_yaml(override_params)
 
-            storage.upload_run_files(
+            await asyncio.to_thread(
+                storage.copy_run_inputs,
+                parent_run_id,
                 run_id,
-                {
-                    "samplesheet.csv": samplesheet,
-                    "nextflow.config": config_content,
-                    "params.yaml": params_yaml,
-                },
                 user_email,
+                overrides,
             )
 
             config_gcs_path = (
@@ -517,42 +768,94 @@ class RunStoreService:
         batch: BatchService,
         min_age_seconds: float = 900.0,
     ) -> int:
-        cutoff = self._now().timestamp() - min_age_seconds
-        query = select(Run).where(Run.status.in_([RunStatus.SUBMITTED.value, RunStatus.RUNNING.value]))
-        result = await self.session.execute(query)
-        stale_runs = [run for run in result.scalars().all() if run.updated_at.timestamp() < cutoff]
+        """Apply terminal Batch job states to runs that have gone quiet.
 
-        reconciled = 0
-        for run in stale_runs:
-            if not run.batch_job_name:
-                continue
+        Jobs are fetched with one label-filtered listing per region and every change is
+        written with a single UPDATE.
+        """
+        now = self._now()
+        active = [RunStatus.SUBMITTED.value, RunStatus.RUNNING.value]
+        query = select(Run.run_id, Run.status, Run.batch_job_name, Run.created_at).where(
+            Run.status.in_(active),
+            Run.batch_job_name.is_not(None),
+            Run.updated_at < now - timedelta(seconds=min_age_seconds),
+        )
+        stale_runs = (await self.session.execute(query)).all()
+
+        jobs: dict[str, dict[str, Any]] = {}
+        # Only finished jobs no older than the oldest stale run can change anything, so
+        # the listing doesn't grow with the job history.
+        created_after = min((row.created_at for row in stale_runs), default=None)
+        for region in sorted({job_region(row.batch_job_name) for row in stale_runs} - {None}):
             try:
-                status = batch.get_job_status(run.batch_job_name)
+                jobs.update(
+                    await asyncio.to_thread(
+                        batch.list_jobs,
+                        region=region,
+                        states=TERMINAL_JOB_STATES,
+                        created_after=created_after,
+                    )
+                )
             except Exception as exc:
                 logger.warning(
-                    "Failed to fetch Batch status for run",
-                    extra={"run_id": run.run_id, "error": str(exc)},
+                    "Failed to list Batch jobs for region",
+                    extra={"region": region, "error": str(exc)},
                 )
+
+        changes: dict[str, RunStatus] = {}
+        error_messages: dict[str, str] = {}
+        for row in stale_runs:
+            status = jobs.get(row.batch_job_name)
+            if not status or not status.get("run_status"):
                 continue
-            run_status = status.get("run_status")
-            if not run_status:
+            next_status = RunStatus(status["run_status"])
+            if next_status not in TERMINAL_STATUSES:
                 continue
-            next_status = RunStatus(run_status)
-            if next_status == RunStatus.FAILED:
-                message = None
-                events = status.get("status_events") or []
-                if events:
-                    message = str(events[-1].get("description"))
-                await self.update_run_status(
-                    run_id=run.run_id,
-                    status=next_status,
-                    error_message=message,
+            if next_status not in _STATUS_TRANSITIONS[RunStatus(row.status)]:
+                logger.warning(
+                    "Skipping invalid reconciled status transition",
+                    extra={
+                        "run_id": row.run_id,
+                        "current_status": row.status,
+                        "next_status": next_status.value,
+                    },
                 )
-                reconciled += 1
-            elif next_status in {RunStatus.COMPLETED, RunStatus.CANCELLED}:
-                await self.update_run_status(run_id=run.run_id, status=next_status)
-                reconciled += 1
+                continue
+            changes[row.run_id] = next_status
+            events = status.get("status_events") or []
+            if next_status == RunStatus.FAILED and events:
+                error_messages[row.run_id] = str(events[-1].get("description"))
+        if not changes:
+            return 0
+
+        values: dict[str, Any] = {
+            "status": case({run_id: s.value for run_id, s in changes.items()}, value=Run.run_id),
+            "updated_at": now,
+        }
+        for next_status in set(changes.values()):
+            column = getattr(Run, _STATUS_FIELD_MAP[next_status])
+            ids = [run_id for run_id, s in changes.items() if s == next_status]
+            values[column.key] = case((Run.run_id.in_(ids), now), else_=column)
+        if error_messages:
+            values["error_message"] = case(
+                error_messages, value=Run.run_id, else_=Run.error_message
+            )
+        # The status guard skips runs that moved on since they were read.
+        statement = (
+            update(Run)
+            .where(Run.run_id.in_(list(changes)), Run.status.in_(active))
+            .values(**values)
+            .returning(Run.run_id, Run.status, Run.metrics)
+            .execution_options(synchronize_session=False)
+        )
+        updated = (await self.session.execute(statement)).all()
+        for row in updated:
+            next_status = RunStatus(row.status)
+            self._append_event(row.run_id, "status", row.status, row.metrics, now)
+            await self._notify_status(row.run_id, next_status)
+        await self.session.commit()
 
+        reconciled = len(updated)
         if reconciled:
             logger.info("Reconciled stale runs", extra={"count": reconciled})
         return reconciled
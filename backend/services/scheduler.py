@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from backend.services.database import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_lock key shared by every API replica; the holder runs leader-only jobs.
+SCHEDULER_LOCK_KEY = 0x6172635F726561  # "arc_rea"
+
+
+@dataclass
+class JobStats:
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_started_at: datetime | None = None
+    last_duration_seconds: float | None = None
+    total_duration_seconds: float = 0.0
+    last_error: str | None = None
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    interval: float
+    jitter: float = 0.1
+    leader_only: bool = True
+    stats: JobStats = field(default_factory=JobStats)
+    running: bool = False
+    task: asyncio.Task[None] | None = None
+
+    def next_delay(self) -> float:
+        return max(0.0, self.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+
+class Scheduler:
+    """Runs registered coroutines periodically inside the API process.
+
+    Each job sleeps ``interval`` seconds (spread by ``jitter``) between runs, so a slow
+    run never overlaps the next one. With several replicas on Postgres, the replica
+    holding the advisory lock is the leader and the only one to run ``leader_only``
+    jobs; the others retry the lock every ``leader_check_interval`` seconds. Without
+    Postgres the process is always the leader.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseService | None = None,
+        *,
+        leader_check_interval: float = 30.0,
+        shutdown_timeout: float = 30.0,
+    ) -> None:
+        self.database = database
+        self.leader_check_interval = leader_check_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.is_leader = False
+        self._jobs: dict[str, ScheduledJob] = {}
+        self._lock_connection: AsyncConnection | None = None
+        self._election: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    def register(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        *,
+        interval: float,
+        jitter: float = 0.1,
+        leader_only: bool = True,
+    ) -> None:
+        if name in self._jobs:
+            raise ValueError(f"Job already registered: {name}")
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self._jobs[name] = ScheduledJob(
+            name=name, func=func, interval=interval, jitter=jitter, leader_only=leader_only
+        )
+
+    def _uses_advisory_lock(self) -> bool:
+        return (
+            self.database is not None
+            and self.database.engine.url.get_backend_name() == "postgresql"
+        )
+
+    def start(self) -> None:
+        self._stopping = False
+        if self._uses_advisory_lock():
+            self._election = asyncio.create_task(self._elect())
+        else:
+            self.is_leader = True
+        for job in self._jobs.values():
+            if job.task is None:
+                job.task = asyncio.create_task(self._loop(job))
+
+    async def _elect(self) -> None:
+        while True:
+            try:
+                await self._check_leadership()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Scheduler leader election failed: %s", exc)
+                await self._release_lock()
+            await asyncio.sleep(self.leader_check_interval)
+
+    async def _check_leadership(self) -> None:
+        # Session-level advisory locks live as long as the connection, so the leader
+        # keeps one connection checked out and pings it; losing it hands over the lock.
+        if self._lock_connection is not None:
+            await self._lock_connection.execute(text("SELECT 1"))
+            await self._lock_connection.commit()
+            return
+        connection = await self.database.engine.connect()
+        acquired = (
+            await connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": SCHEDULER_LOCK_KEY}
+            )
+        ).scalar_one()
+        if not acquired:
+            await connection.close()
+            return
+        # The lock outlives the transaction; don't leave the held connection idle in one.
+        await connection.commit()
+        self._lock_connection = connection
+        self.is_leader = True
+        logger.info("Scheduler acquired leadership")
+
+    async def _release_lock(self) -> None:
+        connection, self._lock_connection = self._lock_connection, None
+        was_leader, self.is_leader = self.is_leader, False
+        if connection is None:
+            return
+        try:
+            if was_leader:
+                await connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEDULER_LOCK_KEY}
+                )
+            await connection.close()
+        except Exception as exc:
+            logger.warning("Failed to release scheduler lock: %s", exc)
+            await connection.invalidate()
+
+    async def _loop(self, job: ScheduledJob) -> None:
+        # A random first delay keeps replicas restarted together from firing in step.
+        await asyncio.sleep(random.uniform(0, job.interval * job.jitter))
+        while not self._stopping:
+            await self.run_job(job.name)
+            if self._stopping:
+                return
+            await asyncio.sleep(job.next_delay())
+
+    async def run_job(self, name: str) -> bool:
+        """Run ``name`` once now; False when skipped on a non-leader replica."""
+        job = self._jobs[name]
+        if job.leader_only and not self.is_leader:
+            job.stats.skipped += 1
+            return False
+        job.running = True
+        job.stats.last_started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            await job.func()
+        except Exception as exc:
+            job.stats.failures += 1
+            job.stats.last_error = str(exc)
+            logger.exception("Scheduled job failed", extra={"job": name})
+        finally:
+            job.running = False
+            duration = time.perf_counter() - started
+            job.stats.runs += 1
+            job.stats.last_duration_seconds = duration
+            job.stats.total_duration_seconds += duration
+            logger.info("metric scheduler_job_seconds=%.3f %s", duration, {"job": name})
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "leader": self.is_leader,
+            "jobs": {name: asdict(job.stats) for name, job in self._jobs.items()},
+        }
+
+    async def close(self) -> None:
+        """Stop scheduling; jobs already running get ``shutdown_timeout`` to finish."""
+        self._stopping = True
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        in_flight = [job.task for job in self._jobs.values() if job.task and job.running]
+        for job in self._jobs.values():
+            if job.task is not None and not job.running:
+                job.task.cancel()
+            job.task = None
+        if in_flight:
+            _, pending = await asyncio.wait(in_flight, timeout=self.shutdown_timeout)
+            for task in pending:
+                logger.warning("Cancelling scheduled job still running at shutdown")
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._election is not None:
+            self._election.cancel()
+            await asyncio.gather(self._election, return_exceptions=True)
+            self._election = None
+        await self._release_lock()
@@ -1,12 +1,39 @@
 from __future__ import annotations
 
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timezone, timedelta
-from typing import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Protocol
 
 from google.auth.exceptions import DefaultCredentialsError
 from google.cloud import storage
 
+from backend.services.local_storage import LocalStorageClient
+
+RUN_FILE_GROUPS = ("inputs", "results", "logs")
+RUN_INPUT_FILES = ("samplesheet.csv", "nextflow.config", "params.yaml")
+STORAGE_BACKENDS = ("gcs", "local")
+DEFAULT_LIST_PAGE_SIZE = 200
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+# Run outputs only; inputs/ holds three small files and is always listed live.
+MANIFEST_FILE_GROUPS = ("results", "logs")
+
+_MANIFEST_CACHE: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_MANIFEST_CACHE_SIZE = 32
+# Manifests are read from asyncio.to_thread workers, like the signed URL cache.
+_MANIFEST_LOCK = threading.Lock()
+
+_SIGNED_URL_CACHE: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+_SIGNED_URL_CACHE_SIZE = 4096
+# Signing runs in asyncio.to_thread workers, so cache reads and evictions share a lock.
+_SIGNED_URL_LOCK = threading.Lock()
+_SIGNED_URL_BUCKET_SECONDS = 300
+
 
 def _parse_gcs_uri(gcs_uri: str) -> tuple[str, str]:
     if not gcs_uri.startswith("gs://"):
@@ -18,9 +45,31 @@ def _parse_gcs_uri(gcs_uri: str) -> tuple[str, str]:
     return bucket_name, blob_name
 
 
+def _validate_run_path(path: str, normalized: str) -> None:
+    parts = normalized.split("/")
+    if parts[0] not in RUN_FILE_GROUPS or any(part in ("", ".", "..") for part in parts):
+        raise ValueError(f"Path must be within {', '.join(RUN_FILE_GROUPS)}: {path}")
+
+
+def _normalize_run_path(path: str) -> str:
+    normalized = path.strip("/")
+    if not normalized:
+        return ""
+    _validate_run_path(path, normalized)
+    return f"{normalized}/"
+
+
+class StorageClient(Protocol):
+    """Subset of ``google.cloud.storage.Client`` used by ``StorageService``."""
+
+    def bucket(self, bucket_name: str) -> Any: ...
+
+    def list_blobs(self, bucket_or_name: Any, *args: Any, **kwargs: Any) -> Any: ...
+
+
 @dataclass
 class StorageService:
-    client: storage.Client
+    client: StorageClient
     bucket_name: str
 
     @classmethod
@@ -28,13 +77,23 @@ class StorageService:
         bucket_name = getattr(settings, "nextflow_bucket", None)
         if not bucket_name:
             raise ValueError("nextflow_bucket must be configured")
+        backend = getattr(settings, "storage_backend", None) or "gcs"
+        if backend not in STORAGE_BACKENDS:
+            raise ValueError(f"storage_backend must be one of {', '.join(STORAGE_BACKENDS)}")
+        if backend == "local":
+            root = getattr(settings, "local_storage_root", None)
+            if not root:
+                raise ValueError("local_storage_root must be configured for local storage")
+            local_client = LocalStorageClient(root)
+            local_client.create_bucket(bucket_name)
+            return cls(client=local_client, bucket_name=bucket_name)
         try:
             client = storage.Client()
         except DefaultCredentialsError:
             client = storage.Client.create_anonymous_client()
         return cls(client=client, bucket_name=bucket_name)
 
-    def _bucket(self) -> storage.Bucket:
+    def _bucket(self) -> Any:
         return self.client.bucket(self.bucket_name)
 
     def upload_run_file(
@@ -45,14 +104,17 @@ class StorageService:
         user_email: str,
     ) -> str:
         blob = self._bucket().blob(f"runs/{run_id}/inputs/{filename}")
-        created_at = datetime.now(timezone.utc).isoformat()
-        blob.metadata = {
+        blob.metadata = self._input_metadata(run_id, user_email)
+        blob.upload_from_string(content)
+        return f"gs://{self.bucket_name}/runs/{run_id}/inputs/{filename}"
+
+    @staticmethod
+    def _input_metadata(run_id: str, user_email: str) -> dict[str, str]:
+        return {
             "run-id": run_id,
             "user-email": user_email,
-            "created-at": created_at,
+            "created-at": datetime.now(timezone.utc).isoformat(),
         }
-        blob.upload_from_string(content)
-        return f"gs://{self.bucket_name}/runs/{run_id}/inputs/{filename}"
 
     def upload_run_files(
         self,
@@ -66,29 +128,208 @@ class StorageService:
             uris.append(uri)
         return uris
 
-    def get_run_files(self, run_id: str) -> dict[str, list[dict[str, object]]]:
-        prefix = f"runs/{run_id}/"
-        grouped: dict[str, list[dict[str, object]]] = {"inputs": [], "results": [], "logs": []}
-        for entry in self.list_files(prefix):
-            name = str(entry["name"])
-            if not name.startswith(prefix):
+    def copy_run_input(
+        self,
+        parent_run_id: str,
+        run_id: str,
+        filename: str,
+        user_email: str,
+    ) -> str:
+        bucket = self._bucket()
+        source = bucket.blob(f"runs/{parent_run_id}/inputs/{filename}")
+        destination = bucket.blob(f"runs/{run_id}/inputs/{filename}")
+        destination.metadata = self._input_metadata(run_id, user_email)
+        # Server-side rewrite; large objects may need several calls to complete.
+        token, _, _ = destination.rewrite(source)
+        while token is not None:
+            token, _, _ = destination.rewrite(source, token=token)
+        return f"gs://{self.bucket_name}/runs/{run_id}/inputs/{filename}"
+
+    def copy_run_inputs(
+        self,
+        parent_run_id: str,
+        run_id: str,
+        user_email: str,
+        overrides: dict[str, str | bytes] | None = None,
+        filenames: Iterable[str] = RUN_INPUT_FILES,
+    ) -> list[str]:
+        """Copy a parent run's inputs without routing their content through the API.
+
+        Only files present in ``overrides`` are uploaded from memory.
+        """
+        overrides = overrides or {}
+        names = list(filenames)
+        with ThreadPoolExecutor(max_workers=max(len(names), 1)) as executor:
+            futures = [
+                executor.submit(self.upload_run_file, run_id, name, overrides[name], user_email)
+                if name in overrides
+                else executor.submit(self.copy_run_input, parent_run_id, run_id, name, user_email)
+                for name in names
+            ]
+            return [future.result() for future in futures]
+
+    def get_run_files(
+        self,
+        run_id: str,
+        path: str = "",
+        *,
+        page_size: int = DEFAULT_LIST_PAGE_SIZE,
+        page_token: str | None = None,
+        manifest: dict[str, Any] | None = None,
+    ) -> dict[str, object]:
+        normalized = _normalize_run_path(path)
+        if manifest is not None and normalized.split("/", 1)[0] in MANIFEST_FILE_GROUPS:
+            return self._list_manifest_directory(
+                run_id, manifest, normalized, page_size=page_size, page_token=page_token
+            )
+
+        # Browse one directory level at a time so the Nextflow work/ tree is never walked.
+        root = f"runs/{run_id}/"
+        listing = self.list_directory(
+            f"{root}{normalized}", page_size=page_size, page_token=page_token
+        )
+        directories = []
+        for prefix in listing["directories"]:
+            rel = prefix[len(root) :]
+            if not normalized and rel.rstrip("/") not in RUN_FILE_GROUPS:
                 continue
-            rel = name[len(prefix) :]
-            if "/" not in rel:
+            directories.append({"name": rel, "gcs_uri": f"gs://{self.bucket_name}/{prefix}"})
+        files = []
+        if normalized:
+            for entry in listing["files"]:
+                name = str(entry["name"])
+                files.append(
+                    {
+                        "name": name[len(root) :],
+                        "size": entry.get("size"),
+                        "updated": entry.get("updated"),
+                        "gcs_uri": f"gs://{self.bucket_name}/{name}",
+                    }
+                )
+        return {
+            "path": normalized,
+            "directories": directories,
+            "files": files,
+            "next_page_token": listing["next_page_token"],
+        }
+
+    def _list_manifest_directory(
+        self,
+        run_id: str,
+        manifest: dict[str, Any],
+        normalized: str,
+        *,
+        page_size: int,
+        page_token: str | None,
+    ) -> dict[str, object]:
+        root = f"runs/{run_id}/"
+        aggregates: dict[str, dict[str, int]] = manifest.get("directories", {})
+        entries: list[dict[str, object]] = []
+        for name in sorted(aggregates):
+            if name == normalized or not name.startswith(normalized):
                 continue
-            top_dir = rel.split("/", 1)[0]
-            if top_dir not in grouped:
+            if "/" in name[len(normalized) :].rstrip("/"):
                 continue
-            gcs_uri = f"gs://{self.bucket_name}/{name}"
-            grouped[top_dir].append(
+            entries.append(
                 {
-                    "name": rel,
-                    "size": entry.get("size"),
-                    "updated": entry.get("updated"),
-                    "gcs_uri": gcs_uri,
+                    "name": name,
+                    "gcs_uri": f"gs://{self.bucket_name}/{root}{name}",
+                    "file_count": aggregates[name]["file_count"],
+                    "size": aggregates[name]["size"],
                 }
             )
-        return grouped
+        directory_count = len(entries)
+        if normalized:
+            for entry in manifest.get("files", []):
+                name = str(entry["path"])
+                if not name.startswith(normalized) or "/" in name[len(normalized) :]:
+                    continue
+                entries.append(
+                    {
+                        "name": name,
+                        "size": entry.get("size"),
+                        "updated": entry.get("updated"),
+                        "crc32c": entry.get("crc32c"),
+                        "gcs_uri": f"gs://{self.bucket_name}/{root}{name}",
+                    }
+                )
+
+        start = int(page_token) if page_token and page_token.isdigit() else 0
+        end = start + page_size
+        page = list(enumerate(entries[start:end], start=start))
+        return {
+            "path": normalized,
+            "directories": [entry for index, entry in page if index < directory_count],
+            "files": [entry for index, entry in page if index >= directory_count],
+            "next_page_token": str(end) if end < len(entries) else None,
+        }
+
+    def build_run_manifest(self, run_id: str) -> dict[str, Any]:
+        root = f"runs/{run_id}/"
+        files: list[dict[str, object]] = []
+        directories: dict[str, dict[str, int]] = {}
+        for group in MANIFEST_FILE_GROUPS:
+            for blob in self.client.list_blobs(self.bucket_name, prefix=f"{root}{group}/"):
+                rel = blob.name[len(root) :]
+                if rel.endswith("/"):
+                    continue
+                size = blob.size or 0
+                updated = blob.updated
+                files.append(
+                    {
+                        "path": rel,
+                        "size": size,
+                        "updated": (
+                            updated.isoformat() if isinstance(updated, datetime) else updated
+                        ),
+                        "crc32c": getattr(blob, "crc32c", None),
+                    }
+                )
+                parts = rel.split("/")[:-1]
+                for depth in range(1, len(parts) + 1):
+                    directory = "/".join(parts[:depth]) + "/"
+                    aggregate = directories.setdefault(directory, {"file_count": 0, "size": 0})
+                    aggregate["file_count"] += 1
+                    aggregate["size"] += size
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "run_id": run_id,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "files": files,
+            "directories": directories,
+        }
+        blob = self._bucket().blob(f"{root}{MANIFEST_FILENAME}")
+        blob.upload_from_string(json.dumps(manifest), content_type="application/json")
+        return manifest
+
+    def get_run_manifest(self, run_id: str, *, build: bool = True) -> dict[str, Any] | None:
+        # Manifests are only written for settled runs, so a cached copy never goes stale.
+        with _MANIFEST_LOCK:
+            cached = _MANIFEST_CACHE.get(run_id)
+            if cached is not None:
+                _MANIFEST_CACHE.move_to_end(run_id)
+                return cached
+
+        blob = self._bucket().blob(f"runs/{run_id}/{MANIFEST_FILENAME}")
+        manifest: dict[str, Any] | None = None
+        if blob.exists():
+            try:
+                manifest = json.loads(blob.download_as_bytes())
+            except ValueError:
+                manifest = None
+            if manifest and manifest.get("version") != MANIFEST_VERSION:
+                manifest = None
+        if manifest is None:
+            if not build:
+                return None
+            manifest = self.build_run_manifest(run_id)
+
+        with _MANIFEST_LOCK:
+            _MANIFEST_CACHE[run_id] = manifest
+            while len(_MANIFEST_CACHE) > _MANIFEST_CACHE_SIZE:
+                _MANIFEST_CACHE.popitem(last=False)
+        return manifest
 
     def get_file_content(self, gcs_uri: str, text: bool = True) -> str | bytes:
         data = self.download_file(gcs_uri)
@@ -107,6 +348,26 @@ class StorageService:
         blob = bucket.blob(blob_name)
         return blob.download_as_bytes()
 
+    def download_range(self, gcs_uri: str, start: int, end: int | None = None) -> bytes:
+        bucket_name, blob_name = _parse_gcs_uri(gcs_uri)
+        bucket = self.client.bucket(bucket_name)
+        blob = bucket.blob(blob_name)
+        return blob.download_as_bytes(start=start, end=end)
+
+    def get_file_metadata(self, gcs_uri: str) -> dict[str, object] | None:
+        bucket_name, blob_name = _parse_gcs_uri(gcs_uri)
+        bucket = self.client.bucket(bucket_name)
+        blob = bucket.get_blob(blob_name)
+        if blob is None:
+            return None
+        return {
+            "name": blob.name,
+            "size": blob.size,
+            "generation": blob.generation,
+            "updated": blob.updated,
+            "crc32c": blob.crc32c,
+        }
+
     def list_files(self, prefix: str) -> list[dict[str, object]]:
         blobs = self.client.list_blobs(self.bucket_name, prefix=prefix)
         return [
@@ -118,6 +379,36 @@ class StorageService:
             for blob in blobs
         ]
 
+    def list_directory(
+        self,
+        prefix: str,
+        *,
+        page_size: int = DEFAULT_LIST_PAGE_SIZE,
+        page_token: str | None = None,
+    ) -> dict[str, object]:
+        iterator = self.client.list_blobs(
+            self.bucket_name,
+            prefix=prefix,
+            delimiter="/",
+            page_size=page_size,
+            page_token=page_token,
+        )
+        page = next(iter(iterator.pages), None)
+        files: list[dict[str, object]] = []
+        directories: list[str] = []
+        if page is not None:
+            files = [
+                {"name": blob.name, "size": blob.size, "updated": blob.updated}
+                for blob in page
+                if blob.name != prefix
+            ]
+            directories = sorted(page.prefixes)
+        return {
+            "files": files,
+            "directories": directories,
+            "next_page_token": iterator.next_page_token,
+        }
+
     def files_exist(self, gcs_paths: Iterable[str]) -> dict[str, bool]:
         results: dict[str, bool] = {}
         for path in gcs_paths:
@@ -136,16 +427,56 @@ class StorageService:
         blob.delete()
         return True
 
-    def generate_signed_url(self, gcs_uri: str, expiration_minutes: int = 60) -> str:
+    def run_file_uri(self, run_id: str, path: str) -> str:
+        normalized = path.lstrip("/")
+        if not normalized or normalized.endswith("/"):
+            raise ValueError(f"Path must reference a file: {path}")
+        _validate_run_path(path, normalized)
+        return f"gs://{self.bucket_name}/runs/{run_id}/{normalized}"
+
+    def generate_signed_url(
+        self,
+        gcs_uri: str,
+        expiration_minutes: int = 60,
+        *,
+        expiration: datetime | None = None,
+    ) -> str:
         bucket_name, blob_name = _parse_gcs_uri(gcs_uri)
         bucket = self.client.bucket(bucket_name)
         blob = bucket.blob(blob_name)
         return blob.generate_signed_url(
             version="v4",
-            expiration=timedelta(minutes=expiration_minutes),
+            expiration=expiration or timedelta(minutes=expiration_minutes),
             method="GET",
         )
 
+    def get_signed_url(self, gcs_uri: str, expiration_minutes: int = 60) -> str:
+        # URLs are shared within fixed time buckets. Each one expires at the end of its
+        # bucket plus the requested lifetime, so any cached URL is still valid for at
+        # least ``expiration_minutes`` when it is handed out.
+        bucket_index = int(time.time() // _SIGNED_URL_BUCKET_SECONDS)
+        key = (gcs_uri, expiration_minutes, bucket_index)
+        with _SIGNED_URL_LOCK:
+            cached = _SIGNED_URL_CACHE.get(key)
+            if cached is not None:
+                _SIGNED_URL_CACHE.move_to_end(key)
+                return cached
+
+        bucket_end = datetime.fromtimestamp(
+            (bucket_index + 1) * _SIGNED_URL_BUCKET_SECONDS, tz=timezone.utc
+        )
+        url = self.generate_signed_url(
+            gcs_uri, expiration=bucket_end + timedelta(minutes=expiration_minutes)
+        )
+        with _SIGNED_URL_LOCK:
+            _SIGNED_URL_CACHE[key] = url
+            _SIGNED_URL_CACHE.move_to_end(key)
+            while next(iter(_SIGNED_URL_CACHE))[2] < bucket_index:
+                _SIGNED_URL_CACHE.popitem(last=False)
+            while len(_SIGNED_URL_CACHE) > _SIGNED_URL_CACHE_SIZE:
+                _SIGNED_URL_CACHE.popitem(last=False)
+        return url
+
     def health_check(self) -> bool:
         try:
             return self._bucket().exists()
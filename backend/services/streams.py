@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+@dataclass
+class _Topic:
+    history: deque[Any]
+    subscribers: set[asyncio.Queue[Any]] = field(default_factory=set)
+    task: asyncio.Task[None] | None = None
+
+
+class StreamBroker:
+    """Fans one upstream poller per key out to any number of subscribers.
+
+    The poller starts with the first subscriber and is cancelled when the last one
+    leaves. Recent items are kept in a ring buffer and replayed to late joiners.
+    Subscribers that fall more than ``queue_size`` items behind lose the oldest ones.
+    """
+
+    def __init__(self, *, history: int = 500, queue_size: int = 1000) -> None:
+        self.history = history
+        self.queue_size = queue_size
+        self._topics: dict[Hashable, _Topic] = {}
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue[Any], item: Any) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+    async def _poll(
+        self,
+        key: Hashable,
+        topic: _Topic,
+        source: Callable[[], AsyncIterator[Any]],
+    ) -> None:
+        try:
+            async for item in source():
+                topic.history.append(item)
+                for queue in list(topic.subscribers):
+                    self._offer(queue, item)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Stream poller failed", extra={"stream": str(key)})
+        finally:
+            if self._topics.get(key) is topic:
+                del self._topics[key]
+            for queue in topic.subscribers:
+                self._offer(queue, _END)
+
+    def subscribe(
+        self,
+        key: Hashable,
+        source: Callable[[], AsyncIterator[Any]],
+    ) -> "Subscription":
+        """Register now and return an iterator of buffered history, then live items.
+
+        ``source`` is only called when no poller is running for ``key``. Registration
+        happens before this returns, so nothing published afterwards is missed; callers
+        must ``aclose()`` the subscription when done.
+        """
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = _Topic(history=deque(maxlen=self.history))
+            self._topics[key] = topic
+            topic.task = asyncio.create_task(self._poll(key, topic, source))
+        queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=self.queue_size)
+        topic.subscribers.add(queue)
+        return Subscription(self, key, topic, queue, deque(topic.history))
+
+    def _unsubscribe(self, key: Hashable, topic: _Topic, queue: asyncio.Queue[Any]) -> None:
+        topic.subscribers.discard(queue)
+        if not topic.subscribers and self._topics.get(key) is topic:
+            del self._topics[key]
+            if topic.task is not None:
+                topic.task.cancel()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "streams": len(self._topics),
+            "subscribers": sum(len(topic.subscribers) for topic in self._topics.values()),
+        }
+
+    async def close(self) -> None:
+        tasks = [topic.task for topic in self._topics.values() if topic.task is not None]
+        self._topics.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class Subscription:
+    def __init__(
+        self,
+        broker: StreamBroker,
+        key: Hashable,
+        topic: _Topic,
+        queue: asyncio.Queue[Any],
+        backlog: deque[Any],
+    ) -> None:
+        self._broker = broker
+        self._key = key
+        self._topic = topic
+        self._queue = queue
+        self._backlog = backlog
+        self._closed = False
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._backlog:
+            return self._backlog.popleft()
+        if self._closed:
+            raise StopAsyncIteration
+        item = await self._queue.get()
+        if item is _END:
+            await self.aclose()
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._backlog.clear()
+            self._broker._unsubscribe(self._key, self._topic, self._queue)
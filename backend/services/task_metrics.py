@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.runs import Run
+from backend.models.schemas.task_metrics import (
+    MetricRegression,
+    ProcessVersionStats,
+    TaskMetricsComparison,
+)
+from backend.models.task_metrics import TaskMetric
+from backend.services.database import DatabaseService
+from backend.services.logs import LogService
+from backend.services.runs import RUN_SETTLE_PERIOD, TERMINAL_STATUSES
+from backend.services.storage import StorageService
+
+logger = logging.getLogger(__name__)
+
+# Frame column -> task_metrics column.
+_METRIC_COLUMNS = {
+    "process": "process",
+    "hash": "task_hash",
+    "name": "name",
+    "status": "status",
+    "attempt": "attempt",
+    "duration_s": "duration_s",
+    "realtime_s": "realtime_s",
+    "queue_wait_s": "queue_wait_s",
+    "cpus": "cpus",
+    "cpu_percent": "cpu_percent",
+    "memory_bytes": "memory_bytes",
+    "peak_rss_bytes": "peak_rss_bytes",
+    "rchar_bytes": "read_bytes",
+    "wchar_bytes": "write_bytes",
+}
+_INTEGER_COLUMNS = ("attempt", "cpus")
+_COMPARED_METRICS = ("realtime_s", "peak_rss_bytes")
+# Cached tasks reuse earlier results, so only freshly completed tasks are compared.
+_COMPLETED_TASK_STATUS = "COMPLETED"
+_MIN_TASKS_PER_SIDE = 5
+# Failed ingestions are retried on later sweeps, then the run is left alone.
+MAX_INGEST_ATTEMPTS = 5
+
+
+def mann_whitney_u(a: Sequence[float], b: Sequence[float]) -> tuple[float, float]:
+    """Two-sided Mann-Whitney U test (normal approximation, tie and continuity corrected)."""
+    x = np.asarray(a, dtype=float)
+    y = np.asarray(b, dtype=float)
+    n1, n2 = len(x), len(y)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    _, inverse, counts = np.unique(np.concatenate([x, y]), return_inverse=True, return_counts=True)
+    ranks = (np.cumsum(counts) - (counts - 1) / 2.0)[inverse]
+    u1 = float(ranks[:n1].sum() - n1 * (n1 + 1) / 2.0)
+    n = n1 + n2
+    ties = float((counts**3 - counts).sum())
+    variance = n1 * n2 / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u1, 1.0
+    delta = u1 - n1 * n2 / 2.0
+    z = (abs(delta) - 0.5) / math.sqrt(variance)
+    return u1, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2.0)))
+
+
+def _version_key(version: str) -> tuple[tuple[int, Any], ...]:
+    return tuple(
+        (0, int(part)) if part.isdigit() else (1, part) for part in re.split(r"[.\-+]", version)
+    )
+
+
+def _optional(value: Any) -> float | None:
+    if value is None or pd.isna(value):
+        return None
+    return float(value)
+
+
+@dataclass
+class TaskMetricsService:
+    session: AsyncSession
+
+    @classmethod
+    def create(cls, session: AsyncSession) -> "TaskMetricsService":
+        return cls(session=session)
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def ingest_run(self, run: Run, frame: pd.DataFrame | None) -> int:
+        """Replace the run's task_metrics rows with one row per trace task."""
+        rows: list[dict[str, Any]] = []
+        now = self._now()
+        if frame is not None and not frame.empty:
+            metrics = frame.assign(
+                queue_wait_s=(frame["start"] - frame["submit"]).dt.total_seconds().clip(lower=0)
+            )[list(_METRIC_COLUMNS)].rename(columns=_METRIC_COLUMNS)
+            metrics = metrics.astype(object).where(metrics.notna(), None)
+            rows = metrics.to_dict("records")
+            for row in rows:
+                for column in _INTEGER_COLUMNS:
+                    if row[column] is not None:
+                        row[column] = int(row[column])
+                row.update(
+                    run_id=run.run_id,
+                    pipeline=run.pipeline,
+                    pipeline_version=run.pipeline_version,
+                    sample_count=run.sample_count,
+                    created_at=now,
+                )
+
+        await self.session.execute(delete(TaskMetric).where(TaskMetric.run_id == run.run_id))
+        if rows:
+            await self.session.execute(insert(TaskMetric), rows)
+        await self.session.execute(
+            update(Run)
+            .where(Run.run_id == run.run_id)
+            # Keep updated_at: it tracks run status changes, not ingestion.
+            .values(task_metrics_ingested_at=now, updated_at=Run.updated_at)
+        )
+        await self.session.commit()
+        return len(rows)
+
+    async def pending_runs(self, limit: int = 20) -> list[Run]:
+        # Terminal runs settle before ingestion so the final trace upload is included.
+        query = (
+            select(Run)
+            .where(
+                Run.status.in_([status.value for status in TERMINAL_STATUSES]),
+                Run.task_metrics_ingested_at.is_(None),
+                Run.task_metrics_attempts < MAX_INGEST_ATTEMPTS,
+                Run.updated_at <= self._now() - RUN_SETTLE_PERIOD,
+            )
+            # Runs that keep failing go last, so they can't starve newer ones.
+            .order_by(Run.task_metrics_attempts, Run.updated_at)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        runs = list(result.scalars().all())
+        # Detached, so a rollback after one failed run doesn't expire the others.
+        for run in runs:
+            self.session.expunge(run)
+        return runs
+
+    async def _record_failed_attempt(self, run_id: str) -> None:
+        try:
+            await self.session.execute(
+                update(Run)
+                .where(Run.run_id == run_id)
+                .values(
+                    task_metrics_attempts=Run.task_metrics_attempts + 1,
+                    updated_at=Run.updated_at,
+                )
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            logger.exception("Failed to record ingestion attempt", extra={"run_id": run_id})
+
+    async def ingest_pending(
+        self,
+        logs: LogService,
+        limit: int = 20,
+        *,
+        manifests: StorageService | None = None,
+    ) -> int:
+        """Load settled runs' traces and, with ``manifests``, write their results manifests.
+
+        Both happen once per run, when it has settled after reaching a terminal status.
+        """
+        ingested = 0
+        for run in await self.pending_runs(limit):
+            try:
+                # Storage errors raise so the run stays pending; only a trace that was
+                # read, or is known to be missing, marks the run ingested.
+                frame = await logs.get_trace_frame(run.run_id, final=True, strict=True)
+                if manifests is not None:
+                    await asyncio.to_thread(manifests.build_run_manifest, run.run_id)
+                count = await self.ingest_run(run, frame)
+            except Exception:
+                await self.session.rollback()
+                logger.exception("Task metrics ingestion failed", extra={"run_id": run.run_id})
+                await self._record_failed_attempt(run.run_id)
+                continue
+            logger.info("Task metrics ingested", extra={"run_id": run.run_id, "tasks": count})
+            ingested += 1
+        return ingested
+
+    async def compare_versions(
+        self,
+        pipeline: str,
+        *,
+        process: str | None = None,
+        versions: Sequence[str] | None = None,
+        min_sample_count: int | None = None,
+        max_sample_count: int | None = None,
+        alpha: float = 0.01,
+        min_change: float = 0.1,
+    ) -> TaskMetricsComparison:
+        """Per-process distributions by pipeline version, flagging significant regressions.
+
+        Each version is tested against the previous one with a Mann-Whitney U test on
+        task realtime and peak RSS; a regression needs ``p < alpha`` and a median
+        increase of at least ``min_change``.
+        """
+        query = select(
+            TaskMetric.run_id,
+            TaskMetric.pipeline_version,
+            TaskMetric.process,
+            TaskMetric.sample_count,
+            TaskMetric.realtime_s,
+            TaskMetric.peak_rss_bytes,
+        ).where(
+            TaskMetric.pipeline == pipeline,
+            TaskMetric.status == _COMPLETED_TASK_STATUS,
+        )
+        if process:
+            query = query.where(TaskMetric.process == process)
+        if versions:
+            query = query.where(TaskMetric.pipeline_version.in_(list(versions)))
+        if min_sample_count is not None:
+            query = query.where(TaskMetric.sample_count >= min_sample_count)
+        if max_sample_count is not None:
+            query = query.where(TaskMetric.sample_count <= max_sample_count)
+        result = await self.session.execute(query)
+        frame = pd.DataFrame(result.all(), columns=list(result.keys()))
+        if frame.empty:
+            return TaskMetricsComparison(pipeline=pipeline, versions=[], stats=[], regressions=[])
+
+        ordered = sorted(frame["pipeline_version"].unique(), key=_version_key)
+        grouped = frame.groupby(["process", "pipeline_version"])
+        table = pd.DataFrame(
+            {
+                "tasks": grouped.size(),
+                "runs": grouped["run_id"].nunique(),
+                "sample_count_min": grouped["sample_count"].min(),
+                "sample_count_max": grouped["sample_count"].max(),
+                "realtime_p50_s": grouped["realtime_s"].quantile(0.5),
+                "realtime_p95_s": grouped["realtime_s"].quantile(0.95),
+                "peak_rss_p50_bytes": grouped["peak_rss_bytes"].quantile(0.5),
+                "peak_rss_p95_bytes": grouped["peak_rss_bytes"].quantile(0.95),
+            }
+        )
+        stats = [
+            ProcessVersionStats(
+                process=name,
+                pipeline_version=version,
+                tasks=int(row["tasks"]),
+                runs=int(row["runs"]),
+                sample_count_min=int(row["sample_count_min"]),
+                sample_count_max=int(row["sample_count_max"]),
+                realtime_p50_s=_optional(row["realtime_p50_s"]),
+                realtime_p95_s=_optional(row["realtime_p95_s"]),
+                peak_rss_p50_bytes=_optional(row["peak_rss_p50_bytes"]),
+                peak_rss_p95_bytes=_optional(row["peak_rss_p95_bytes"]),
+            )
+            for (name, version), row in sorted(
+                table.iterrows(), key=lambda item: (item[0][0], _version_key(item[0][1]))
+            )
+        ]
+
+        regressions: list[MetricRegression] = []
+        samples = {key: group for key, group in grouped}
+        for name in sorted(frame["process"].unique()):
+            present = [version for version in ordered if (name, version) in samples]
+            for baseline, version in zip(present, present[1:]):
+                for metric in _COMPARED_METRICS:
+                    before = samples[(name, baseline)][metric].dropna().to_numpy()
+                    after = samples[(name, version)][metric].dropna().to_numpy()
+                    if len(before) < _MIN_TASKS_PER_SIDE or len(after) < _MIN_TASKS_PER_SIDE:
+                        continue
+                    baseline_median = float(np.median(before))
+                    median = float(np.median(after))
+                    if baseline_median <= 0 or median < baseline_median * (1 + min_change):
+                        continue
+                    _, p_value = mann_whitney_u(before, after)
+                    if p_value >= alpha:
+                        continue
+                    regressions.append(
+                        MetricRegression(
+                            process=name,
+                            metric=metric,
+                            baseline_version=baseline,
+                            pipeline_version=version,
+                            baseline_median=baseline_median,
+                            median=median,
+                            change_percent=100.0 * (median / baseline_median - 1.0),
+                            p_value=p_value,
+                        )
+                    )
+        return TaskMetricsComparison(
+            pipeline=pipeline, versions=list(ordered), stats=stats, regressions=regressions
+        )
+
+
+async def ingest_task_metrics(
+    database: DatabaseService,
+    storage: StorageService,
+    settings: object,
+) -> int:
+    """One sweep over settled runs: task metrics and results manifests.
+
+    Scheduled from the app lifespan.
+    """
+    logs = LogService.create(storage, settings)
+    ingested = 0
+    async for session in database.get_session():
+        ingested = await TaskMetricsService.create(session).ingest_pending(logs, manifests=storage)
+    return ingested
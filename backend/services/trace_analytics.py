@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+# Columns we add to trace.txt via nextflow.config; older runs may only have the defaults.
+_DURATION_COLUMNS = ("duration", "realtime")
+_MEMORY_COLUMNS = ("memory", "peak_rss", "peak_vmem", "rchar", "wchar")
+_PERCENT_COLUMNS = ("%cpu", "%mem")
+_TIME_COLUMNS = ("submit", "start", "complete")
+_NUMBER_COLUMNS = ("cpus", "attempt", "exit")
+
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+_MEMORY_UNITS = {
+    "": 1,
+    "B": 1,
+    "KB": 1024,
+    "MB": 1024**2,
+    "GB": 1024**3,
+    "TB": 1024**4,
+    "PB": 1024**5,
+}
+_DURATION_RE = r"(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>ms|d|h|m|s)"
+_MEMORY_RE = r"^\s*(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>[KMGTP]?B)?\s*$"
+
+_FAILED_STATUSES = ("FAILED", "ABORTED")
+_SUCCESS_STATUSES = ("COMPLETED", "CACHED")
+
+
+def _blank_to_nan(series: pd.Series) -> pd.Series:
+    return series.replace({"-": np.nan, "": np.nan})
+
+
+def parse_durations(series: pd.Series) -> pd.Series:
+    """Nextflow durations (``1h 2m 3s``, ``350ms``, or raw milliseconds) as seconds."""
+    series = _blank_to_nan(series)
+    raw = pd.to_numeric(series, errors="coerce") / 1000.0
+    parts = series.dropna().astype(str).str.extractall(_DURATION_RE)
+    if parts.empty:
+        return raw
+    seconds = parts["value"].astype(float) * parts["unit"].map(_DURATION_UNITS)
+    parsed = seconds.groupby(level=0).sum().reindex(series.index)
+    return raw.fillna(parsed)
+
+
+def parse_memory(series: pd.Series) -> pd.Series:
+    """Nextflow memory sizes (``1.5 GB`` or raw bytes) as bytes."""
+    parts = _blank_to_nan(series).astype("string").str.extract(_MEMORY_RE)
+    factor = parts["unit"].fillna("").map(_MEMORY_UNITS)
+    return parts["value"].astype(float) * factor
+
+
+def parse_percent(series: pd.Series) -> pd.Series:
+    values = _blank_to_nan(series).astype("string").str.rstrip("%")
+    return pd.to_numeric(values, errors="coerce").astype("float64")
+
+
+def parse_timestamps(series: pd.Series) -> pd.Series:
+    series = _blank_to_nan(series)
+    raw = pd.to_numeric(series, errors="coerce")
+    if raw.notna().any():
+        return pd.to_datetime(raw, unit="ms", utc=True)
+    return pd.to_datetime(series, errors="coerce", utc=True, format="mixed")
+
+
+def trace_frame(header: list[str], rows: Iterable[list[str]]) -> pd.DataFrame:
+    """Build a typed DataFrame from raw trace rows, one row per task attempt."""
+    records = [row[: len(header)] + [""] * (len(header) - len(row)) for row in rows]
+    raw = pd.DataFrame.from_records(records, columns=header)
+    frame = pd.DataFrame(index=raw.index)
+
+    frame["hash"] = raw["hash"] if "hash" in raw else raw.get("task_id", "")
+    frame["name"] = raw["name"] if "name" in raw else ""
+    if "process" in raw:
+        frame["process"] = raw["process"]
+    else:
+        frame["process"] = frame["name"].astype(str).str.split(" (", n=1, regex=False).str[0]
+    frame["status"] = raw["status"] if "status" in raw else ""
+    for column in _DURATION_COLUMNS:
+        frame[f"{column}_s"] = parse_durations(raw[column]) if column in raw else np.nan
+    for column in _MEMORY_COLUMNS:
+        frame[f"{column}_bytes"] = parse_memory(raw[column]) if column in raw else np.nan
+    for column in _PERCENT_COLUMNS:
+        name = column.lstrip("%") + "_percent"
+        frame[name] = parse_percent(raw[column]) if column in raw else np.nan
+    for column in _TIME_COLUMNS:
+        frame[column] = parse_timestamps(raw[column]) if column in raw else pd.NaT
+    for column in _NUMBER_COLUMNS:
+        frame[column] = (
+            pd.to_numeric(_blank_to_nan(raw[column]), errors="coerce") if column in raw else np.nan
+        )
+    return frame
+
+
+def _optional(value: Any) -> float | None:
+    if value is None or pd.isna(value):
+        return None
+    return float(value)
+
+
+def process_rollups(frame: pd.DataFrame) -> list[dict[str, Any]]:
+    """Per-process task counts, duration percentiles, CPU-hours and memory headroom."""
+    if frame.empty:
+        return []
+    frame = frame.assign(
+        failed=frame["status"].isin(_FAILED_STATUSES),
+        succeeded=frame["status"].isin(_SUCCESS_STATUSES),
+        retried=frame["attempt"].fillna(1) > 1,
+        cpu_seconds=frame["realtime_s"] * frame["cpu_percent"] / 100.0,
+        headroom=100.0 * (1.0 - frame["peak_rss_bytes"] / frame["memory_bytes"]),
+    )
+    grouped = frame.groupby("process", sort=False)
+    rollup = pd.DataFrame(
+        {
+            "tasks": grouped.size(),
+            "succeeded": grouped["succeeded"].sum(),
+            "failed": grouped["failed"].sum(),
+            "retries": grouped["retried"].sum(),
+            "duration_p50_s": grouped["duration_s"].quantile(0.5),
+            "duration_p95_s": grouped["duration_s"].quantile(0.95),
+            "realtime_total_s": grouped["realtime_s"].sum(min_count=1),
+            "cpu_hours": grouped["cpu_seconds"].sum(min_count=1) / 3600.0,
+            "peak_rss_max_bytes": grouped["peak_rss_bytes"].max(),
+            "memory_requested_bytes": grouped["memory_bytes"].max(),
+            # Tightest task: the smallest gap between peak RSS and its own request.
+            "memory_headroom_percent": grouped["headroom"].min(),
+            "read_bytes": grouped["rchar_bytes"].sum(min_count=1),
+            "write_bytes": grouped["wchar_bytes"].sum(min_count=1),
+        }
+    )
+    rollup = rollup.sort_values("realtime_total_s", ascending=False, na_position="last")
+
+    results: list[dict[str, Any]] = []
+    for process, row in rollup.iterrows():
+        results.append(
+            {
+                "process": str(process),
+                "tasks": int(row["tasks"]),
+                "succeeded": int(row["succeeded"]),
+                "failed": int(row["failed"]),
+                "retries": int(row["retries"]),
+                "duration_p50_s": _optional(row["duration_p50_s"]),
+                "duration_p95_s": _optional(row["duration_p95_s"]),
+                "realtime_total_s": _optional(row["realtime_total_s"]),
+                "cpu_hours": _optional(row["cpu_hours"]),
+                "peak_rss_max_bytes": _optional(row["peak_rss_max_bytes"]),
+                "memory_requested_bytes": _optional(row["memory_requested_bytes"]),
+                "memory_headroom_percent": _optional(row["memory_headroom_percent"]),
+                "read_bytes": _optional(row["read_bytes"]),
+                "write_bytes": _optional(row["write_bytes"]),
+            }
+        )
+    return results
+
+
+def _seconds(delta: pd.Series) -> pd.Series:
+    return delta.dt.total_seconds()
+
+
+def timeline_analysis(
+    frame: pd.DataFrame,
+    *,
+    max_points: int = 200,
+    top_n: int = 10,
+) -> dict[str, Any]:
+    """Queue wait, estimated critical path and concurrency from task intervals.
+
+    The trace has no dependency graph, so the critical path is estimated by walking
+    back from the last task to finish: each step takes the latest task that completed
+    before the current one was submitted.
+    """
+    tasks = frame[frame["start"].notna() & frame["complete"].notna()].copy()
+    empty: dict[str, Any] = {
+        "wall_clock_s": None,
+        "critical_path_s": None,
+        "critical_path": [],
+        "critical_path_by_process": [],
+        "peak_concurrency": 0,
+        "mean_concurrency": None,
+        "concurrency": [],
+        "queue_bottlenecks": [],
+    }
+    if tasks.empty:
+        return empty
+
+    tasks["submit"] = tasks["submit"].fillna(tasks["start"])
+    tasks["queue_wait_s"] = _seconds(tasks["start"] - tasks["submit"]).clip(lower=0)
+    tasks["run_s"] = _seconds(tasks["complete"] - tasks["start"]).clip(lower=0)
+    origin = tasks["submit"].min()
+    wall_clock_s = (tasks["complete"].max() - origin).total_seconds()
+
+    # Critical path: repeatedly jump to the latest completion at or before our submit.
+    tasks = tasks.sort_values("complete", kind="stable").reset_index(drop=True)
+    completes = tasks["complete"].to_numpy()
+    submits = tasks["submit"].to_numpy()
+    path: list[int] = []
+    current = len(tasks) - 1
+    while current >= 0:
+        path.append(current)
+        current = int(np.searchsorted(completes, submits[current], side="right")) - 1
+        if current >= path[-1]:
+            current = path[-1] - 1
+    path.reverse()
+    chain = tasks.iloc[path]
+    critical_path_s = (chain["complete"].iloc[-1] - chain["submit"].iloc[0]).total_seconds()
+    chain_seconds = chain["queue_wait_s"] + chain["run_s"]
+    by_process = chain_seconds.groupby(chain["process"]).sum().sort_values(ascending=False)
+
+    # Concurrency sweep: +1 at each start, -1 at each completion.
+    events = pd.concat(
+        [
+            pd.Series(1, index=tasks["start"].to_numpy()),
+            pd.Series(-1, index=tasks["complete"].to_numpy()),
+        ]
+    ).sort_index(kind="stable")
+    running = events.groupby(level=0).sum().cumsum()
+    durations = np.diff(running.index.to_numpy()).astype("timedelta64[ms]").astype(float)
+    span = durations.sum()
+    mean_concurrency = float((running.to_numpy()[:-1] * durations).sum() / span) if span else None
+    step = max(1, int(np.ceil(len(running) / max_points)))
+    points = running.iloc[::step]
+
+    queue = tasks.groupby("process")["queue_wait_s"]
+    bottlenecks = pd.DataFrame(
+        {
+            "tasks": queue.size(),
+            "queue_wait_p50_s": queue.quantile(0.5),
+            "queue_wait_p95_s": queue.quantile(0.95),
+            "queue_wait_total_s": queue.sum(),
+        }
+    ).sort_values("queue_wait_p95_s", ascending=False)
+
+    return {
+        "wall_clock_s": wall_clock_s,
+        "critical_path_s": critical_path_s,
+        "critical_path": [
+            {
+                "name": str(row["name"]),
+                "process": str(row["process"]),
+                "submit": row["submit"].to_pydatetime(),
+                "start": row["start"].to_pydatetime(),
+                "complete": row["complete"].to_pydatetime(),
+                "queue_wait_s": float(row["queue_wait_s"]),
+                "run_s": float(row["run_s"]),
+            }
+            for _, row in chain.iterrows()
+        ],
+        "critical_path_by_process": [
+            {
+                "process": str(process),
+                "seconds": float(seconds),
+                "share": float(seconds / critical_path_s) if critical_path_s else None,
+            }
+            for process, seconds in by_process.items()
+        ],
+        "peak_concurrency": int(running.max()),
+        "mean_concurrency": mean_concurrency,
+        "concurrency": [
+            {"time": pd.Timestamp(time).to_pydatetime(), "running": int(count)}
+            for time, count in points.items()
+        ],
+        "queue_bottlenecks": [
+            {
+                "process": str(process),
+                "tasks": int(row["tasks"]),
+                "queue_wait_p50_s": float(row["queue_wait_p50_s"]),
+                "queue_wait_p95_s": float(row["queue_wait_p95_s"]),
+                "queue_wait_total_s": float(row["queue_wait_total_s"]),
+            }
+            for process, row in bottlenecks.head(top_n).iterrows()
+        ],
+    }
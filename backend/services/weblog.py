@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from backend.services.database import DatabaseService
+from backend.services.runs import RunStoreService
+
+logger = logging.getLogger(__name__)
+
+# Nextflow weblog events that describe a task; workflow-level events are left to the
+# status hooks in nextflow.config.template.
+_TASK_EVENTS = {"process_submitted", "process_started", "process_completed"}
+
+
+def _attempt(trace: dict[str, Any]) -> int:
+    try:
+        return int(trace.get("attempt") or 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+@dataclass
+class _RunTally:
+    """Counter deltas since the last flush.
+
+    Deltas rather than totals, so replicas that each receive part of a run's events
+    can all flush without overwriting one another.
+    """
+
+    submitted: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    cached: int = 0
+    first_failure: dict[str, Any] | None = None
+    last_event_at: str | None = None
+
+    def record(self, event: str, trace: dict[str, Any], utc_time: str | None) -> None:
+        status = str(trace.get("status") or "").upper()
+        error_action = str(trace.get("error_action") or trace.get("errorAction") or "").upper()
+        if event == "process_submitted":
+            # Each retry gets a new task_id and hash, so count a task at its first attempt.
+            if _attempt(trace) == 1:
+                self.submitted += 1
+        elif event == "process_started":
+            self.running += 1
+        elif status == "CACHED":
+            self.cached += 1
+        else:
+            self.running -= 1
+            if status == "COMPLETED":
+                self.completed += 1
+            elif error_action == "RETRY":
+                pass
+            elif error_action == "IGNORE":
+                # The pipeline carries on without it; the task is done, not failed.
+                self.completed += 1
+            elif status in {"FAILED", "ABORTED"}:
+                self.failed += 1
+                if self.first_failure is None:
+                    self.first_failure = {
+                        "process": trace.get("process"),
+                        "name": trace.get("name"),
+                        "exit": trace.get("exit"),
+                        "time": utc_time,
+                    }
+        self.last_event_at = utc_time or self.last_event_at
+
+    def apply(self, metrics: dict[str, Any] | None) -> dict[str, Any]:
+        merged = dict(metrics or {})
+        for key, delta in (
+            ("tasks_submitted", self.submitted),
+            ("tasks_failed", self.failed),
+            ("tasks_cached", self.cached),
+        ):
+            merged[key] = int(merged.get(key) or 0) + delta
+        # Left unclamped: another replica's matching starts may not have flushed yet.
+        # Readers clamp it through run_task_counts.
+        merged["tasks_running"] = int(merged.get("tasks_running") or 0) + self.running
+        # Cached tasks count as done so resumed runs start from their real progress.
+        merged["tasks_completed"] = (
+            int(merged.get("tasks_completed") or 0) + self.completed + self.cached
+        )
+        merged["tasks_total"] = merged["tasks_submitted"] + merged["tasks_cached"]
+        if self.first_failure is not None and not merged.get("first_failure"):
+            merged["first_failure"] = self.first_failure
+        if self.last_event_at:
+            merged["weblog_updated_at"] = self.last_event_at
+        return merged
+
+
+@dataclass
+class WeblogAggregator:
+    """Accumulates Nextflow weblog task events per run and flushes them to runs.metrics."""
+
+    _tallies: dict[str, _RunTally] = field(default_factory=dict)
+    received: int = 0
+    flushes: int = 0
+
+    def ingest(self, run_id: str, events: Iterable[dict[str, Any]]) -> int:
+        accepted = 0
+        for event in events:
+            name = event.get("event")
+            trace = event.get("trace")
+            if name not in _TASK_EVENTS or not isinstance(trace, dict):
+                continue
+            self._tallies.setdefault(run_id, _RunTally()).record(name, trace, event.get("utcTime"))
+            accepted += 1
+        self.received += accepted
+        return accepted
+
+    async def flush(self, database: DatabaseService, settings: object) -> int:
+        """Write pending deltas; runs that fail to flush keep theirs for the next try."""
+        tallies, self._tallies = self._tallies, {}
+        flushed = 0
+        for run_id, tally in tallies.items():
+            try:
+                async for session in database.get_session():
+                    # Runs that no longer exist are dropped rather than retried.
+                    flushed += await RunStoreService.create(session, settings).update_run_metrics(
+                        run_id, tally.apply, timestamp=datetime.now(timezone.utc)
+                    )
+            except Exception:
+                logger.exception("Weblog metrics flush failed", extra={"run_id": run_id})
+                self._merge_back(run_id, tally)
+        self.flushes += 1
+        return flushed
+
+    def _merge_back(self, run_id: str, tally: _RunTally) -> None:
+        newer = self._tallies.get(run_id)
+        if newer is None:
+            self._tallies[run_id] = tally
+            return
+        for name in ("submitted", "running", "completed", "failed", "cached"):
+            setattr(newer, name, getattr(newer, name) + getattr(tally, name))
+        newer.first_failure = tally.first_failure or newer.first_failure
+        newer.last_event_at = newer.last_event_at or tally.last_event_at
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending_runs": len(self._tallies),
+            "received": self.received,
+            "flushes": self.flushes,
+        }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from types import SimpleNamespace
 
 import pytest
@@ -11,6 +12,7 @@ from backend.services.batch import (
     BatchQuotaExceededError,
     BatchService,
 )
+from backend.utils.auth import weblog_token
 
 
 class _Exceptions:
@@ -142,6 +144,7 @@ class _Client:
         self.created_jobs: list[tuple[str, _Job, str]] = []
         self.jobs: dict[str, _Job] = {}
         self.create_side_effects: list[Exception] = []
+        self.list_requests: list[SimpleNamespace] = []
 
     def create_job(self, *, request=None, parent: str | None = None, job=None, job_id=None) -> _Job:
         if request is not None:
@@ -161,6 +164,14 @@ class _Client:
             raise _Exceptions.NotFound("missing")
         return self.jobs[job_name]
 
+    def list_jobs(self, *, request):
+        self.list_requests.append(request)
+        return [
+            job
+            for name, job in self.jobs.items()
+            if name.startswith(f"{request.parent}/") and job.labels.get("app") == "arc-reactor"
+        ]
+
     def delete_job(self, *, request=None, name: str | None = None):
         job_name = request.name if request is not None else name
         if job_name not in self.jobs:
@@ -183,6 +194,7 @@ class _BatchV1:
     CreateJobRequest = SimpleNamespace
     GetJobRequest = SimpleNamespace
     DeleteJobRequest = SimpleNamespace
+    ListJobsRequest = SimpleNamespace
 
 
 def _service(client: _Client) -> BatchService:
@@ -229,6 +241,24 @@ def test_submit_orchestrator_job_builds_job(monkeypatch) -> None:
     assert env["PIPELINE_VERSION"] == "2.7.1"
     assert env["IS_RECOVERY"] == "false"
     assert env["DATABASE_URL"].startswith("postgresql+asyncpg://")
+    assert "WEBLOG_URL" not in env
+
+    service.weblog_base_url = "https://arc.example.org/"
+    service.weblog_secret = "s3cret"
+    service.submit_orchestrator_job(
+        run_id="run-456",
+        pipeline="nf-core/scrnaseq",
+        pipeline_version="2.7.1",
+        config_gcs_path="gs://bucket/runs/run-456/inputs/nextflow.config",
+        params_gcs_path="gs://bucket/runs/run-456/inputs/params.yaml",
+        work_dir="gs://bucket/runs/run-456/work/",
+        is_recovery=False,
+        user_email="dev@arc.org",
+    )
+    env = client.created_jobs[1][1].task_groups[0].task_spec.environment.variables
+    assert env["WEBLOG_URL"] == (
+        "https://arc.example.org/api/runs/run-456/weblog?token=" + weblog_token("s3cret", "run-456")
+    )
 
 
 def test_get_job_status_maps_state(monkeypatch) -> None:
@@ -249,6 +279,40 @@ def test_get_job_status_maps_state(monkeypatch) -> None:
     assert status["status_events"][0]["description"] == "Started"
 
 
+def test_list_jobs_filters_by_app_label_in_region(monkeypatch) -> None:
+    monkeypatch.setattr(batch_service, "batch_v1", _BatchV1)
+    monkeypatch.setattr(batch_service, "gcp_exceptions", _Exceptions)
+
+    client = _Client()
+    service = _service(client)
+    for name, labels, state in (
+        ("projects/proj/locations/us-east1/jobs/nf-run-1", {"app": "arc-reactor"}, "FAILED"),
+        ("projects/proj/locations/us-east1/jobs/other", {"app": "other"}, "RUNNING"),
+        ("projects/proj/locations/us-west1/jobs/nf-run-2", {"app": "arc-reactor"}, "RUNNING"),
+    ):
+        job = _Job(task_groups=[], allocation_policy=None, logs_policy=None, labels=labels)
+        job.name = name
+        job.status = _JobStatus(state, [_StatusEvent("ERROR", "Exit 1")])
+        client.jobs[name] = job
+
+    jobs = service.list_jobs(region="us-east1")
+
+    assert list(jobs) == ["projects/proj/locations/us-east1/jobs/nf-run-1"]
+    assert jobs["projects/proj/locations/us-east1/jobs/nf-run-1"]["run_status"] == "failed"
+    assert client.list_requests[0].filter == 'labels.app="arc-reactor"'
+
+    service.list_jobs(
+        region="us-east1",
+        states=("SUCCEEDED", "FAILED"),
+        created_after=datetime(2026, 10, 1, 12, tzinfo=timezone.utc),
+    )
+    assert client.list_requests[1].filter == (
+        'labels.app="arc-reactor" AND status.state:(SUCCEEDED OR FAILED)'
+        ' AND create_time>="2026-10-01T12:00:00Z"'
+    )
+    assert batch_service.job_region("projects/proj/locations/us-west1/jobs/x") == "us-west1"
+
+
 def test_cancel_job_handles_missing(monkeypatch) -> None:
     monkeypatch.setattr(batch_service, "batch_v1", _BatchV1)
     monkeypatch.setattr(batch_service, "gcp_exceptions", _Exceptions)
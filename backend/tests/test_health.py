@@ -5,11 +5,20 @@ from fastapi.testclient import TestClient
 from backend.dependencies import (
     get_benchling_service,
     get_breakers,
+    get_current_user_context,
     get_database_service,
     get_gemini_service,
+    get_run_status_listener,
+    get_scheduler,
     get_storage_service,
+    get_stream_broker,
+    get_weblog_aggregator,
 )
 from backend.main import app
+from backend.services.scheduler import Scheduler
+from backend.services.streams import StreamBroker
+from backend.services.weblog import WeblogAggregator
+from backend.utils.auth import UserContext
 from backend.utils.circuit_breaker import Breakers
 from circuitbreaker import CircuitBreaker
 
@@ -64,3 +73,39 @@ def test_readiness_endpoint(monkeypatch) -> None:
         assert payload["degraded"] is False
     finally:
         app.dependency_overrides.clear()
+
+
+class _DummyDatabase:
+    def pool_stats(self) -> dict[str, int]:
+        return {"size": 5, "checkedin": 4, "checkedout": 1, "overflow": -4}
+
+
+def test_metrics_endpoint_reports_pool_occupancy() -> None:
+    app.dependency_overrides[get_database_service] = lambda: _DummyDatabase()
+    app.dependency_overrides[get_stream_broker] = lambda: StreamBroker()
+    app.dependency_overrides[get_run_status_listener] = lambda: None
+    app.dependency_overrides[get_scheduler] = lambda: Scheduler()
+    app.dependency_overrides[get_weblog_aggregator] = lambda: WeblogAggregator()
+    app.dependency_overrides[get_current_user_context] = lambda: UserContext(
+        email="user@arc.org", name="User"
+    )
+
+    client = TestClient(app)
+    try:
+        assert client.get("/metrics").status_code == 404
+        assert client.get("/api/metrics").status_code == 403
+
+        app.dependency_overrides[get_current_user_context] = lambda: UserContext(
+            email="admin@arc.org", name="Admin", is_admin=True
+        )
+        response = client.get("/api/metrics")
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload["database_pool"]["checkedout"] == 1
+        assert payload["streams"] == {"streams": 0, "subscribers": 0}
+        assert payload["run_status_listener"] is False
+        assert "hits" in payload["trace_cache"]
+        assert payload["scheduler"] == {"leader": False, "jobs": {}}
+        assert payload["weblog"]["pending_runs"] == 0
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.services.local_storage import LocalStorageClient
+from backend.services.storage import StorageService
+
+
+@pytest.fixture
+def service(tmp_path) -> StorageService:
+    client = LocalStorageClient(tmp_path)
+    client.create_bucket("arc-reactor-runs")
+    return StorageService(client=client, bucket_name="arc-reactor-runs")
+
+
+def test_upload_and_ranged_reads(service: StorageService) -> None:
+    uri = service.upload_run_file("run-1", "samplesheet.csv", "sample,fastq_1\n", "a@b.org")
+
+    assert service.download_file(uri) == b"sample,fastq_1\n"
+    assert service.download_range(uri, 7, 13) == b"fastq_1"
+    assert service.download_range(uri, 7) == b"fastq_1\n"
+
+    blob = service.client.bucket("arc-reactor-runs").get_blob("runs/run-1/inputs/samplesheet.csv")
+    assert blob.metadata["user-email"] == "a@b.org"
+
+
+def test_generation_and_checksum_change_on_overwrite(service: StorageService) -> None:
+    uri = service.upload_run_file("run-1", "params.yaml", "a: 1\n", "a@b.org")
+    first = service.get_file_metadata(uri)
+    service.upload_run_file("run-1", "params.yaml", "a: 2\n", "a@b.org")
+    second = service.get_file_metadata(uri)
+
+    assert first["size"] == second["size"] == 5
+    assert second["generation"] > first["generation"]
+    assert first["crc32c"] != second["crc32c"]
+    assert service.get_file_metadata("gs://arc-reactor-runs/runs/run-1/inputs/missing") is None
+
+
+def test_list_directory_with_delimiter_and_pages(service: StorageService) -> None:
+    for name in ("b.txt", "a.txt", "multiqc/report.html", "star/s1.bam", "star/s2.bam"):
+        service.upload_run_file("run-1", name, "x", "a@b.org")
+
+    first = service.list_directory("runs/run-1/inputs/", page_size=3)
+    assert [item["name"] for item in first["files"]] == [
+        "runs/run-1/inputs/a.txt",
+        "runs/run-1/inputs/b.txt",
+    ]
+    assert first["directories"] == ["runs/run-1/inputs/multiqc/"]
+
+    second = service.list_directory(
+        "runs/run-1/inputs/", page_size=3, page_token=first["next_page_token"]
+    )
+    assert second["files"] == []
+    assert second["directories"] == ["runs/run-1/inputs/star/"]
+    assert second["next_page_token"] is None
+
+    recursive = service.list_files("runs/run-1/inputs/star/")
+    assert [item["name"] for item in recursive] == [
+        "runs/run-1/inputs/star/s1.bam",
+        "runs/run-1/inputs/star/s2.bam",
+    ]
+
+
+def test_delete_and_existence(service: StorageService) -> None:
+    uri = service.upload_run_file("run-1", "nested/file.txt", "x", "a@b.org")
+
+    assert service.files_exist([uri]) == {uri: True}
+    assert service.check_work_dir_exists("run-1") is False
+    assert service.delete_run_file("run-1", "inputs/nested/file.txt") is True
+    assert service.delete_run_file("run-1", "inputs/nested/file.txt") is False
+    assert service.files_exist([uri]) == {uri: False}
+    assert service.list_directory("runs/run-1/")["directories"] == []
+
+
+def test_create_selects_local_backend(tmp_path) -> None:
+    class _Settings:
+        nextflow_bucket = "arc-reactor-runs"
+        storage_backend = "local"
+        local_storage_root = str(tmp_path)
+
+    service = StorageService.create(_Settings())
+
+    assert isinstance(service.client, LocalStorageClient)
+    assert service.health_check() is True
+    assert service.generate_signed_url("gs://arc-reactor-runs/runs/x").startswith("file://")
+
+
+def test_copy_run_inputs_only_uploads_overrides(service: StorageService) -> None:
+    service.upload_run_files(
+        "parent",
+        {
+            "samplesheet.csv": "sample,fastq_1\nA,gs://a\n",
+            "nextflow.config": "process {}\n",
+            "params.yaml": "genome: GRCh38\n",
+        },
+        "parent@b.org",
+    )
+
+    uris = service.copy_run_inputs(
+        "parent", "child", "child@b.org", overrides={"params.yaml": "genome: GRCm39\n"}
+    )
+
+    assert uris == [
+        "gs://arc-reactor-runs/runs/child/inputs/samplesheet.csv",
+        "gs://arc-reactor-runs/runs/child/inputs/nextflow.config",
+        "gs://arc-reactor-runs/runs/child/inputs/params.yaml",
+    ]
+    assert service.download_file(uris[0]) == b"sample,fastq_1\nA,gs://a\n"
+    assert service.download_file(uris[2]) == b"genome: GRCm39\n"
+    source = service.get_file_metadata("gs://arc-reactor-runs/runs/parent/inputs/samplesheet.csv")
+    copied = service.get_file_metadata(uris[0])
+    assert copied["crc32c"] == source["crc32c"]
+    blob = service.client.bucket("arc-reactor-runs").get_blob("runs/child/inputs/samplesheet.csv")
+    assert blob.metadata["run-id"] == "child"
+    assert blob.metadata["user-email"] == "child@b.org"
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import logs as logs_module
+from backend.services.logs import LogService
+
+
+class _StorageStub:
+    def __init__(self, bucket_name: str = "arc-reactor-runs") -> None:
+        self.bucket_name = bucket_name
+        self.objects: dict[str, bytes] = {}
+        self.generations: dict[str, int] = {}
+        self.range_reads: list[tuple[str, int, int | None]] = []
+        self.full_reads: list[str] = []
+
+    def put(self, gcs_uri: str, content: bytes) -> None:
+        self.objects[gcs_uri] = content
+        self.generations[gcs_uri] = self.generations.get(gcs_uri, 0) + 1
+
+    def get_file_metadata(self, gcs_uri: str):
+        if gcs_uri not in self.objects:
+            return None
+        return {
+            "name": gcs_uri,
+            "size": len(self.objects[gcs_uri]),
+            "generation": self.generations[gcs_uri],
+        }
+
+    def download_range(self, gcs_uri: str, start: int, end: int | None = None) -> bytes:
+        self.range_reads.append((gcs_uri, start, end))
+        data = self.objects[gcs_uri]
+        return data[start : (end + 1) if end is not None else None]
+
+    def get_file_content(self, gcs_uri: str, text: bool = True):
+        self.full_reads.append(gcs_uri)
+        data = self.objects[gcs_uri]
+        return data.decode("utf-8") if text else data
+
+
+class _LoggingClientStub:
+    def __init__(self) -> None:
+        self.entries: list[SimpleNamespace] = []
+        self.filters: list[str] = []
+
+    def add(self, seconds: int, insert_id: str, stream: str, payload: str) -> None:
+        self.entries.append(
+            SimpleNamespace(
+                timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=seconds),
+                insert_id=insert_id,
+                labels={"stream": stream},
+                payload=payload,
+            )
+        )
+
+    def list_entries(self, order_by: str, filter_: str, page_size: int | None = None):
+        self.filters.append(filter_)
+        self.yielded = 0
+        ordered = sorted(self.entries, key=lambda entry: (entry.timestamp, entry.insert_id))
+        for entry in ordered if order_by == "timestamp asc" else reversed(ordered):
+            self.yielded += 1
+            yield entry
+
+
+@pytest.fixture(autouse=True)
+def _clear_trace_cache():
+    logs_module._TRACE_CACHE.clear()
+    yield
+    logs_module._TRACE_CACHE.clear()
+
+
+@pytest.mark.asyncio
+async def test_stream_workflow_log_reads_only_appended_bytes() -> None:
+    storage = _StorageStub()
+    service = LogService(storage=storage, project_id=None)
+    path = "gs://arc-reactor-runs/runs/run-1/logs/nextflow.log"
+    storage.put(path, b"first line\nsecond ")
+
+    stream = service.stream_workflow_log("run-1", poll_interval=0)
+    entry = await stream.__anext__()
+    assert entry.message == "first line"
+
+    storage.put(path, b"first line\nsecond line\nthird line\n")
+    second = await stream.__anext__()
+    third = await stream.__anext__()
+    await stream.aclose()
+
+    assert [second.message, third.message] == ["second line", "third line"]
+    assert storage.range_reads[-1] == (path, 18, 33)
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_revalidates_by_generation(monkeypatch) -> None:
+    storage = _StorageStub()
+    service = LogService(storage=storage, project_id=None)
+    path = "gs://arc-reactor-runs/runs/run-1/logs/trace.txt"
+    storage.put(
+        path,
+        b"task_id\thash\tname\tprocess\tstatus\n1\tab/cdef12\tSTAR (A)\tSTAR\tCOMPLETED\n",
+    )
+    monkeypatch.setattr(logs_module, "_TRACE_TTL", logs_module.timedelta(0))
+
+    tasks = await service.list_tasks("run-1")
+    assert [task.process for task in tasks] == ["STAR"]
+
+    again = await service.list_tasks("run-1")
+    assert again == tasks
+    assert storage.range_reads == [(path, 0, 68)]
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_parses_appended_rows_and_merges_by_hash(monkeypatch) -> None:
+    storage = _StorageStub()
+    service = LogService(storage=storage, project_id=None)
+    path = "gs://arc-reactor-runs/runs/run-1/logs/trace.txt"
+    monkeypatch.setattr(logs_module, "_TRACE_TTL", logs_module.timedelta(0))
+    header = b"task_id\thash\tname\tstatus\texit\n"
+    first = b"1\tab/cdef12\tFASTQC (A)\tRUNNING\t-\n2\tcd/ef3456\tFASTQC (B)\tCO"
+    storage.put(path, header + first)
+
+    tasks = await service.list_tasks("run-1")
+    assert [(task.name, task.status) for task in tasks] == [("FASTQC (A)", "RUNNING")]
+
+    storage.put(path, header + first + b"MPLETED\t0\n1\tab/cdef12\tFASTQC (A)\tCOMPLETED\t0\n")
+    tasks = await service.list_tasks("run-1")
+
+    assert [(task.name, task.status, task.exit_code) for task in tasks] == [
+        ("FASTQC (A)", "COMPLETED", 0),
+        ("FASTQC (B)", "COMPLETED", 0),
+    ]
+    assert storage.range_reads[-1][1] == len(header + first)
+    assert not storage.full_reads
+
+
+@pytest.mark.asyncio
+async def test_trace_cache_keeps_settled_runs_and_evicts_lru(monkeypatch) -> None:
+    storage = _StorageStub()
+    service = LogService(storage=storage, project_id=None)
+    monkeypatch.setattr(logs_module, "_TRACE_CACHE", logs_module.TraceCache(max_entries=2))
+    monkeypatch.setattr(logs_module, "_TRACE_TTL", logs_module.timedelta(0))
+    for run_id in ("run-1", "run-2", "run-3"):
+        storage.put(
+            f"gs://arc-reactor-runs/runs/{run_id}/logs/trace.txt",
+            b"task_id\tprocess\n1\tSTAR\n",
+        )
+
+    await service.list_tasks("run-1", final=True)
+    await service.list_tasks("run-1", final=True)
+    await service.list_tasks("run-2")
+    await service.list_tasks("run-2")
+    await service.list_tasks("run-3")
+
+    stats = logs_module._TRACE_CACHE.stats()
+    assert stats["hits"] == 1
+    assert stats["revalidations"] == 1
+    assert stats["appends"] == 0
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 1
+    assert logs_module._TRACE_CACHE.get("run-1") is None
+    assert logs_module._TRACE_CACHE.get("run-3") is not None
+
+
+@pytest.mark.asyncio
+async def test_stream_log_archive_streams_present_files(monkeypatch) -> None:
+    storage = _StorageStub()
+    service = LogService(storage=storage, project_id=None)
+    monkeypatch.setattr(logs_module, "_ARCHIVE_CHUNK_SIZE", 4)
+    log_root = "gs://arc-reactor-runs/runs/run-1/logs"
+    storage.put(f"{log_root}/nextflow.log", b"launching pipeline\n")
+    storage.put(f"{log_root}/trace.txt", b"task_id\thash\n")
+    storage.put(f"{log_root}/report.html", b"")
+
+    chunks = [chunk async for chunk in service.stream_log_archive("run-1")]
+
+    assert len(chunks) > 1
+    assert not storage.full_reads
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.namelist() == ["nextflow.log", "trace.txt", "report.html"]
+        assert archive.read("nextflow.log") == b"launching pipeline\n"
+        assert archive.read("trace.txt") == b"task_id\thash\n"
+        assert archive.read("report.html") == b""
+
+
+@pytest.mark.asyncio
+async def test_stream_task_logs_tails_from_cursor(monkeypatch) -> None:
+    client = _LoggingClientStub()
+    monkeypatch.setitem(logs_module._LOGGING_CLIENTS, "proj", client)
+    service = LogService(storage=_StorageStub(), project_id="proj")
+    client.add(0, "a", "stdout", "start")
+    client.add(1, "b", "stderr", "warn")
+
+    stream = service.stream_task_logs("run-1", "ab/cdef12", poll_interval=0)
+    first = [await stream.__anext__(), await stream.__anext__()]
+    client.add(1, "c", "stdout", "same second")
+    client.add(2, "d", "stdout", "done")
+    later = [await stream.__anext__(), await stream.__anext__()]
+    await stream.aclose()
+
+    assert [(entry.stream, entry.message) for entry in first] == [
+        ("stdout", "start"),
+        ("stderr", "warn"),
+    ]
+    assert [entry.message for entry in later] == ["same second", "done"]
+    assert 'labels.stream=("stdout" OR "stderr")' in client.filters[0]
+    assert 'timestamp>="2025-01-01T00:00:01+00:00"' in client.filters[-1]
+
+
+@pytest.mark.asyncio
+async def test_get_task_logs_returns_tail_in_one_query(monkeypatch) -> None:
+    client = _LoggingClientStub()
+    monkeypatch.setitem(logs_module._LOGGING_CLIENTS, "proj", client)
+    service = LogService(storage=_StorageStub(), project_id="proj")
+    for second in range(100):
+        client.add(second, f"{second:03d}", "stderr" if second % 10 == 0 else "stdout", str(second))
+
+    logs = await service.get_task_logs("run-1", "ab/cdef12", tail=12)
+
+    assert logs.stdout.splitlines() == [str(n) for n in range(88, 100) if n % 10]
+    assert logs.stderr == "90"
+    assert logs.truncated is True
+    assert len(client.filters) == 1
+    assert client.yielded == 13
+
+    capped = await service.get_task_logs("run-1", "ab/cdef12", max_bytes=6)
+    assert capped.stdout == "98\n99"
+    assert capped.truncated is True
+
+
+@pytest.mark.asyncio
+async def test_task_summary_is_cached_per_trace_generation(monkeypatch) -> None:
+    storage = _StorageStub()
+    service = LogService(storage=storage, project_id=None)
+    path = "gs://arc-reactor-runs/runs/run-1/logs/trace.txt"
+    monkeypatch.setattr(logs_module, "_TRACE_TTL", logs_module.timedelta(0))
+    calls: list[int] = []
+    rollups = logs_module.process_rollups
+
+    def _counting_rollups(frame):
+        calls.append(len(frame))
+        return rollups(frame)
+
+    monkeypatch.setattr(logs_module, "process_rollups", _counting_rollups)
+    header = b"hash\tprocess\tstatus\trealtime\n"
+    storage.put(path, header + b"ab/1\tSTAR\tCOMPLETED\t1h\n")
+
+    first = await service.get_task_summary("run-1")
+    again = await service.get_task_summary("run-1")
+    storage.put(path, header + b"ab/1\tSTAR\tCOMPLETED\t1h\ncd/2\tSTAR\tCOMPLETED\t2h\n")
+    updated = await service.get_task_summary("run-1")
+
+    assert first == again
+    assert first.processes[0].realtime_total_s == 3600.0
+    assert updated.total_tasks == 2
+    assert updated.processes[0].realtime_total_s == 3 * 3600.0
+    assert calls == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_trace_frame_is_a_snapshot_of_its_generation(monkeypatch) -> None:
+    storage = _StorageStub()
+    service = LogService(storage=storage, project_id=None)
+    path = "gs://arc-reactor-runs/runs/run-1/logs/trace.txt"
+    monkeypatch.setattr(logs_module, "_TRACE_TTL", logs_module.timedelta(0))
+    header = b"hash\tprocess\tstatus\trealtime\n"
+    storage.put(path, header + b"ab/1\tSTAR\tCOMPLETED\t1h\n")
+
+    await service.list_tasks("run-1")
+    old = logs_module._TRACE_CACHE.get("run-1")
+    storage.put(path, header + b"ab/1\tSTAR\tCOMPLETED\t1h\ncd/2\tSTAR\tCOMPLETED\t2h\n")
+    # The next generation feeds the same parse state the old entry was built from.
+    frame = await service.get_trace_frame("run-1")
+
+    assert logs_module._TRACE_CACHE.get("run-1").state is old.state
+    assert len(old.frame()) == 1
+    assert len(frame) == 2
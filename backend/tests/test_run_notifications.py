@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.models import Base, RunEventEntry
+from backend.models.schemas.runs import RunStatus
+from backend.services.database import DatabaseService
+from backend.services.run_events import (
+    RunEventService,
+    _EventTail,
+    poll_run_changes,
+    poll_run_events,
+    prune_run_events,
+)
+from backend.services.run_notifications import RunStatusListener
+from backend.services.runs import RunStoreService, decode_run_cursor, encode_run_cursor
+from backend.services.streams import StreamBroker
+
+
+class _Settings:
+    nextflow_bucket = "arc-reactor-runs"
+
+
+@pytest.fixture
+async def database() -> DatabaseService:
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield DatabaseService(
+        engine=engine, session_factory=async_sessionmaker(engine, expire_on_commit=False)
+    )
+    await engine.dispose()
+    os.unlink(path)
+
+
+@pytest.mark.asyncio
+async def test_listener_wakes_only_watchers_of_the_notified_run() -> None:
+    listener = RunStatusListener("postgresql://localhost/arc")
+
+    async with listener.watch("run-1") as first, listener.watch("run-2") as second:
+        listener.dispatch(json.dumps({"run_id": "run-1", "status": "RUNNING"}))
+        listener.dispatch("not json")
+
+        assert first.is_set()
+        assert not second.is_set()
+
+    assert listener._watchers == {}
+
+
+@pytest.mark.asyncio
+async def test_poll_run_events_rereads_on_notification(database: DatabaseService) -> None:
+    listener = RunStatusListener("postgresql://localhost/arc")
+    listener.active = True
+    async for session in database.get_session():
+        runs = RunStoreService.create(session, _Settings())
+        run_id = await runs.create_run(
+            pipeline="nf-core/scrnaseq",
+            pipeline_version="2.7.1",
+            user_email="user@arc.org",
+            user_name="Arc User",
+            params={},
+            sample_count=1,
+        )
+
+    broker = StreamBroker()
+    changes = broker.subscribe(
+        ("run-events",),
+        lambda: poll_run_changes(database, listener=listener, fallback_interval=60),
+    )
+    events = poll_run_events(database, run_id, changes)
+    first = await asyncio.wait_for(anext(events), 1)
+    assert first.status == RunStatus.PENDING
+
+    async for session in database.get_session():
+        runs = RunStoreService.create(session, _Settings())
+        await runs.update_run_status(run_id=run_id, status=RunStatus.CANCELLED)
+    listener.dispatch(json.dumps({"run_id": run_id, "status": "CANCELLED"}))
+
+    second = await asyncio.wait_for(anext(events), 1)
+    done = await asyncio.wait_for(anext(events), 1)
+    assert (second.event, second.status) == ("status", RunStatus.CANCELLED)
+    assert (done.event, done.status) == ("done", RunStatus.CANCELLED)
+    await events.aclose()
+
+
+async def _create_run(database: DatabaseService, email: str) -> str:
+    async for session in database.get_session():
+        return await RunStoreService.create(session, _Settings()).create_run(
+            pipeline="nf-core/scrnaseq",
+            pipeline_version="2.7.1",
+            user_email=email,
+            user_name=None,
+            params={},
+            sample_count=1,
+        )
+
+
+def test_run_cursor_round_trips_and_rejects_garbage() -> None:
+    timestamp = datetime(2026, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc)
+    token = encode_run_cursor(timestamp, "run-1")
+
+    assert decode_run_cursor(token) == (timestamp, "run-1")
+    with pytest.raises(ValueError):
+        decode_run_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_poll_run_changes_streams_events_for_all_runs(database: DatabaseService) -> None:
+    listener = RunStatusListener("postgresql://localhost/arc")
+    listener.active = True
+    first_id = await _create_run(database, "a@arc.org")
+    second_id = await _create_run(database, "b@arc.org")
+
+    changes = poll_run_changes(database, listener=listener, fallback_interval=60)
+    pending = asyncio.ensure_future(anext(changes))
+    await asyncio.sleep(0.05)
+    async for session in database.get_session():
+        runs = RunStoreService.create(session, _Settings())
+        await runs.update_run_status(run_id=second_id, status=RunStatus.CANCELLED)
+        await runs.update_run_status(
+            run_id=first_id, status=RunStatus.PENDING, metrics={"progress": 0.25}
+        )
+    listener.dispatch(json.dumps({"run_id": second_id, "status": "CANCELLED"}))
+
+    changed = [await asyncio.wait_for(pending, 1), await asyncio.wait_for(anext(changes), 1)]
+    await changes.aclose()
+
+    assert [(event.event, event.run_id, event.status, event.progress) for event in changed] == [
+        ("status", second_id, RunStatus.CANCELLED, None),
+        ("metrics", first_id, RunStatus.PENDING, 0.25),
+    ]
+    async for session in database.get_session():
+        service = RunEventService.create(session)
+        replay = await service.list_events(after=0, user_email="a@arc.org")
+        after_cancel = await service.list_events(after=changed[0].seq)
+    assert [(event.event, event.status) for event in replay] == [
+        ("status", RunStatus.PENDING),
+        ("metrics", RunStatus.PENDING),
+    ]
+    assert [event.seq for event in after_cancel] == [changed[1].seq]
+
+
+@pytest.mark.asyncio
+async def test_event_tail_delivers_seqs_that_commit_late(database: DatabaseService) -> None:
+    run_id = await _create_run(database, "a@arc.org")
+    now = datetime.now(timezone.utc)
+
+    async def _append(seq: int) -> None:
+        async for session in database.get_session():
+            session.add(
+                RunEventEntry(
+                    seq=seq, run_id=run_id, type="metrics", payload={"status": "pending"}, ts=now
+                )
+            )
+            await session.commit()
+
+    tail = _EventTail(9)
+    await _append(10)
+    await _append(12)
+    assert [event.seq for event in await tail.read(database)] == [10, 12]
+
+    await _append(11)
+    assert [event.seq for event in await tail.read(database)] == [11]
+    assert await tail.read(database) == []
+    assert tail.cursor == 12
+
+
+@pytest.mark.asyncio
+async def test_prune_keeps_status_events_and_latest_metrics(database: DatabaseService) -> None:
+    run_id = await _create_run(database, "a@arc.org")
+    other_id = await _create_run(database, "b@arc.org")
+    old = datetime.now(timezone.utc) - timedelta(hours=2)
+
+    async for session in database.get_session():
+        runs = RunStoreService.create(session, _Settings())
+        for progress in (0.1, 0.2, 0.3):
+            assert await runs.update_run_metrics(
+                run_id, lambda metrics, p=progress: {"progress": p}, timestamp=old
+            )
+        assert await runs.update_run_metrics(
+            other_id, lambda metrics: {"progress": 0.5}, timestamp=old
+        )
+        # Unchanged metrics write neither the run nor an event.
+        assert await runs.update_run_metrics(other_id, lambda metrics: dict(metrics))
+
+    assert await prune_run_events(database, timedelta(hours=1)) == 2
+
+    async for session in database.get_session():
+        events = await RunEventService.create(session).list_events(after=0)
+    assert [(event.run_id, event.event, event.progress) for event in events] == [
+        (run_id, "status", None),
+        (other_id, "status", None),
+        (run_id, "metrics", 0.3),
+        (other_id, "metrics", 0.5),
+    ]
@@ -26,9 +26,13 @@ class _StorageStub:
             self.files[f"{run_id}/inputs/{name}"] = content
         return [f"gs://{self.bucket_name}/runs/{run_id}/inputs/{name}" for name in files]
 
-    def get_file_content(self, gcs_uri: str, text: bool = True):
-        key = gcs_uri.split("/runs/")[-1]
-        return self.files[key]
+    def copy_run_inputs(self, parent_run_id, run_id, user_email, overrides=None):
+        overrides = overrides or {}
+        names = ("samplesheet.csv", "nextflow.config", "params.yaml")
+        for name in names:
+            source = f"{parent_run_id}/inputs/{name}"
+            self.files[f"{run_id}/inputs/{name}"] = overrides.get(name, self.files[source])
+        return [f"gs://{self.bucket_name}/runs/{run_id}/inputs/{name}" for name in names]
 
     def check_work_dir_exists(self, run_id: str) -> bool:
         return run_id in self.work_dirs
@@ -128,3 +132,6 @@ async def test_submit_recovery_run_flow(session: AsyncSession) -> None:
     assert recovery.status == RunStatus.SUBMITTED
     assert recovery.parent_run_id == parent_id
     assert recovery.batch_job_name == f"batch/{recovery_id}"
+    assert storage.files[f"{recovery_id}/inputs/samplesheet.csv"] == (
+        "sample,fastq_1,fastq_2\nA,gs://a,gs://b"
+    )
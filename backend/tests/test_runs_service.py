@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import os
 import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg, psycopg2
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from backend.models import Base
+from backend.models import Base, Run, RunEventEntry
 from backend.models.schemas.runs import RunStatus
-from backend.services.runs import RunStoreService
+from backend.services.runs import RunStoreService, _driver_statement
 
 
 class _Settings:
@@ -110,6 +114,47 @@ async def test_invalid_status_transition(session: AsyncSession) -> None:
         await service.update_run_status(run_id=run_id, status=RunStatus.COMPLETED)
 
 
+@pytest.mark.asyncio
+async def test_status_updates_are_compare_and_set(session: AsyncSession) -> None:
+    service = RunStoreService.create(session, _Settings())
+    run_id = await service.create_run(
+        pipeline="nf-core/scrnaseq",
+        pipeline_version="2.7.1",
+        user_email="user@arc.org",
+        user_name=None,
+        params={},
+        sample_count=1,
+    )
+    await service.update_run_status(run_id=run_id, status=RunStatus.SUBMITTED)
+    await service.update_run_status(run_id=run_id, status=RunStatus.CANCELLED)
+
+    # A late writer still acting on the submitted run can't move it out of cancelled.
+    with pytest.raises(ValueError, match="cancelled -> running"):
+        await service.update_run_status(
+            run_id=run_id, status=RunStatus.RUNNING, metrics={"progress": 0.5}
+        )
+    assert await service.update_run_status(run_id="run-missing", status=RunStatus.FAILED) is False
+    assert await service.update_run_status(
+        run_id=run_id, status=RunStatus.CANCELLED, metrics={"progress": 1.0}
+    )
+
+    run = await service.get_run(run_id)
+    events = (
+        await session.execute(
+            select(RunEventEntry.type, RunEventEntry.payload)
+            .where(RunEventEntry.run_id == run_id)
+            .order_by(RunEventEntry.seq)
+        )
+    ).all()
+    assert (run.status, run.metrics) == (RunStatus.CANCELLED, {"progress": 1.0})
+    assert [(kind, payload["status"]) for kind, payload in events] == [
+        ("status", "pending"),
+        ("status", "submitted"),
+        ("status", "cancelled"),
+        ("metrics", "cancelled"),
+    ]
+
+
 @pytest.mark.asyncio
 async def test_create_recovery_run(session: AsyncSession) -> None:
     service = RunStoreService.create(session, _Settings())
@@ -138,3 +183,165 @@ async def test_create_recovery_run(session: AsyncSession) -> None:
     assert recovery.parent_run_id == parent_id
     assert recovery.is_recovery is True
     assert recovery.reused_work_dir == f"gs://arc-reactor-runs/runs/{parent_id}/work/"
+
+
+@pytest.mark.asyncio
+async def test_list_runs_pages_with_cursor(session: AsyncSession) -> None:
+    service = RunStoreService.create(session, _Settings())
+    run_ids = [
+        await service.create_run(
+            pipeline="nf-core/scrnaseq",
+            pipeline_version="2.7.1",
+            user_email="user@arc.org",
+            user_name=None,
+            params={},
+            sample_count=1,
+        )
+        for _ in range(5)
+    ]
+
+    first = await service.list_runs(page_size=2, total="none")
+    second = await service.list_runs(page_size=2, cursor=first.next_cursor, total="estimated")
+    last = await service.list_runs(page_size=2, cursor=second.next_cursor)
+
+    seen = [run.run_id for page in (first, second, last) for run in page.runs]
+    assert seen == list(reversed(run_ids))
+    assert first.total is None
+    # sqlite has no planner statistics, so the estimate falls back to an exact count.
+    assert (second.total, second.total_estimated) == (5, False)
+    assert last.next_cursor is None
+    assert [run.run_id for run in (await service.list_runs(page=2, page_size=2)).runs] == [
+        run.run_id for run in second.runs
+    ]
+    with pytest.raises(ValueError):
+        await service.list_runs(cursor="garbage")
+
+
+def test_estimate_statement_keeps_filter_values_bound() -> None:
+    query = select(Run.run_id).where(
+        Run.pipeline == "nf-core/rnaseq:dev", Run.status.in_(["pending", "running"])
+    )
+
+    sql, params = _driver_statement(query, asyncpg.dialect())
+    assert "rnaseq" not in sql
+    assert params == ("nf-core/rnaseq:dev", "pending", "running")
+
+    sql, params = _driver_statement(query, psycopg2.dialect())
+    assert "rnaseq" not in sql
+    assert sorted(params.values()) == ["nf-core/rnaseq:dev", "pending", "running"]
+
+
+@pytest.mark.asyncio
+async def test_list_and_get_runs_with_field_projection(session: AsyncSession) -> None:
+    service = RunStoreService.create(session, _Settings())
+    run_id = await service.create_run(
+        pipeline="nf-core/scrnaseq",
+        pipeline_version="2.7.1",
+        user_email="user@arc.org",
+        user_name=None,
+        params={"genome": "GRCh38"},
+        sample_count=1,
+    )
+
+    listing = await service.list_runs(fields=["status", "pipeline"], page_size=1)
+    run = await service.get_run(run_id, fields=["metrics"])
+
+    assert listing.model_dump(mode="json", exclude_unset=True)["runs"] == [
+        {"run_id": run_id, "pipeline": "nf-core/scrnaseq", "status": "pending"}
+    ]
+    assert listing.next_cursor is not None
+    assert run.model_dump(exclude_unset=True) == {"run_id": run_id, "metrics": None}
+    with pytest.raises(ValueError, match="secret"):
+        await service.list_runs(fields=["status", "secret"])
+
+
+class _ListingBatch:
+    def __init__(self, jobs: dict[str, dict[str, dict]]) -> None:
+        self.jobs = jobs
+        self.regions: list[str] = []
+        self.filters: list[tuple] = []
+        self.threads: set[int] = set()
+
+    def list_jobs(self, *, region: str, states=None, created_after=None) -> dict[str, dict]:
+        self.regions.append(region)
+        self.filters.append((tuple(states or ()), created_after))
+        self.threads.add(threading.get_ident())
+        return self.jobs[region]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_stale_runs_lists_jobs_per_region_and_updates_in_bulk(
+    session: AsyncSession,
+) -> None:
+    service = RunStoreService.create(session, _Settings())
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    jobs = {}
+    run_ids = []
+    for index, (region, status) in enumerate(
+        [
+            ("us-west1", RunStatus.RUNNING),
+            ("us-west1", RunStatus.RUNNING),
+            ("us-east1", RunStatus.SUBMITTED),
+            ("us-east1", RunStatus.SUBMITTED),
+        ]
+    ):
+        run_id = await service.create_run(
+            pipeline="nf-core/scrnaseq",
+            pipeline_version="2.7.1",
+            user_email="user@arc.org",
+            user_name=None,
+            params={},
+            sample_count=1,
+        )
+        job_name = f"projects/proj/locations/{region}/jobs/nf-{run_id}"
+        await service.update_run_status(
+            run_id=run_id,
+            status=RunStatus.SUBMITTED,
+            batch_job_name=job_name,
+            timestamp=stale if index < 3 else datetime.now(timezone.utc),
+        )
+        if status == RunStatus.RUNNING:
+            await service.update_run_status(run_id=run_id, status=status, timestamp=stale)
+        jobs.setdefault(region, {})[job_name] = {"run_status": None, "status_events": []}
+        run_ids.append(run_id)
+    finished, failed, still_submitted, recent = run_ids
+    jobs["us-west1"][f"projects/proj/locations/us-west1/jobs/nf-{finished}"]["run_status"] = (
+        "completed"
+    )
+    jobs["us-west1"][f"projects/proj/locations/us-west1/jobs/nf-{failed}"] = {
+        "run_status": "failed",
+        "status_events": [{"description": "Task exited with code 1"}],
+    }
+    jobs["us-east1"][f"projects/proj/locations/us-east1/jobs/nf-{recent}"]["run_status"] = (
+        "cancelled"
+    )
+    batch = _ListingBatch(jobs)
+
+    assert await service.reconcile_stale_runs(batch=batch) == 2
+
+    assert sorted(batch.regions) == ["us-east1", "us-west1"]
+    assert threading.get_ident() not in batch.threads
+    states, created_after = batch.filters[0]
+    assert "SUCCEEDED" in states and "RUNNING" not in states
+    assert created_after is not None
+    completed = await service.get_run(finished)
+    errored = await service.get_run(failed)
+    assert completed.status == RunStatus.COMPLETED
+    assert completed.completed_at is not None
+    assert (errored.status, errored.error_message) == (RunStatus.FAILED, "Task exited with code 1")
+    assert errored.failed_at is not None and errored.completed_at is None
+    assert (await service.get_run(still_submitted)).status == RunStatus.SUBMITTED
+    # Too recent to reconcile, even though its job was cancelled.
+    assert (await service.get_run(recent)).status == RunStatus.SUBMITTED
+    events = (
+        await session.execute(
+            select(RunEventEntry.run_id, RunEventEntry.payload)
+            .where(RunEventEntry.run_id.in_([finished, failed]))
+            .order_by(RunEventEntry.seq.desc())
+            .limit(2)
+        )
+    ).all()
+    assert {(run_id, payload["status"]) for run_id, payload in events} == {
+        (finished, "completed"),
+        (failed, "failed"),
+    }
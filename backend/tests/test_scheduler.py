@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.services.scheduler import Scheduler
+
+
+@pytest.mark.asyncio
+async def test_jobs_repeat_and_survive_failures() -> None:
+    scheduler = Scheduler()
+    calls: list[str] = []
+
+    async def flaky() -> None:
+        calls.append("flaky")
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    scheduler.register("flaky", flaky, interval=0.01, jitter=0)
+    scheduler.start()
+    await asyncio.sleep(0.1)
+    await scheduler.close()
+
+    stats = scheduler.stats()
+    job = stats["jobs"]["flaky"]
+    assert stats["leader"] is False  # released on close
+    assert job["runs"] == len(calls) >= 3
+    assert (job["failures"], job["last_error"]) == (1, "boom")
+    assert job["last_duration_seconds"] is not None
+
+
+@pytest.mark.asyncio
+async def test_followers_skip_leader_only_jobs() -> None:
+    scheduler = Scheduler()
+    ran: list[str] = []
+
+    async def record(name: str) -> None:
+        ran.append(name)
+
+    scheduler.register("reconcile", lambda: record("reconcile"), interval=60)
+    scheduler.register("cache", lambda: record("cache"), interval=60, leader_only=False)
+
+    assert await scheduler.run_job("reconcile") is False
+    assert await scheduler.run_job("cache") is True
+    scheduler.is_leader = True
+    assert await scheduler.run_job("reconcile") is True
+
+    assert ran == ["cache", "reconcile"]
+    assert scheduler.stats()["jobs"]["reconcile"]["skipped"] == 1
+    with pytest.raises(ValueError):
+        scheduler.register("cache", lambda: record("cache"), interval=60)
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_running_job_and_cancels_idle_ones() -> None:
+    scheduler = Scheduler(shutdown_timeout=1)
+    started = asyncio.Event()
+    finished: list[str] = []
+
+    async def slow() -> None:
+        started.set()
+        await asyncio.sleep(0.05)
+        finished.append("slow")
+
+    async def idle() -> None:
+        finished.append("idle")
+
+    scheduler.register("slow", slow, interval=0.01, jitter=0)
+    scheduler.register("idle", idle, interval=60, jitter=0)
+    scheduler.start()
+    await asyncio.wait_for(started.wait(), 1)
+    await scheduler.close()
+
+    assert finished.count("slow") == 1
+    assert scheduler.stats()["jobs"]["slow"]["runs"] == 1
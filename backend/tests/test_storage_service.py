@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.services import storage as storage_module
 from backend.services.storage import StorageService
 
+_SIGNING_CALLS: list[tuple[str, object]] = []
+
 
 class _Blob:
     def __init__(self, name: str, content: bytes = b"data") -> None:
@@ -11,8 +18,9 @@ class _Blob:
         self.updated = "2025-01-01T00:00:00Z"
         self.metadata = {}
 
-    def upload_from_string(self, content: str | bytes) -> None:
+    def upload_from_string(self, content: str | bytes, content_type: str | None = None) -> None:
         self._content = content.encode() if isinstance(content, str) else content
+        self.size = len(self._content)
 
     def download_as_bytes(self) -> bytes:
         return self._content
@@ -21,6 +29,7 @@ class _Blob:
         return True
 
     def generate_signed_url(self, *args, **kwargs) -> str:
+        _SIGNING_CALLS.append((self.name, kwargs.get("expiration")))
         return "https://signed-url"
 
 
@@ -39,18 +48,62 @@ class _Bucket:
         return True
 
 
+class _Page(list):
+    def __init__(self, blobs: list[_Blob], prefixes: set[str]) -> None:
+        super().__init__(blobs)
+        self.prefixes = prefixes
+
+
+class _BlobIterator:
+    def __init__(self, blobs: list[_Blob], prefixes: set[str], next_page_token: str | None) -> None:
+        self._page = _Page(blobs, prefixes)
+        self.next_page_token = next_page_token
+
+    def __iter__(self):
+        return iter(self._page)
+
+    @property
+    def pages(self):
+        yield self._page
+
+
 class _Client:
     def __init__(self, bucket: _Bucket) -> None:
         self._bucket = bucket
+        self.list_calls: list[dict[str, object]] = []
 
     def bucket(self, name: str) -> _Bucket:
         return self._bucket
 
-    def list_blobs(self, name: str, prefix: str, max_results: int | None = None):
-        blobs = [blob for blob in self._bucket.blobs.values() if blob.name.startswith(prefix)]
-        if max_results is not None:
-            return blobs[:max_results]
-        return blobs
+    def list_blobs(
+        self,
+        name: str,
+        prefix: str,
+        max_results: int | None = None,
+        delimiter: str | None = None,
+        page_size: int | None = None,
+        page_token: str | None = None,
+    ):
+        self.list_calls.append({"prefix": prefix, "delimiter": delimiter})
+        blobs = sorted(
+            (blob for blob in self._bucket.blobs.values() if blob.name.startswith(prefix)),
+            key=lambda blob: blob.name,
+        )
+        prefixes: set[str] = set()
+        if delimiter:
+            direct = []
+            for blob in blobs:
+                rest = blob.name[len(prefix) :]
+                if delimiter in rest:
+                    prefixes.add(prefix + rest.split(delimiter, 1)[0] + delimiter)
+                else:
+                    direct.append(blob)
+            blobs = direct
+        start = int(page_token or 0)
+        limit = page_size or max_results
+        end = start + limit if limit is not None else len(blobs)
+        next_token = str(end) if page_size is not None and end < len(blobs) else None
+        return _BlobIterator(blobs[start:end], prefixes, next_token)
 
 
 def test_storage_upload_and_download() -> None:
@@ -103,8 +156,14 @@ def test_storage_run_files_helpers() -> None:
     )
     assert len(uploaded) == 3
 
-    files = service.get_run_files("run-2")
-    assert files["inputs"]
+    root = service.get_run_files("run-2")
+    assert [entry["name"] for entry in root["directories"]] == ["inputs/"]
+    files = service.get_run_files("run-2", "inputs")
+    assert [entry["name"] for entry in files["files"]] == [
+        "inputs/nextflow.config",
+        "inputs/params.yaml",
+        "inputs/samplesheet.csv",
+    ]
 
     content = service.get_file_content(uploaded[0], text=True)
     assert isinstance(content, str)
@@ -112,3 +171,127 @@ def test_storage_run_files_helpers() -> None:
     assert service.check_work_dir_exists("run-2") is False
     bucket.blob("runs/run-2/work/.keep").upload_from_string("x")
     assert service.check_work_dir_exists("run-2") is True
+
+
+def test_storage_run_files_skip_work_and_paginate() -> None:
+    bucket = _Bucket()
+    client = _Client(bucket)
+    service = StorageService(client=client, bucket_name="arc-reactor-runs")
+
+    for index in range(5):
+        bucket.blob(f"runs/run-3/results/star/sample_{index}.bam").upload_from_string("x")
+    bucket.blob("runs/run-3/results/multiqc_report.html").upload_from_string("x")
+    bucket.blob("runs/run-3/work/ab/cdef/.command.sh").upload_from_string("x")
+
+    root = service.get_run_files("run-3")
+    assert [entry["name"] for entry in root["directories"]] == ["results/"]
+    assert all(call["delimiter"] == "/" for call in client.list_calls)
+
+    results = service.get_run_files("run-3", "results/")
+    assert [entry["name"] for entry in results["directories"]] == ["results/star/"]
+    assert [entry["name"] for entry in results["files"]] == ["results/multiqc_report.html"]
+
+    first = service.get_run_files("run-3", "results/star", page_size=3)
+    assert len(first["files"]) == 3
+    assert first["next_page_token"]
+    second = service.get_run_files(
+        "run-3", "results/star", page_size=3, page_token=first["next_page_token"]
+    )
+    assert len(second["files"]) == 2
+    assert second["next_page_token"] is None
+
+    with pytest.raises(ValueError):
+        service.get_run_files("run-3", "work/ab")
+    with pytest.raises(ValueError):
+        service.get_run_files("run-3", "results/../work")
+
+
+def test_storage_run_manifest_serves_listing() -> None:
+    bucket = _Bucket()
+    client = _Client(bucket)
+    service = StorageService(client=client, bucket_name="arc-reactor-runs")
+    storage_module._MANIFEST_CACHE.clear()
+
+    bucket.blob("runs/run-4/inputs/samplesheet.csv").upload_from_string("abc")
+    bucket.blob("runs/run-4/results/star/A/Aligned.bam").upload_from_string("12345")
+    bucket.blob("runs/run-4/results/star/B/Aligned.bam").upload_from_string("123")
+    bucket.blob("runs/run-4/results/multiqc_report.html").upload_from_string("12")
+    bucket.blob("runs/run-4/logs/nextflow.log").upload_from_string("1")
+    bucket.blob("runs/run-4/work/ab/cdef/.command.sh").upload_from_string("x")
+
+    manifest = service.get_run_manifest("run-4")
+    assert manifest is not None
+    assert "runs/run-4/manifest.json" in bucket.blobs
+    assert {entry["path"].split("/")[0] for entry in manifest["files"]} == {"results", "logs"}
+    assert manifest["directories"]["results/"] == {"file_count": 3, "size": 10}
+    assert manifest["directories"]["results/star/"] == {"file_count": 2, "size": 8}
+
+    calls_before = len(client.list_calls)
+    results = service.get_run_files("run-4", "results", manifest=manifest)
+    assert len(client.list_calls) == calls_before
+    assert results["directories"] == [
+        {
+            "name": "results/star/",
+            "gcs_uri": "gs://arc-reactor-runs/runs/run-4/results/star/",
+            "file_count": 2,
+            "size": 8,
+        }
+    ]
+    assert [entry["name"] for entry in results["files"]] == ["results/multiqc_report.html"]
+
+    paged = service.get_run_files("run-4", "results/star", manifest=manifest, page_size=1)
+    assert paged["next_page_token"] == "1"
+
+    # The root and inputs/ are outside the manifest and still listed from GCS.
+    root = service.get_run_files("run-4", manifest=manifest)
+    assert [entry["name"] for entry in root["directories"]] == ["inputs/", "logs/", "results/"]
+    inputs = service.get_run_files("run-4", "inputs", manifest=manifest)
+    assert [entry["name"] for entry in inputs["files"]] == ["inputs/samplesheet.csv"]
+    assert len(client.list_calls) == calls_before + 2
+
+    assert service.get_run_manifest("run-4") is manifest
+    storage_module._MANIFEST_CACHE.clear()
+
+
+def test_storage_signed_url_cache(monkeypatch) -> None:
+    bucket = _Bucket()
+    client = _Client(bucket)
+    service = StorageService(client=client, bucket_name="arc-reactor-runs")
+    storage_module._SIGNED_URL_CACHE.clear()
+    _SIGNING_CALLS.clear()
+
+    uri = service.run_file_uri("run-5", "results/multiqc_report.html")
+    assert uri == "gs://arc-reactor-runs/runs/run-5/results/multiqc_report.html"
+    with pytest.raises(ValueError):
+        service.run_file_uri("run-5", "work/ab/cdef/.command.sh")
+    with pytest.raises(ValueError):
+        service.run_file_uri("run-5", "results/")
+
+    monkeypatch.setattr(storage_module.time, "time", lambda: 1_000.0)
+    assert service.get_signed_url(uri) == "https://signed-url"
+    assert service.get_signed_url(uri) == "https://signed-url"
+    assert len(_SIGNING_CALLS) == 1
+    expiration = _SIGNING_CALLS[0][1]
+    assert expiration.timestamp() == 1_200 + 60 * 60
+
+    monkeypatch.setattr(storage_module.time, "time", lambda: 1_300.0)
+    service.get_signed_url(uri)
+    assert len(_SIGNING_CALLS) == 2
+    assert len(storage_module._SIGNED_URL_CACHE) == 1
+    storage_module._SIGNED_URL_CACHE.clear()
+
+
+def test_storage_signed_url_cache_is_thread_safe(monkeypatch) -> None:
+    service = StorageService(client=_Client(_Bucket()), bucket_name="arc-reactor-runs")
+    storage_module._SIGNED_URL_CACHE.clear()
+    monkeypatch.setattr(storage_module, "_SIGNED_URL_CACHE_SIZE", 8)
+
+    def _sign(index: int) -> str:
+        return service.get_signed_url(f"gs://arc-reactor-runs/runs/run-{index % 32}/a.html")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        urls = list(pool.map(_sign, range(2_000)))
+
+    assert set(urls) == {"https://signed-url"}
+    assert len(storage_module._SIGNED_URL_CACHE) <= 8
+    storage_module._SIGNED_URL_CACHE.clear()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.services.streams import StreamBroker
+
+
+class _Source:
+    def __init__(self) -> None:
+        self.started = 0
+        self.cancelled = 0
+        self.items: asyncio.Queue[int | None] = asyncio.Queue()
+
+    async def __call__(self):
+        self.started += 1
+        try:
+            while True:
+                item = await self.items.get()
+                if item is None:
+                    return
+                yield item
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+async def _take(stream, count: int) -> list[int]:
+    return [await asyncio.wait_for(anext(stream), 1) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_one_poller_and_late_joiners_get_history() -> None:
+    broker = StreamBroker(history=2)
+    source = _Source()
+    first = broker.subscribe("run-1", source)
+    for item in (1, 2, 3):
+        source.items.put_nowait(item)
+    assert await _take(first, 3) == [1, 2, 3]
+
+    second = broker.subscribe("run-1", source)
+    assert await _take(second, 2) == [2, 3]
+    source.items.put_nowait(4)
+    assert await _take(first, 1) == [4]
+    assert await _take(second, 1) == [4]
+
+    assert source.started == 1
+    assert broker.stats() == {"streams": 1, "subscribers": 2}
+    await first.aclose()
+    await second.aclose()
+
+
+@pytest.mark.asyncio
+async def test_last_unsubscribe_stops_the_poller() -> None:
+    broker = StreamBroker()
+    source = _Source()
+    first = broker.subscribe("run-1", source)
+    second = broker.subscribe("run-1", source)
+    source.items.put_nowait(1)
+    await _take(first, 1)
+    await _take(second, 1)
+
+    await first.aclose()
+    await asyncio.sleep(0)
+    assert source.cancelled == 0
+    await second.aclose()
+    await asyncio.sleep(0)
+
+    assert source.cancelled == 1
+    assert broker.stats() == {"streams": 0, "subscribers": 0}
+
+
+@pytest.mark.asyncio
+async def test_subscribers_end_when_the_source_ends() -> None:
+    broker = StreamBroker()
+    source = _Source()
+    stream = broker.subscribe("run-1", source)
+    source.items.put_nowait(1)
+    source.items.put_nowait(None)
+
+    assert [item async for item in stream] == [1]
+    assert broker.stats()["streams"] == 0
+
+    restarted = broker.subscribe("run-1", source)
+    source.items.put_nowait(5)
+    assert await _take(restarted, 1) == [5]
+    assert source.started == 2
+    await broker.close()
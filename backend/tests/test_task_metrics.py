@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.models import Base, Run, TaskMetric
+from backend.models.schemas.runs import RunStatus
+from backend.services.runs import RunStoreService
+from backend.services.task_metrics import (
+    MAX_INGEST_ATTEMPTS,
+    TaskMetricsService,
+    mann_whitney_u,
+)
+from backend.services.trace_analytics import trace_frame
+
+
+class _Settings:
+    nextflow_bucket = "arc-reactor-runs"
+
+
+class _LogsStub:
+    def __init__(self, frames, failing: set[str] | None = None) -> None:
+        self.frames = frames
+        self.failing = failing or set()
+
+    async def get_trace_frame(self, run_id: str, *, final: bool = False, strict: bool = False):
+        if run_id in self.failing:
+            assert strict
+            raise ConnectionError("GCS unavailable")
+        return self.frames.get(run_id)
+
+
+class _ManifestStub:
+    def __init__(self) -> None:
+        self.built: list[str] = []
+
+    def build_run_manifest(self, run_id: str) -> dict:
+        self.built.append(run_id)
+        return {}
+
+
+@pytest.fixture
+async def session() -> AsyncSession:
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+    os.unlink(path)
+
+
+def _frame(process_minutes: dict[str, list[float]], peak_rss: str = "10 GB"):
+    header = ["hash", "process", "name", "status", "realtime", "peak_rss", "attempt"]
+    rows = [
+        [
+            f"{process[:2]}/{index}",
+            process,
+            f"{process} ({index})",
+            "COMPLETED",
+            f"{minutes}m",
+            peak_rss,
+            "1",
+        ]
+        for process, durations in process_minutes.items()
+        for index, minutes in enumerate(durations)
+    ]
+    return trace_frame(header, rows)
+
+
+async def _finished_run(session: AsyncSession, version: str) -> str:
+    runs = RunStoreService.create(session, _Settings())
+    run_id = await runs.create_run(
+        pipeline="nf-core/scrnaseq",
+        pipeline_version=version,
+        user_email="user@arc.org",
+        user_name="Arc User",
+        params={},
+        sample_count=4,
+    )
+    await runs.update_run_status(run_id=run_id, status=RunStatus.CANCELLED)
+    await session.execute(
+        update(Run)
+        .where(Run.run_id == run_id)
+        .values(updated_at=datetime.now(timezone.utc) - timedelta(hours=1))
+    )
+    await session.commit()
+    return run_id
+
+
+def test_mann_whitney_u_matches_reference_values() -> None:
+    u, p = mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+
+    assert u == 0.0
+    assert p == pytest.approx(0.012186, rel=1e-4)
+    assert mann_whitney_u([1, 1, 1], [1, 1, 1])[1] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_ingest_pending_loads_settled_runs_once(session: AsyncSession) -> None:
+    service = TaskMetricsService.create(session)
+    run_id = await _finished_run(session, "2.7.1")
+    empty_run = await _finished_run(session, "2.7.1")
+    logs = _LogsStub({run_id: _frame({"STAR": [10, 12], "FASTQC": [1]})})
+
+    manifests = _ManifestStub()
+
+    assert await service.ingest_pending(logs, manifests=manifests) == 2
+    assert await service.ingest_pending(logs, manifests=manifests) == 0
+    assert sorted(manifests.built) == sorted([run_id, empty_run])
+
+    rows = (await session.execute(select(TaskMetric).order_by(TaskMetric.id))).scalars().all()
+    assert [(row.run_id, row.process, row.realtime_s) for row in rows] == [
+        (run_id, "STAR", 600.0),
+        (run_id, "STAR", 720.0),
+        (run_id, "FASTQC", 60.0),
+    ]
+    assert rows[0].pipeline_version == "2.7.1" and rows[0].attempt == 1
+    assert await session.get(Run, empty_run) is not None
+
+
+@pytest.mark.asyncio
+async def test_ingest_pending_retries_runs_after_storage_errors(session: AsyncSession) -> None:
+    service = TaskMetricsService.create(session)
+    run_id = await _finished_run(session, "2.7.1")
+    logs = _LogsStub({run_id: _frame({"STAR": [10]})}, failing={run_id})
+
+    assert await service.ingest_pending(logs) == 0
+    assert (await session.get(Run, run_id)).task_metrics_ingested_at is None
+
+    logs.failing.clear()
+    assert await service.ingest_pending(logs) == 1
+    assert len((await session.execute(select(TaskMetric))).scalars().all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_ingest_pending_gives_up_on_runs_that_keep_failing(session: AsyncSession) -> None:
+    service = TaskMetricsService.create(session)
+    broken = [await _finished_run(session, "2.7.1") for _ in range(2)]
+    logs = _LogsStub({}, failing=set(broken))
+
+    for _ in range(MAX_INGEST_ATTEMPTS):
+        assert await service.ingest_pending(logs, limit=2) == 0
+    newer = await _finished_run(session, "2.7.1")
+
+    assert [run.run_id for run in await service.pending_runs(limit=2)] == [newer]
+    assert await service.ingest_pending(logs, limit=2) == 1
+    for run_id in broken:
+        run = await session.get(Run, run_id)
+        await session.refresh(run)
+        assert (run.task_metrics_attempts, run.task_metrics_ingested_at) == (
+            MAX_INGEST_ATTEMPTS,
+            None,
+        )
+
+
+@pytest.mark.asyncio
+async def test_compare_versions_flags_significant_regressions(session: AsyncSession) -> None:
+    service = TaskMetricsService.create(session)
+    frames = {}
+    for version, star in (
+        ("2.7.1", [10, 11, 12, 13, 14, 15]),
+        ("2.10.0", [20, 21, 22, 23, 24, 25]),
+    ):
+        run_id = await _finished_run(session, version)
+        frames[run_id] = _frame({"STAR": star, "FASTQC": [1, 2, 1, 2, 1, 2]})
+    await service.ingest_pending(_LogsStub(frames))
+
+    comparison = await service.compare_versions("nf-core/scrnaseq")
+
+    assert comparison.versions == ["2.7.1", "2.10.0"]
+    assert [(item.process, item.pipeline_version) for item in comparison.stats] == [
+        ("FASTQC", "2.7.1"),
+        ("FASTQC", "2.10.0"),
+        ("STAR", "2.7.1"),
+        ("STAR", "2.10.0"),
+    ]
+    assert [(item.process, item.metric) for item in comparison.regressions] == [
+        ("STAR", "realtime_s")
+    ]
+    regression = comparison.regressions[0]
+    assert regression.baseline_version == "2.7.1"
+    assert regression.change_percent == pytest.approx(100 * (22.5 / 12.5 - 1))
+    assert regression.p_value < 0.01
+
+    filtered = await service.compare_versions("nf-core/scrnaseq", min_sample_count=5)
+    assert filtered.stats == []
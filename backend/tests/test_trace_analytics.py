@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import math
+
+import pandas as pd
+
+from backend.services.trace_analytics import (
+    parse_durations,
+    parse_memory,
+    parse_percent,
+    process_rollups,
+    timeline_analysis,
+    trace_frame,
+)
+
+_HEADER = [
+    "task_id",
+    "hash",
+    "process",
+    "name",
+    "status",
+    "attempt",
+    "duration",
+    "realtime",
+    "%cpu",
+    "memory",
+    "peak_rss",
+]
+
+
+def test_parsers_handle_nextflow_formats() -> None:
+    durations = parse_durations(pd.Series(["1h 2m 3s", "350ms", "-", "1d 1h", "120000"]))
+    memory = parse_memory(pd.Series(["1.5 GB", "512 MB", "-", "2048"]))
+    cpu = parse_percent(pd.Series(["98.5%", "-"]))
+
+    assert durations[0] == 3723.0 and math.isclose(durations[1], 0.35)
+    assert math.isnan(durations[2])
+    assert durations.tolist()[3:] == [90000.0, 120.0]
+    assert memory.tolist()[:2] == [1.5 * 1024**3, 512 * 1024**2]
+    assert math.isnan(memory[2]) and memory[3] == 2048
+    assert cpu[0] == 98.5 and math.isnan(cpu[1])
+
+
+def test_process_rollups() -> None:
+    rows = [
+        line.split(",")
+        for line in (
+            "1,ab/1,STAR,STAR (A),COMPLETED,1,1h 5m,1h,400%,32 GB,16 GB",
+            "2,ab/2,STAR,STAR (B),FAILED,1,31m,30m,200%,32 GB,31 GB",
+            "3,ab/3,STAR,STAR (B),COMPLETED,2,2h,1h 30m,400%,64 GB,32 GB",
+            "4,cd/4,FASTQC,FASTQC (A),CACHED,1,-,-,-,-,-",
+        )
+    ]
+
+    rollups = process_rollups(trace_frame(_HEADER, rows))
+
+    assert [item["process"] for item in rollups] == ["STAR", "FASTQC"]
+    star = rollups[0]
+    assert (star["tasks"], star["succeeded"], star["failed"], star["retries"]) == (3, 2, 1, 1)
+    assert star["duration_p50_s"] == 3900.0
+    assert star["cpu_hours"] == 4.0 + 1.0 + 6.0
+    assert star["peak_rss_max_bytes"] == 32 * 1024**3
+    assert math.isclose(star["memory_headroom_percent"], 100 * (1 - 31 / 32))
+    fastqc = rollups[1]
+    assert fastqc["succeeded"] == 1
+    assert fastqc["duration_p50_s"] is None and fastqc["cpu_hours"] is None
+
+
+def test_trace_frame_derives_process_from_name() -> None:
+    frame = trace_frame(
+        ["hash", "name", "status"], [["ab/1", "NFCORE:STAR (sample A)", "COMPLETED"]]
+    )
+
+    assert frame["process"].tolist() == ["NFCORE:STAR"]
+    assert frame["duration_s"].isna().all()
+
+
+def test_timeline_analysis_finds_critical_path_and_queue_waits() -> None:
+    header = ["hash", "process", "name", "status", "submit", "start", "complete"]
+    rows = [
+        line.split(",")
+        for line in (
+            "a,FASTQC,FASTQC (A),COMPLETED,2024-01-01 00:00,2024-01-01 00:01,2024-01-01 00:11",
+            "b,FASTQC,FASTQC (B),COMPLETED,2024-01-01 00:00,2024-01-01 00:05,2024-01-01 00:08",
+            "c,STAR,STAR (A),COMPLETED,2024-01-01 00:11,2024-01-01 00:31,2024-01-01 01:31",
+            "d,MULTIQC,MULTIQC,COMPLETED,2024-01-01 01:31,2024-01-01 01:32,2024-01-01 01:35",
+            "e,STAR,STAR (B),FAILED,-,-,-",
+        )
+    ]
+
+    timeline = timeline_analysis(trace_frame(header, rows))
+
+    assert timeline["wall_clock_s"] == 95 * 60
+    assert [task["name"] for task in timeline["critical_path"]] == [
+        "FASTQC (A)",
+        "STAR (A)",
+        "MULTIQC",
+    ]
+    assert timeline["critical_path_by_process"][0]["process"] == "STAR"
+    assert timeline["critical_path_by_process"][0]["seconds"] == 80 * 60
+    assert timeline["peak_concurrency"] == 2
+    assert timeline["queue_bottlenecks"][0]["process"] == "STAR"
+    assert timeline["queue_bottlenecks"][0]["queue_wait_p95_s"] == 20 * 60
+
+
+def test_timeline_analysis_without_timestamps() -> None:
+    timeline = timeline_analysis(trace_frame(["hash", "name"], [["a", "FASTQC (A)"]]))
+
+    assert timeline["critical_path"] == []
+    assert timeline["peak_concurrency"] == 0
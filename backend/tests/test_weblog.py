@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.models import Base
+from backend.models.schemas.runs import RunStatus
+from backend.services.database import DatabaseService
+from backend.services.run_events import RunEventService, poll_run_changes, poll_run_events
+from backend.services.runs import RunStoreService, run_progress, run_task_counts
+from backend.services.streams import StreamBroker
+from backend.services.weblog import WeblogAggregator
+from backend.utils.auth import verify_weblog_token, weblog_token
+
+
+class _Settings:
+    nextflow_bucket = "arc-reactor-runs"
+
+
+@pytest.fixture
+async def database() -> DatabaseService:
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield DatabaseService(
+        engine=engine, session_factory=async_sessionmaker(engine, expire_on_commit=False)
+    )
+    await engine.dispose()
+    os.unlink(path)
+
+
+def _event(event: str, name: str, status: str, **trace: object) -> dict:
+    return {
+        "event": event,
+        "utcTime": "2026-10-19T12:00:00Z",
+        "trace": {"process": name.split(" ")[0], "name": name, "status": status, **trace},
+    }
+
+
+def test_weblog_token_is_bound_to_the_run() -> None:
+    token = weblog_token("s3cret", "run-1")
+
+    assert verify_weblog_token("s3cret", "run-1", token)
+    assert not verify_weblog_token("s3cret", "run-2", token)
+    assert not verify_weblog_token("other", "run-1", token)
+
+
+@pytest.mark.asyncio
+async def test_flush_merges_task_counts_into_run_metrics(database: DatabaseService) -> None:
+    async for session in database.get_session():
+        run_id = await RunStoreService.create(session, _Settings()).create_run(
+            pipeline="nf-core/scrnaseq",
+            pipeline_version="2.7.1",
+            user_email="user@arc.org",
+            user_name=None,
+            params={},
+            sample_count=1,
+        )
+
+    aggregator = WeblogAggregator()
+    accepted = aggregator.ingest(
+        run_id,
+        [
+            {"event": "started", "runName": "happy_turing"},
+            _event("process_submitted", "FASTQC (1)", "SUBMITTED"),
+            _event("process_submitted", "FASTQC (2)", "SUBMITTED"),
+            _event("process_submitted", "STAR (1)", "SUBMITTED"),
+            _event("process_started", "FASTQC (1)", "RUNNING"),
+            _event("process_started", "FASTQC (2)", "RUNNING"),
+            _event("process_completed", "FASTQC (1)", "COMPLETED", exit=0),
+            _event("process_completed", "FASTQC (2)", "FAILED", exit=137),
+            _event("process_completed", "TRIM (1)", "CACHED"),
+        ],
+    )
+    assert accepted == 8
+    assert await aggregator.flush(database, _Settings()) == 1
+    assert aggregator.stats()["pending_runs"] == 0
+
+    aggregator.ingest(
+        run_id,
+        [
+            _event("process_started", "STAR (1)", "RUNNING"),
+            _event("process_completed", "STAR (1)", "FAILED", exit=1),
+        ],
+    )
+    await aggregator.flush(database, _Settings())
+
+    async for session in database.get_session():
+        run = await RunStoreService.create(session, _Settings()).get_run(run_id)
+        events = await RunEventService.create(session).list_events(after=0)
+
+    metrics = run.metrics
+    assert (
+        metrics["tasks_submitted"],
+        metrics["tasks_running"],
+        metrics["tasks_completed"],
+        metrics["tasks_failed"],
+        metrics["tasks_total"],
+    ) == (3, 0, 2, 2, 4)
+    assert metrics["first_failure"] == {
+        "process": "FASTQC",
+        "name": "FASTQC (2)",
+        "exit": 137,
+        "time": "2026-10-19T12:00:00Z",
+    }
+    assert run_progress(metrics) == 0.5
+    assert [event.event for event in events] == ["status", "metrics", "metrics"]
+    first, latest = events[1], events[-1]
+    assert first.tasks == {"running": 0, "completed": 2, "failed": 1, "total": 4}
+    assert latest.tasks == {"running": 0, "completed": 2, "failed": 2, "total": 4}
+    assert latest.first_failure["name"] == "FASTQC (2)"
+
+
+@pytest.mark.asyncio
+async def test_replicas_flushing_out_of_order_settle_running_count(
+    database: DatabaseService,
+) -> None:
+    async for session in database.get_session():
+        run_id = await RunStoreService.create(session, _Settings()).create_run(
+            pipeline="nf-core/scrnaseq",
+            pipeline_version="2.7.1",
+            user_email="user@arc.org",
+            user_name=None,
+            params={},
+            sample_count=1,
+        )
+    first, second = WeblogAggregator(), WeblogAggregator()
+    first.ingest(
+        run_id,
+        [
+            _event("process_submitted", "FASTQC (1)", "SUBMITTED"),
+            _event("process_started", "FASTQC (1)", "RUNNING"),
+        ],
+    )
+    second.ingest(run_id, [_event("process_completed", "FASTQC (1)", "COMPLETED", exit=0)])
+
+    await second.flush(database, _Settings())
+    async for session in database.get_session():
+        events = await RunEventService.create(session).list_events(after=0)
+    assert events[-1].tasks["running"] == 0
+
+    await first.flush(database, _Settings())
+    async for session in database.get_session():
+        run = await RunStoreService.create(session, _Settings()).get_run(run_id)
+    assert run_task_counts(run.metrics) == {
+        "running": 0,
+        "completed": 1,
+        "failed": 0,
+        "total": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_retried_and_ignored_attempts_are_not_failures(database: DatabaseService) -> None:
+    async for session in database.get_session():
+        run_id = await RunStoreService.create(session, _Settings()).create_run(
+            pipeline="nf-core/scrnaseq",
+            pipeline_version="2.7.1",
+            user_email="user@arc.org",
+            user_name=None,
+            params={},
+            sample_count=1,
+        )
+    aggregator = WeblogAggregator()
+    aggregator.ingest(
+        run_id,
+        [
+            _event("process_submitted", "STAR (1)", "SUBMITTED", task_id=1, attempt=1),
+            _event("process_started", "STAR (1)", "RUNNING", task_id=1, attempt=1),
+            _event(
+                "process_completed",
+                "STAR (1)",
+                "FAILED",
+                task_id=1,
+                attempt=1,
+                exit=137,
+                error_action="RETRY",
+            ),
+            _event("process_submitted", "STAR (1)", "SUBMITTED", task_id=2, attempt=2),
+            _event("process_started", "STAR (1)", "RUNNING", task_id=2, attempt=2),
+            _event("process_completed", "STAR (1)", "COMPLETED", task_id=2, attempt=2, exit=0),
+            _event("process_submitted", "QC (1)", "SUBMITTED", task_id=3, attempt=1),
+            _event("process_started", "QC (1)", "RUNNING", task_id=3, attempt=1),
+            _event(
+                "process_completed",
+                "QC (1)",
+                "FAILED",
+                task_id=3,
+                attempt=1,
+                exit=1,
+                errorAction="IGNORE",
+            ),
+        ],
+    )
+    await aggregator.flush(database, _Settings())
+
+    async for session in database.get_session():
+        run = await RunStoreService.create(session, _Settings()).get_run(run_id)
+    assert run_task_counts(run.metrics) == {
+        "running": 0,
+        "completed": 2,
+        "failed": 0,
+        "total": 2,
+    }
+    assert run_progress(run.metrics) == 1.0
+    assert "first_failure" not in run.metrics
+
+
+@pytest.mark.asyncio
+async def test_late_flush_after_terminal_status_still_ends_the_stream(
+    database: DatabaseService,
+) -> None:
+    async for session in database.get_session():
+        runs = RunStoreService.create(session, _Settings())
+        run_id = await runs.create_run(
+            pipeline="nf-core/scrnaseq",
+            pipeline_version="2.7.1",
+            user_email="user@arc.org",
+            user_name=None,
+            params={},
+            sample_count=1,
+        )
+        await runs.update_run_status(run_id=run_id, status=RunStatus.CANCELLED)
+        settled_at = (await runs.get_run(run_id)).updated_at
+
+    aggregator = WeblogAggregator()
+    aggregator.ingest(run_id, [_event("process_completed", "FASTQC (1)", "COMPLETED", exit=0)])
+    assert await aggregator.flush(database, _Settings()) == 1
+
+    async for session in database.get_session():
+        run = await RunStoreService.create(session, _Settings()).get_run(run_id)
+    assert run_task_counts(run.metrics)["completed"] == 1
+    assert run.updated_at == settled_at
+
+    changes = StreamBroker().subscribe(
+        ("run-events",), lambda: poll_run_changes(database, fallback_interval=60)
+    )
+    events = [event async for event in poll_run_events(database, run_id, changes)]
+    assert [(event.event, event.status) for event in events] == [
+        ("metrics", RunStatus.CANCELLED),
+        ("done", RunStatus.CANCELLED),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flush_drops_deltas_for_unknown_runs(database: DatabaseService) -> None:
+    aggregator = WeblogAggregator()
+    aggregator.ingest("run-missing", [_event("process_submitted", "FASTQC (1)", "SUBMITTED")])
+
+    assert await aggregator.flush(database, _Settings()) == 0
+    assert aggregator.stats() == {"pending_runs": 0, "received": 1, "flushes": 1}
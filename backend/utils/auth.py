@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
 import os
 from dataclasses import dataclass
 
@@ -71,3 +73,12 @@ async def get_current_user(request: Request) -> UserContext:
     name = claims.get("name", email)
     is_admin = email.lower() in _admin_emails()
     return UserContext(email=email, name=name, is_admin=is_admin)
+
+
+def weblog_token(secret: str, run_id: str) -> str:
+    """Per-run token for the Nextflow weblog URL; Nextflow cannot send custom headers."""
+    return hmac.new(secret.encode("utf-8"), run_id.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def verify_weblog_token(secret: str, run_id: str, token: str) -> bool:
+    return hmac.compare_digest(weblog_token(secret, run_id), token)
@@ -17,14 +17,18 @@ export function useRunEvents(runId: string, enabled: boolean = true) {
       setIsConnected(true);
     });
 
-    eventSource.addEventListener('status', (event) => {
+    const handleEvent = (event: Event) => {
       try {
         const data = JSON.parse((event as MessageEvent<string>).data) as RunStatus;
         setStatus(data);
       } catch {
         // ignore malformed payloads
       }
-    });
+    };
+
+    // 'metrics' events carry progress updates between status transitions.
+    eventSource.addEventListener('status', handleEvent);
+    eventSource.addEventListener('metrics', handleEvent);
 
     eventSource.addEventListener('done', () => {
       setIsConnected(false);
@@ -0,0 +1,60 @@
+'use client';
+
+import { useEffect, useState } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+
+import type { RunStatus, RunSummary } from '@/lib/api';
+
+type RunChange = {
+  run_id: string;
+  status: RunStatus;
+  timestamp: string;
+  progress: number | null;
+};
+
+// One multiplexed stream for every visible run; EventSource resends Last-Event-ID on
+// reconnect so missed changes are replayed by the server.
+export function useRunListEvents(enabled: boolean = true) {
+  const queryClient = useQueryClient();
+  const [isConnected, setIsConnected] = useState(false);
+
+  useEffect(() => {
+    if (!enabled) return undefined;
+
+    const eventSource = new EventSource('/api/runs/events');
+
+    eventSource.addEventListener('open', () => {
+      setIsConnected(true);
+    });
+
+    eventSource.addEventListener('status', (event) => {
+      try {
+        const change = JSON.parse((event as MessageEvent<string>).data) as RunChange;
+        let known = false;
+        queryClient.setQueryData<RunSummary[]>(['runs'], (runs) =>
+          runs?.map((run) => {
+            if (run.id !== change.run_id) return run;
+            known = true;
+            return { ...run, status: change.status };
+          })
+        );
+        if (!known) {
+          void queryClient.invalidateQueries({ queryKey: ['runs'] });
+        }
+      } catch {
+        // ignore malformed payloads
+      }
+    });
+
+    eventSource.onerror = () => {
+      setIsConnected(false);
+    };
+
+    return () => {
+      eventSource.close();
+      setIsConnected(false);
+    };
+  }, [enabled, queryClient]);
+
+  return { isConnected };
+}
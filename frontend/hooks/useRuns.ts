@@ -5,6 +5,8 @@ import { useQuery } from '@tanstack/react-query';
 
 import { fetchRuns, type RunStatus, type RunSummary } from '@/lib/api';
 
+import { useRunListEvents } from '@/hooks/useRunListEvents';
+
 export type RunFilters = {
   status?: RunStatus | 'all';
   pipeline?: string | 'all';
@@ -33,12 +35,16 @@ export function useRuns(initialFilters: RunFilters = {}) {
   const [page, setPage] = useState(1);
   const [pageSize, setPageSize] = useState(10);
 
+  const { isConnected } = useRunListEvents();
+
   const query = useQuery({
     queryKey: ['runs'],
     queryFn: fetchRuns,
     refetchInterval: (data) => {
       if (!data) return 30000;
-      return data.some((run) => isActiveStatus(run.status)) ? 10000 : false;
+      if (!data.some((run) => isActiveStatus(run.status))) return false;
+      // Status changes arrive over /runs/events; polling is only a fallback.
+      return isConnected ? 60000 : 10000;
     }
   });
 
@@ -24,6 +24,8 @@ require_env DATABASE_URL
 
 CONFIG_DIR="${CONFIG_DIR:-/config}"
 LOCAL_WORK_DIR="${LOCAL_WORK_DIR:-/work}"
+LOG_SYNC_INTERVAL="${LOG_SYNC_INTERVAL:-60}"
+LOG_SYNC_REBASE_EVERY="${LOG_SYNC_REBASE_EVERY:-500}"
 
 log "Starting Nextflow orchestrator for run ${RUN_ID}"
 log "Pipeline: ${PIPELINE} (${PIPELINE_VERSION})"
@@ -62,18 +64,15 @@ if [ "${IS_RECOVERY}" = "true" ]; then
   cmd+=( -resume )
 fi
 
-log "Launching Nextflow"
-cd "${LOCAL_WORK_DIR}"
-set +e
-"${cmd[@]}"
-exit_code=$?
-set -e
+# Stream task events to the API for live progress; the URL carries a per-run token.
+if [ -n "${WEBLOG_URL:-}" ]; then
+  cmd+=( -with-weblog "${WEBLOG_URL}" )
+fi
 
 bucket="${CONFIG_GCS_PATH#gs://}"
 bucket="${bucket%%/*}"
 log_root="gs://${bucket}/runs/${RUN_ID}/logs"
 
-log "Uploading logs to ${log_root}"
 upload_with_retry() {
   local src="$1"
   local dest="$2"
@@ -93,6 +92,92 @@ upload_with_retry() {
   return 1
 }
 
+# Background sync while Nextflow runs. New .nextflow.log bytes are uploaded as a
+# chunk object and composed onto the remote log, so the API can tail it with ranged
+# reads. Composite objects are capped at 1024 components, so the remote log is
+# rebased with a full upload every LOG_SYNC_REBASE_EVERY composes. trace.txt is
+# small enough to push as a whole snapshot whenever it changes.
+sync_loop() {
+  local sync_dir="${LOCAL_WORK_DIR}/.arc-sync"
+  local log_offset=0
+  local composes=0
+  local trace_size=-1
+  local sleep_pid=""
+
+  set +e
+  trap 'if [ -n "${sleep_pid}" ]; then kill "${sleep_pid}" 2>/dev/null || true; fi; exit 0' TERM
+  mkdir -p "${sync_dir}"
+
+  while true; do
+    sleep "${LOG_SYNC_INTERVAL}" &
+    sleep_pid=$!
+    wait "${sleep_pid}" || true
+    sleep_pid=""
+
+    if [ -f ".nextflow.log" ]; then
+      local size
+      size=$(wc -c < ".nextflow.log" | tr -d ' ')
+      if [ "${size}" -lt "${log_offset}" ]; then
+        log_offset=0
+      fi
+      if [ "${size}" -gt "${log_offset}" ]; then
+        if [ "${log_offset}" -eq 0 ] || [ "${composes}" -ge "${LOG_SYNC_REBASE_EVERY}" ]; then
+          head -c "${size}" ".nextflow.log" > "${sync_dir}/nextflow.log"
+          if gsutil cp "${sync_dir}/nextflow.log" "${log_root}/nextflow.log" >/dev/null 2>&1; then
+            log_offset="${size}"
+            composes=0
+          fi
+        else
+          local chunk_uri="${log_root}/.sync/nextflow.log.${log_offset}"
+          tail -c +"$((log_offset + 1))" ".nextflow.log" \
+            | head -c "$((size - log_offset))" > "${sync_dir}/chunk"
+          if gsutil cp "${sync_dir}/chunk" "${chunk_uri}" >/dev/null 2>&1 \
+            && gsutil compose "${log_root}/nextflow.log" "${chunk_uri}" \
+              "${log_root}/nextflow.log" >/dev/null 2>&1; then
+            log_offset="${size}"
+            composes=$((composes + 1))
+          else
+            log "Warning: incremental log sync failed at offset ${log_offset}"
+          fi
+          gsutil rm "${chunk_uri}" >/dev/null 2>&1 || true
+        fi
+      fi
+    fi
+
+    if [ -f "trace.txt" ]; then
+      local current_trace_size
+      current_trace_size=$(wc -c < "trace.txt" | tr -d ' ')
+      if [ "${current_trace_size}" -ne "${trace_size}" ]; then
+        cp "trace.txt" "${sync_dir}/trace.txt"
+        if gsutil cp "${sync_dir}/trace.txt" "${log_root}/trace.txt" >/dev/null 2>&1; then
+          trace_size="${current_trace_size}"
+        fi
+      fi
+    fi
+  done
+}
+
+log "Launching Nextflow"
+cd "${LOCAL_WORK_DIR}"
+
+sync_pid=""
+if [ "${LOG_SYNC_INTERVAL}" -gt 0 ]; then
+  log "Syncing logs to ${log_root} every ${LOG_SYNC_INTERVAL}s"
+  sync_loop &
+  sync_pid=$!
+fi
+
+set +e
+"${cmd[@]}"
+exit_code=$?
+set -e
+
+if [ -n "${sync_pid}" ]; then
+  kill "${sync_pid}" 2>/dev/null || true
+  wait "${sync_pid}" 2>/dev/null || true
+fi
+
+log "Uploading logs to ${log_root}"
 if [ -f ".nextflow.log" ]; then
   upload_with_retry ".nextflow.log" "${log_root}/nextflow.log" || true
 fi
@@ -18,6 +18,19 @@ except Exception:  # pragma: no cover - handled at runtime
 
 logger = logging.getLogger("arc-reactor.orchestrator")
 
+# Must match backend.services.runs.RUN_STATUS_CHANNEL.
+RUN_STATUS_CHANNEL = "run_status"
+
+# Mirrors backend.services.runs._STATUS_TRANSITIONS; the runs table trigger enforces it too.
+STATUS_TRANSITIONS: dict[str, set[str]] = {
+    "pending": {"submitted", "cancelled", "failed"},
+    "submitted": {"running", "cancelled", "failed"},
+    "running": {"completed", "failed", "cancelled"},
+    "completed": set(),
+    "failed": set(),
+    "cancelled": set(),
+}
+
 
 def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Update run status in PostgreSQL")
@@ -47,8 +60,52 @@ def _maybe_timestamp(value: str | None, fallback: datetime | None) -> datetime |
     return fallback
 
 
+def _progress(metrics: dict[str, Any]) -> float | None:
+    # Mirrors backend.services.runs.run_progress.
+    raw = metrics.get("progress")
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    completed = metrics.get("tasks_completed")
+    total = metrics.get("tasks_total")
+    if isinstance(completed, (int, float)) and isinstance(total, (int, float)) and total:
+        return float(completed) / float(total)
+    return None
+
+
+def _task_counts(metrics: dict[str, Any]) -> dict[str, int] | None:
+    # Mirrors backend.services.runs.run_task_counts.
+    if "tasks_total" not in metrics:
+        return None
+    counts = {
+        name: int(metrics.get(f"tasks_{name}") or 0)
+        for name in ("running", "completed", "failed", "total")
+    }
+    counts["running"] = max(0, counts["running"])
+    return counts
+
+
+def _event_payload(status: str, raw_metrics: Any) -> dict[str, Any]:
+    """Same keys as backend.services.runs._event_payload, with None for absent values."""
+    if isinstance(raw_metrics, str):
+        try:
+            raw_metrics = json.loads(raw_metrics)
+        except json.JSONDecodeError:
+            raw_metrics = None
+    metrics = raw_metrics if isinstance(raw_metrics, dict) else {}
+    return {
+        "status": status,
+        "progress": _progress(metrics),
+        "tasks": _task_counts(metrics),
+        "first_failure": metrics.get("first_failure") or None,
+    }
+
+
+def allowed_from(status: str) -> list[str]:
+    return sorted(current for current, targets in STATUS_TRANSITIONS.items() if status in targets)
+
+
 def _build_updates(args: argparse.Namespace) -> tuple[list[str], dict[str, Any]]:
-    updates = ["status = %(status)s", "updated_at = NOW()"]
+    updates = ["updated_at = NOW()"]
     params: dict[str, Any] = {
         "run_id": args.run_id,
         "status": args.status,
@@ -107,18 +164,64 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     args = _parse_args(argv)
+    args.status = args.status.lower()
     updates, params = _build_updates(args)
-
-    query = f"UPDATE runs SET {', '.join(updates)} WHERE run_id = %(run_id)s"
+    params["allowed_from"] = allowed_from(args.status)
+
+    # Same compare-and-set as RunStoreService.update_run_status: the transition only
+    # applies while the run is in a status allowed to move to the new one.
+    transition = (
+        f"UPDATE runs SET status = %(status)s, {', '.join(updates)} "
+        "WHERE run_id = %(run_id)s AND status = ANY(%(allowed_from)s) RETURNING status, metrics"
+    )
+    same_status = (
+        f"UPDATE runs SET {', '.join(updates)} "
+        "WHERE run_id = %(run_id)s AND status = %(status)s RETURNING status, metrics"
+    )
 
     try:
         with psycopg2.connect(database_url) as conn:
             with conn.cursor() as cursor:
-                cursor.execute(query, params)
-                if cursor.rowcount == 0:
-                    logger.error("Run %s not found", args.run_id)
-                    conn.rollback()
-                    return 1
+                cursor.execute(transition, params)
+                event_type = "status"
+                row = cursor.fetchone()
+                if row is None:
+                    cursor.execute(same_status, params)
+                    event_type = "metrics" if args.metrics is not None else None
+                    row = cursor.fetchone()
+                    if row is None:
+                        cursor.execute("SELECT status FROM runs WHERE run_id = %(run_id)s", params)
+                        current = cursor.fetchone()
+                        conn.rollback()
+                        if current is None:
+                            logger.error("Run %s not found", args.run_id)
+                        else:
+                            logger.error(
+                                "Rejected status transition for run %s: %s -> %s",
+                                args.run_id,
+                                current[0],
+                                args.status,
+                            )
+                        return 1
+                if event_type is not None:
+                    cursor.execute(
+                        "INSERT INTO run_events (run_id, type, payload, ts) "
+                        "VALUES (%(run_id)s, %(type)s, %(payload)s, NOW())",
+                        {
+                            "run_id": args.run_id,
+                            "type": event_type,
+                            "payload": json.dumps(_event_payload(args.status, row[1])),
+                        },
+                    )
+                if event_type == "status":
+                    # Delivered to the API's listener when this transaction commits.
+                    cursor.execute(
+                        "SELECT pg_notify(%(channel)s, %(payload)s)",
+                        {
+                            "channel": RUN_STATUS_CHANNEL,
+                            "payload": json.dumps({"run_id": args.run_id, "status": args.status}),
+                        },
+                    )
         logger.info("Updated run %s to status %s", args.run_id, args.status)
         return 0
     except Exception as exc:
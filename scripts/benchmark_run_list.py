@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.models import Base
+from backend.models.runs import Run
+from backend.services.runs import RunStoreService
+
+TABLE_FIELDS = ["pipeline", "pipeline_version", "status", "user_name", "created_at"]
+
+
+class _Settings:
+    nextflow_bucket = "arc-reactor-benchmark"
+
+
+def _metrics(size: int) -> dict:
+    return {
+        "progress": 0.5,
+        "tasks": [
+            {"name": f"PROCESS_{index}", "status": "COMPLETED"} for index in range(size)
+        ],
+    }
+
+
+async def _seed(session_factory, runs: int, metrics_tasks: int) -> None:
+    async with session_factory() as session:
+        service = RunStoreService.create(session, _Settings())
+        for _ in range(runs):
+            await service.create_run(
+                pipeline="nf-core/scrnaseq",
+                pipeline_version="2.7.1",
+                user_email="bench@arc.org",
+                user_name="Benchmark",
+                params={"genome": "GRCh38"},
+                sample_count=1,
+            )
+        await session.execute(
+            update(Run).values(
+                metrics=_metrics(metrics_tasks), updated_at=Run.updated_at
+            )
+        )
+        await session.commit()
+
+
+async def _time_pages(
+    session_factory, repeats: int, page_size: int, fields
+) -> list[float]:
+    timings = []
+    for _ in range(repeats):
+        async with session_factory() as session:
+            service = RunStoreService.create(session, _Settings())
+            start = time.perf_counter()
+            response = await service.list_runs(
+                page_size=page_size, total="none", fields=fields
+            )
+            response.model_dump_json(exclude_unset=True)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def _run(args: argparse.Namespace) -> None:
+    path = None
+    url = args.database_url
+    if url is None:
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        url = f"sqlite+aiosqlite:///{path}"
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        await _seed(session_factory, args.runs, args.metrics_tasks)
+        for label, fields in (("all fields", None), ("table fields", TABLE_FIELDS)):
+            timings = await _time_pages(
+                session_factory, args.repeats, args.page_size, fields
+            )
+            print(
+                f"{label:>12}: median {statistics.median(timings):.1f} ms, "
+                f"max {max(timings):.1f} ms over {args.repeats} pages of {args.page_size}"
+            )
+    finally:
+        await engine.dispose()
+        if path:
+            os.unlink(path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark GET /runs page latency")
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="Empty scratch database to seed (default: a temporary SQLite file)",
+    )
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--metrics-tasks", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=20)
+    asyncio.run(_run(parser.parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())